@@ -0,0 +1,173 @@
+"""Bounded alert queue that spills to disk instead of dropping alerts.
+
+Alerts are held in memory up to ``maxsize``.  Once memory is full, new
+alerts are appended to a JSONL spill file; as workers drain memory the
+oldest spilled alerts are read back, so alerts are processed in arrival
+order either way.  The read position is stored next to the spill file
+(``<spill>.offset``), so alerts that were spilled, or written out by
+``drain_to_disk`` at shutdown, are picked up again after a restart.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+
+class QueueFullError(Exception):
+    """Memory is full and the spill file is missing or at its size limit."""
+
+
+class SpilloverQueue:
+    """FIFO of alert dicts: ``maxsize`` in memory, the overflow on disk.
+
+    Args:
+        maxsize: Alerts held in memory.
+        spill_path: JSONL overflow file; ``None`` rejects alerts when full.
+        max_spill_bytes: Size limit of the spill file (``None``: unlimited).
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        spill_path: Path | None = None,
+        max_spill_bytes: int | None = None,
+    ) -> None:
+        self.maxsize = max(2, maxsize)
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.max_spill_bytes = max_spill_bytes
+        self._memory: deque[dict[str, Any]] = deque()
+        self._waiters: deque[asyncio.Future] = deque()
+        self._spilled = 0
+        self._offset = 0
+        if self.spill_path is not None:
+            self._recover()
+
+    # ── state ───────────────────────────────────────────────────────
+
+    @property
+    def _offset_path(self) -> Path:
+        return self.spill_path.with_name(self.spill_path.name + ".offset")
+
+    def qsize(self) -> int:
+        return len(self._memory) + self._spilled
+
+    @property
+    def in_memory(self) -> int:
+        return len(self._memory)
+
+    @property
+    def spilled(self) -> int:
+        """Alerts currently waiting on disk."""
+        return self._spilled
+
+    def _recover(self) -> None:
+        if not self.spill_path.exists():
+            return
+        if self._offset_path.exists():
+            self._offset = int(self._offset_path.read_text() or 0)
+        with self.spill_path.open("rb") as f:
+            f.seek(self._offset)
+            self._spilled = sum(1 for line in f if line.strip())
+        self._refill()
+
+    # ── put / get ───────────────────────────────────────────────────
+
+    def put_nowait(self, alert: dict[str, Any]) -> bool:
+        """Queue ``alert``; returns True if it went to disk.
+
+        Raises:
+            QueueFullError: memory is full and the alert can't be spilled.
+        """
+        if self._spilled == 0 and len(self._memory) < self.maxsize:
+            self._memory.append(alert)
+            self._wake()
+            return False
+        self._spill([alert])
+        return True
+
+    async def get(self) -> dict[str, Any]:
+        while not self._memory:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif self._memory:
+                    self._wake()  # pass the wake-up on to another getter
+                raise
+        alert = self._memory.popleft()
+        if self._spilled and len(self._memory) <= self.maxsize // 2:
+            self._refill()
+        return alert
+
+    def _wake(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    # ── disk ────────────────────────────────────────────────────────
+
+    def _spill(self, alerts: list[dict[str, Any]]) -> None:
+        if self.spill_path is None:
+            raise QueueFullError("alert queue is full")
+        data = "".join(json.dumps(alert, default=str) + "\n" for alert in alerts).encode()
+        size = self.spill_path.stat().st_size if self.spill_path.exists() else 0
+        if self.max_spill_bytes is not None and size + len(data) > self.max_spill_bytes:
+            raise QueueFullError(f"alert spill file {self.spill_path} is full")
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.spill_path.open("ab") as f:
+            f.write(data)
+        self._spilled += len(alerts)
+
+    def _refill(self) -> None:
+        """Move the oldest spilled alerts back into memory."""
+        with self.spill_path.open("rb") as f:
+            f.seek(self._offset)
+            while self._spilled and len(self._memory) < self.maxsize:
+                line = f.readline()
+                if not line:
+                    break
+                if line.strip():
+                    self._memory.append(json.loads(line))
+                    self._spilled -= 1
+                    self._wake()
+            self._offset = f.tell()
+        if self._spilled == 0:
+            # Everything was read back: start the next spill from an empty file.
+            self.spill_path.unlink(missing_ok=True)
+            self._offset_path.unlink(missing_ok=True)
+            self._offset = 0
+        else:
+            self._offset_path.write_text(str(self._offset))
+
+    def drain_to_disk(self, front: list[dict[str, Any]] = ()) -> int:
+        """Write ``front`` plus every queued alert to the spill file, in order.
+
+        Used at shutdown so nothing queued is lost; returns the number of
+        alerts on disk.  ``front`` are alerts taken by workers but not
+        finished.
+        """
+        if self.spill_path is None:
+            raise QueueFullError("no spill file to drain the alert queue to")
+        pending = list(front) + list(self._memory)
+        self._memory.clear()
+        rest = b""
+        if self.spill_path.exists():
+            with self.spill_path.open("rb") as f:
+                f.seek(self._offset)
+                rest = f.read()
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        head = "".join(json.dumps(alert, default=str) + "\n" for alert in pending).encode()
+        self.spill_path.write_bytes(head + rest)
+        self._offset_path.unlink(missing_ok=True)
+        self._offset = 0
+        self._spilled += len(pending)
+        return self._spilled
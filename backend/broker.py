@@ -0,0 +1,512 @@
+"""Shared alert queue for running the orchestrator on several nodes.
+
+Alerts are published to a broker and sharded by their fingerprint
+(``routing.fingerprint``: alert name + service), so repeats of the same
+alert always land in the same shard.  Each node owns a set of shards
+(``owned_shards``, rendezvous hashing over the configured node names) and
+its ``ShardWorker``s drain those first; the node's ``DedupCache``
+therefore sees every repeat of an alert.  A worker with nothing to do
+steals from the most backlogged shard it doesn't own.
+
+A worker holds a *lease* on the alert it processes and renews it while
+the incident runs.  If the worker dies the lease expires and any worker
+may claim the alert again; ack/renew with a lost lease fail instead of
+touching the new owner's claim.
+
+Brokers:
+
+- ``LocalBroker``: in-process stand-in, for one node or a local test
+  harness (``scripts/run_local_cluster.py``).
+- ``ElasticsearchBroker``: one document per alert in an index.  Claims,
+  renewals and acks are conditional writes (``if_seq_no`` /
+  ``if_primary_term``), so exactly one worker wins each alert.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import zlib
+from collections import Counter, deque
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from src.incident_commander.ids import IdGenerator
+from src.incident_commander.routing import fingerprint
+
+logger = logging.getLogger(__name__)
+
+QUEUE_INDEX = "incident-alert-queue"
+DEFAULT_SHARDS = 32
+LEASE_SECONDS = 30.0
+
+_alert_ids = IdGenerator("ALR-")
+
+
+def shard_for(alert: dict[str, Any], num_shards: int) -> int:
+    return zlib.crc32(fingerprint(alert).encode()) % num_shards
+
+
+def owned_shards(node: str, nodes: Iterable[str], num_shards: int) -> frozenset[int]:
+    """Shards ``node`` owns: each shard goes to the node with the highest hash.
+
+    Adding or removing a node only moves the shards it gains or loses.
+    """
+    nodes = sorted(set(nodes) | {node})
+
+    def weight(name: str, shard: int) -> int:
+        return zlib.crc32(f"{name}/{shard}".encode())
+
+    return frozenset(
+        shard
+        for shard in range(num_shards)
+        if max(nodes, key=lambda name: weight(name, shard)) == node
+    )
+
+
+@dataclass
+class Lease:
+    """A worker's claim on one queued alert until ``expires_at``."""
+
+    id: str
+    alert: dict[str, Any]
+    shard: int
+    owner: str
+    expires_at: float
+    attempts: int = 1
+    stolen: bool = False
+    # Broker bookkeeping (Elasticsearch: seq_no / primary_term of the claim).
+    token: Any = field(default=None, repr=False)
+
+
+class LeaseLostError(Exception):
+    """The lease expired and the alert was claimed by another worker."""
+
+
+class AlertBroker:
+    """Interface of the sharded alert queues."""
+
+    num_shards: int = DEFAULT_SHARDS
+
+    def shard_for(self, alert: dict[str, Any]) -> int:
+        return shard_for(alert, self.num_shards)
+
+    async def publish(self, alerts: list[dict[str, Any]]) -> list[int]:
+        """Queue ``alerts``; returns the shard of each."""
+        raise NotImplementedError
+
+    async def claim(
+        self, owner: str, shards: Iterable[int], lease_seconds: float = LEASE_SECONDS
+    ) -> Lease | None:
+        """Lease the oldest claimable alert in ``shards`` (queued or lease expired)."""
+        raise NotImplementedError
+
+    async def backlog(self) -> dict[int, int]:
+        """Claimable alerts per shard (shards without any are left out)."""
+        raise NotImplementedError
+
+    async def renew(self, lease: Lease, lease_seconds: float = LEASE_SECONDS) -> None:
+        """Extend ``lease``; raises ``LeaseLostError`` if it is gone."""
+        raise NotImplementedError
+
+    async def ack(self, lease: Lease) -> None:
+        """Remove the processed alert; raises ``LeaseLostError`` if the lease is gone."""
+        raise NotImplementedError
+
+    async def release(self, lease: Lease) -> None:
+        """Put the alert back for any worker (processing failed or stopped)."""
+        raise NotImplementedError
+
+
+class LocalBroker(AlertBroker):
+    """In-process broker: a deque per shard plus the active leases."""
+
+    def __init__(self, num_shards: int = DEFAULT_SHARDS, clock: Callable[[], float] = time.time):
+        self.num_shards = num_shards
+        self.clock = clock
+        self._queues: list[deque[tuple[str, dict[str, Any], int]]] = [
+            deque() for _ in range(num_shards)
+        ]
+        self._leases: dict[str, Lease] = {}
+
+    def _expire(self) -> None:
+        now = self.clock()
+        for lease in [lease for lease in self._leases.values() if lease.expires_at <= now]:
+            del self._leases[lease.id]
+            # Back to the front: it is older than anything queued after it.
+            self._queues[lease.shard].appendleft((lease.id, lease.alert, lease.attempts))
+
+    async def publish(self, alerts: list[dict[str, Any]]) -> list[int]:
+        shards = []
+        for alert in alerts:
+            shard = self.shard_for(alert)
+            self._queues[shard].append((_alert_ids.new(), alert, 0))
+            shards.append(shard)
+        return shards
+
+    async def claim(
+        self, owner: str, shards: Iterable[int], lease_seconds: float = LEASE_SECONDS
+    ) -> Lease | None:
+        self._expire()
+        candidates = [self._queues[shard] for shard in shards if self._queues[shard]]
+        if not candidates:
+            return None
+        queue = min(candidates, key=lambda q: q[0][0])  # IDs sort by enqueue time
+        alert_id, alert, attempts = queue.popleft()
+        lease = Lease(
+            alert_id,
+            alert,
+            self.shard_for(alert),
+            owner,
+            self.clock() + lease_seconds,
+            attempts + 1,
+        )
+        self._leases[alert_id] = lease
+        return lease
+
+    async def backlog(self) -> dict[int, int]:
+        self._expire()
+        return {shard: len(queue) for shard, queue in enumerate(self._queues) if queue}
+
+    @property
+    def leased(self) -> int:
+        """Alerts currently leased (expired leases included until the next claim)."""
+        return len(self._leases)
+
+    def _check(self, lease: Lease) -> None:
+        # Leases are handed out by identity: a re-claimed alert has a new one.
+        if self._leases.get(lease.id) is not lease or lease.expires_at <= self.clock():
+            raise LeaseLostError(lease.id)
+
+    async def renew(self, lease: Lease, lease_seconds: float = LEASE_SECONDS) -> None:
+        self._check(lease)
+        lease.expires_at = self.clock() + lease_seconds
+
+    async def ack(self, lease: Lease) -> None:
+        self._check(lease)
+        del self._leases[lease.id]
+
+    async def release(self, lease: Lease) -> None:
+        if self._leases.get(lease.id) is lease:
+            del self._leases[lease.id]
+            self._queues[lease.shard].appendleft((lease.id, lease.alert, lease.attempts))
+
+
+class ElasticsearchBroker(AlertBroker):
+    """Broker backed by an index with one document per queued alert.
+
+    Args:
+        es: Client with ``es_request`` / ``es_post_body``
+            (``backend.elastic_client.ElasticClient``).
+        index: Queue index.
+        num_shards: Alert shards (not index shards).
+        batch: Candidates fetched per claim; losing a race moves to the next.
+    """
+
+    def __init__(
+        self,
+        es: Any,
+        index: str = QUEUE_INDEX,
+        num_shards: int = DEFAULT_SHARDS,
+        batch: int = 8,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.es = es
+        self.index = index
+        self.num_shards = num_shards
+        self.batch = batch
+        self.clock = clock
+
+    async def ensure_index(self) -> None:
+        if await self.es.index_exists(self.index):
+            return
+        await self.es.es_request(
+            "PUT",
+            f"/{self.index}",
+            json={
+                # New alerts become claimable within this delay.
+                "settings": {"index.refresh_interval": "250ms"},
+                "mappings": {
+                    "properties": {
+                        "queue_id": {"type": "keyword"},
+                        "shard": {"type": "integer"},
+                        "owner": {"type": "keyword"},
+                        "lease_expires": {"type": "long"},
+                        "attempts": {"type": "integer"},
+                        "alert": {"type": "object", "enabled": False},
+                    }
+                },
+            },
+        )
+
+    def _claimable(self, shards: Iterable[int] | None = None) -> dict[str, Any]:
+        # Unleased (lease_expires 0) or the lease ran out.
+        expired = {"range": {"lease_expires": {"lt": int(self.clock() * 1000)}}}
+        filters: list[dict[str, Any]] = [expired]
+        if shards is not None:
+            filters.append({"terms": {"shard": sorted(shards)}})
+        return {"bool": {"filter": filters}}
+
+    async def publish(self, alerts: list[dict[str, Any]]) -> list[int]:
+        lines: list[dict[str, Any]] = []
+        shards = []
+        for alert in alerts:
+            queue_id = _alert_ids.new()
+            shard = self.shard_for(alert)
+            lines.append({"create": {"_index": self.index, "_id": queue_id}})
+            lines.append(
+                {
+                    "queue_id": queue_id,
+                    "shard": shard,
+                    "owner": None,
+                    "lease_expires": 0,
+                    "attempts": 0,
+                    "alert": alert,
+                }
+            )
+            shards.append(shard)
+        result = await self.es.es_post_body("/_bulk", lines, "application/x-ndjson")
+        if result.get("errors"):
+            raise RuntimeError(f"could not queue alerts in {self.index}")
+        return shards
+
+    async def _write(self, lease: Lease, doc: dict[str, Any], token: tuple[int, int]) -> dict:
+        seq_no, primary_term = token
+        try:
+            return await self.es.es_request(
+                "PUT",
+                f"/{self.index}/_doc/{lease.id}",
+                json=doc,
+                params={"if_seq_no": seq_no, "if_primary_term": primary_term},
+            )
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code in (404, 409):
+                raise LeaseLostError(lease.id) from exc
+            raise
+
+    def _doc(self, lease: Lease, owner: str | None, expires_ms: int) -> dict[str, Any]:
+        return {
+            "queue_id": lease.id,
+            "shard": lease.shard,
+            "owner": owner,
+            "lease_expires": expires_ms,
+            "attempts": lease.attempts,
+            "alert": lease.alert,
+        }
+
+    async def claim(
+        self, owner: str, shards: Iterable[int], lease_seconds: float = LEASE_SECONDS
+    ) -> Lease | None:
+        response = await self.es.es_request(
+            "POST",
+            f"/{self.index}/_search",
+            json={
+                "size": self.batch,
+                "query": self._claimable(shards),
+                "sort": [{"queue_id": "asc"}],
+                "seq_no_primary_term": True,
+            },
+        )
+        for hit in response["hits"]["hits"]:
+            source = hit["_source"]
+            expires_at = self.clock() + lease_seconds
+            lease = Lease(
+                hit["_id"],
+                source["alert"],
+                source["shard"],
+                owner,
+                expires_at,
+                source.get("attempts", 0) + 1,
+            )
+            try:
+                result = await self._write(
+                    lease,
+                    self._doc(lease, owner, int(expires_at * 1000)),
+                    (hit["_seq_no"], hit["_primary_term"]),
+                )
+            except LeaseLostError:
+                continue  # another worker claimed it first
+            lease.token = (result["_seq_no"], result["_primary_term"])
+            return lease
+        return None
+
+    async def backlog(self) -> dict[int, int]:
+        response = await self.es.es_request(
+            "POST",
+            f"/{self.index}/_search",
+            json={
+                "size": 0,
+                "query": self._claimable(),
+                "aggs": {"shards": {"terms": {"field": "shard", "size": self.num_shards}}},
+            },
+        )
+        buckets = response["aggregations"]["shards"]["buckets"]
+        return {bucket["key"]: bucket["doc_count"] for bucket in buckets}
+
+    async def renew(self, lease: Lease, lease_seconds: float = LEASE_SECONDS) -> None:
+        expires_at = self.clock() + lease_seconds
+        doc = self._doc(lease, lease.owner, int(expires_at * 1000))
+        result = await self._write(lease, doc, lease.token)
+        lease.expires_at = expires_at
+        lease.token = (result["_seq_no"], result["_primary_term"])
+
+    async def ack(self, lease: Lease) -> None:
+        seq_no, primary_term = lease.token
+        try:
+            await self.es.es_request(
+                "DELETE",
+                f"/{self.index}/_doc/{lease.id}",
+                params={"if_seq_no": seq_no, "if_primary_term": primary_term},
+            )
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code in (404, 409):
+                raise LeaseLostError(lease.id) from exc
+            raise
+
+    async def release(self, lease: Lease) -> None:
+        try:
+            await self._write(lease, self._doc(lease, None, 0), lease.token)
+        except LeaseLostError:
+            pass
+
+
+class DedupCache:
+    """Fingerprints handled in the last ``window`` seconds."""
+
+    def __init__(self, window: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self.clock = clock
+        self._seen: dict[str, float] = {}
+
+    def seen(self, key: str) -> bool:
+        handled = self._seen.get(key)
+        if handled is None:
+            return False
+        if self.clock() - handled > self.window:
+            del self._seen[key]
+            return False
+        return True
+
+    def add(self, key: str) -> None:
+        self._seen[key] = self.clock()
+        if len(self._seen) > 10_000:
+            cutoff = self.clock() - self.window
+            self._seen = {k: t for k, t in self._seen.items() if t >= cutoff}
+
+
+class ShardWorker:
+    """Processes alerts from ``shards`` of a broker, stealing when idle.
+
+    Args:
+        broker: Shared alert queue.
+        handler: Coroutine function processing one alert.
+        name: Lease owner name (unique per worker).
+        shards: Shards this worker's node owns.
+        lease_seconds: Lease length; renewed every third of it.
+        steal: Claim from other shards when the own ones are empty.
+        poll: Seconds to wait when there is nothing to claim.
+        dedup: Skips alerts whose fingerprint was handled recently; shared
+            by the workers of a node.
+        max_attempts: Claims after which a failing alert is dropped.
+    """
+
+    def __init__(
+        self,
+        broker: AlertBroker,
+        handler: Callable[[dict[str, Any]], Awaitable[Any]],
+        name: str,
+        shards: Iterable[int],
+        lease_seconds: float = LEASE_SECONDS,
+        steal: bool = True,
+        poll: float = 0.5,
+        dedup: DedupCache | None = None,
+        max_attempts: int = 3,
+    ) -> None:
+        self.broker = broker
+        self.handler = handler
+        self.name = name
+        self.shards = frozenset(shards)
+        self.lease_seconds = lease_seconds
+        self.steal = steal
+        self.poll = poll
+        self.dedup = dedup
+        self.max_attempts = max_attempts
+        self.stats: Counter = Counter()
+        self.current: Lease | None = None
+
+    async def next_lease(self) -> Lease | None:
+        lease = None
+        if self.shards:
+            lease = await self.broker.claim(self.name, self.shards, self.lease_seconds)
+        if lease is None and self.steal:
+            backlog = await self.broker.backlog()
+            for shard in sorted(backlog, key=backlog.get, reverse=True):
+                if shard in self.shards:
+                    continue
+                lease = await self.broker.claim(self.name, [shard], self.lease_seconds)
+                if lease is not None:
+                    lease.stolen = True
+                    break
+        return lease
+
+    async def run(self) -> None:
+        while True:
+            lease = await self.next_lease()
+            if lease is None:
+                await asyncio.sleep(self.poll)
+                continue
+            await self.process(lease)
+
+    async def _keep_leased(self, lease: Lease) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await self.broker.renew(lease, self.lease_seconds)
+            except LeaseLostError:
+                logger.warning("%s lost the lease on alert %s", self.name, lease.id)
+                return
+            except Exception as exc:  # retried at the next interval
+                logger.warning("%s could not renew lease %s: %s", self.name, lease.id, exc)
+
+    async def process(self, lease: Lease) -> None:
+        key = fingerprint(lease.alert)
+        if self.dedup is not None and self.dedup.seen(key):
+            self.stats["deduplicated"] += 1
+            await self._ack(lease)
+            return
+        self.current = lease
+        keeper = asyncio.create_task(self._keep_leased(lease))
+        try:
+            await self.handler(lease.alert)
+        except asyncio.CancelledError:
+            await self.broker.release(lease)
+            raise
+        except Exception:
+            logger.exception("%s failed to process alert %s", self.name, lease.id)
+            if lease.attempts >= self.max_attempts:
+                self.stats["dropped"] += 1
+                await self._ack(lease)
+            else:
+                self.stats["failed"] += 1
+                await self.broker.release(lease)
+            return
+        finally:
+            keeper.cancel()
+            self.current = None
+        if self.dedup is not None:
+            self.dedup.add(key)
+        self.stats["processed"] += 1
+        self.stats["stolen"] += lease.stolen
+        await self._ack(lease)
+
+    async def _ack(self, lease: Lease) -> None:
+        try:
+            await self.broker.ack(lease)
+        except LeaseLostError:
+            # Processing outlived the lease; the new owner handles it again.
+            self.stats["lost"] += 1
+            logger.warning("%s lost the lease on alert %s", self.name, lease.id)
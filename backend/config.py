@@ -1,6 +1,7 @@
 """Configuration management for the Incident Commander."""
 
 import os
+import socket
 from dataclasses import dataclass, field
 from dotenv import load_dotenv
 
@@ -14,6 +15,19 @@ class ElasticConfig:
     es_url: str = field(default_factory=lambda: os.getenv("ES_URL", ""))
     kb_url: str = field(default_factory=lambda: os.getenv("KB_URL", ""))
     api_key: str = field(default_factory=lambda: os.getenv("ES_API_KEY", ""))
+    # gzip level for _bulk / ES|QL request bodies; 0 disables compression.
+    # Level 1 gives most of the size reduction for log data at a fraction of
+    # the CPU cost of higher levels (see scripts/bench_compression.py).
+    gzip_level: int = field(default_factory=lambda: int(os.getenv("ES_GZIP_LEVEL", "0")))
+    gzip_min_bytes: int = field(default_factory=lambda: int(os.getenv("ES_GZIP_MIN_BYTES", "1024")))
+    # Times a _bulk item rejected with 429 (es_rejected_execution_exception)
+    # is re-sent, with exponential backoff starting at bulk_retry_backoff s.
+    bulk_max_retries: int = field(
+        default_factory=lambda: int(os.getenv("ES_BULK_MAX_RETRIES", "3"))
+    )
+    bulk_retry_backoff: float = field(
+        default_factory=lambda: float(os.getenv("ES_BULK_RETRY_BACKOFF", "0.5"))
+    )
 
     def __post_init__(self):
         if not self.kb_url and self.es_url:
@@ -45,6 +59,52 @@ class ServerConfig:
     frontend_url: str = field(
         default_factory=lambda: os.getenv("FRONTEND_URL", "http://localhost:3000")
     )
+    # Incident daemon (backend/server.py): concurrent incidents, alerts held
+    # in memory, and the file alerts spill to beyond that ("" = reject).
+    workers: int = field(default_factory=lambda: int(os.getenv("INCIDENT_WORKERS", "4")))
+    queue_size: int = field(default_factory=lambda: int(os.getenv("ALERT_QUEUE_SIZE", "1000")))
+    spill_path: str = field(
+        default_factory=lambda: os.getenv("ALERT_SPILL_PATH", "data/alert-spill.jsonl")
+    )
+    # Draft the incident report while remediation runs (IncidentOrchestrator).
+    pipeline: bool = field(
+        default_factory=lambda: os.getenv("INCIDENT_PIPELINE", "false").lower() in ("1", "true")
+    )
+    # Index of resolved incidents used for similarity lookups ("" = off).
+    history_index: str = field(
+        default_factory=lambda: os.getenv("INCIDENT_HISTORY_INDEX", "incidents-history")
+    )
+    # Seconds a cached remediation decision stays valid (0 = no cache).
+    remediation_cache_ttl: float = field(
+        default_factory=lambda: float(os.getenv("REMEDIATION_CACHE_TTL", "86400"))
+    )
+    # Distributed mode (backend/broker.py): "" (local queue), "local" or
+    # "elasticsearch"; this node's name, all node names (comma-separated),
+    # alert shards, lease length and the alert dedup window in seconds.
+    broker: str = field(default_factory=lambda: os.getenv("ALERT_BROKER", ""))
+    node_id: str = field(default_factory=lambda: os.getenv("NODE_ID", socket.gethostname()))
+    nodes: list[str] = field(
+        default_factory=lambda: [n for n in os.getenv("NODES", "").split(",") if n.strip()]
+    )
+    alert_shards: int = field(default_factory=lambda: int(os.getenv("ALERT_SHARDS", "32")))
+    lease_seconds: float = field(default_factory=lambda: float(os.getenv("LEASE_SECONDS", "30")))
+    dedup_window: float = field(default_factory=lambda: float(os.getenv("DEDUP_WINDOW", "300")))
+    # Severity scheduler (src/incident_commander/scheduler.py): agent calls
+    # running at once (0 = no scheduler; set INCIDENT_WORKERS above it so
+    # incidents queue by severity there), slots reserved per severity
+    # ("P1=1,P2=1") and seconds of waiting that raise a call one level.
+    agent_concurrency: int = field(default_factory=lambda: int(os.getenv("AGENT_CONCURRENCY", "0")))
+    scheduler_reservations: str = field(
+        default_factory=lambda: os.getenv("SCHEDULER_RESERVATIONS", "P1=1")
+    )
+    scheduler_aging_seconds: float = field(
+        default_factory=lambda: float(os.getenv("SCHEDULER_AGING_SECONDS", "30"))
+    )
+    # Public URL of this daemon's POST /a2a/push, sent with every A2A task
+    # so agents push status updates ("" = poll only).
+    a2a_push_url: str = field(default_factory=lambda: os.getenv("A2A_PUSH_URL", ""))
+    # JSON routing policy (src/incident_commander/routing.py); "" = the default.
+    routing_policy_path: str = field(default_factory=lambda: os.getenv("ROUTING_POLICY_PATH", ""))
 
 
 @dataclass
@@ -0,0 +1,115 @@
+"""Index templates for the ``logs-incident-*`` / ``metrics-incident-*`` data streams.
+
+Derived from the sample-data schemas in ``sample_data.py``:
+
+- Logs: ``service.name`` / ``host.name`` and the other filter fields are
+  ``keyword``; ``message`` is ``match_only_text`` (no positions or scoring
+  data, which the ES|QL tools don't use).
+- Metrics: a TSDB (``index.mode: time_series``) data stream with
+  ``service.name`` / ``host.name`` as dimensions and the percentages as
+  ``scaled_float`` gauges, which sorts and compresses documents by series.
+- Both: ``data_stream.*`` are ``constant_keyword``, so a filter on them is
+  answered per backing index instead of per document.  ``service.name``
+  varies within a stream, so it can't be ``constant_keyword`` here.
+
+The templates cover every namespace of the ``incident`` dataset (the
+sample streams are ``*-incident-demo``); other names fall through to the
+built-in ``logs-*`` / ``metrics-*`` templates, so ``template_for`` lets
+callers refuse them.  ``scripts/ingest_data.py --data-stream`` installs
+the templates.
+"""
+
+from __future__ import annotations
+
+from fnmatch import fnmatchcase
+from typing import Any
+
+from backend.definitions.sample_data import (
+    LOG_INDEX,
+    LOG_MAPPINGS,
+    METRICS_INDEX,
+    METRICS_MAPPINGS,
+)
+
+LOG_PATTERN = "logs-incident-*"
+METRICS_PATTERN = "metrics-incident-*"
+# Above the built-in logs/metrics templates (priority 100).
+PRIORITY = 200
+DIMENSIONS = ("service.name", "host.name")
+PCT_SCALING_FACTOR = 10_000  # sample metrics carry 4 decimal places
+
+
+def _data_stream_fields(kind: str, pattern: str) -> dict[str, dict]:
+    _, dataset, namespace = pattern.split("-", 2)
+    fields = {}
+    for name, value in (("type", kind), ("dataset", dataset), ("namespace", namespace)):
+        # A wildcard part takes its value from each backing index's first document.
+        mapping = {"type": "constant_keyword"}
+        if "*" not in value:
+            mapping["value"] = value
+        fields[f"data_stream.{name}"] = mapping
+    return fields
+
+
+def logs_template(pattern: str = LOG_PATTERN) -> dict[str, Any]:
+    """Index template for the logs data streams matching ``pattern``."""
+    properties = dict(LOG_MAPPINGS["properties"])
+    properties["message"] = {"type": "match_only_text"}
+    properties.update(_data_stream_fields("logs", pattern))
+    return {
+        "index_patterns": [pattern],
+        "data_stream": {},
+        "priority": PRIORITY,
+        "template": {
+            "settings": {"index.codec": "best_compression"},
+            "mappings": {"properties": properties},
+        },
+    }
+
+
+def metrics_template(pattern: str = METRICS_PATTERN) -> dict[str, Any]:
+    """Index template for the TSDB metrics data streams matching ``pattern``."""
+    properties: dict[str, dict] = {}
+    for name, mapping in METRICS_MAPPINGS["properties"].items():
+        kind = mapping["type"]
+        if name in DIMENSIONS:
+            mapping = {"type": "keyword", "time_series_dimension": True}
+        elif kind == "float":
+            mapping = {
+                "type": "scaled_float",
+                "scaling_factor": PCT_SCALING_FACTOR,
+                "time_series_metric": "gauge",
+            }
+        elif kind == "integer":
+            mapping = {"type": "long", "time_series_metric": "gauge"}
+        properties[name] = mapping
+    properties.update(_data_stream_fields("metrics", pattern))
+    return {
+        "index_patterns": [pattern],
+        "data_stream": {},
+        "priority": PRIORITY,
+        "template": {
+            "settings": {
+                "index.mode": "time_series",
+                "index.routing_path": list(DIMENSIONS),
+                # Accept the sample data's two-hour history on a fresh stream.
+                "index.look_back_time": "1d",
+            },
+            "mappings": {"properties": properties},
+        },
+    }
+
+
+INDEX_TEMPLATES: dict[str, dict[str, Any]] = {
+    "logs-incident-template": logs_template(),
+    "metrics-incident-template": metrics_template(),
+}
+DATA_STREAMS = (LOG_INDEX, METRICS_INDEX)
+
+
+def template_for(stream: str) -> str | None:
+    """Name of the template in ``INDEX_TEMPLATES`` matching ``stream``, if any."""
+    for name, template in INDEX_TEMPLATES.items():
+        if any(fnmatchcase(stream, pattern) for pattern in template["index_patterns"]):
+            return name
+    return None
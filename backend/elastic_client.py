@@ -6,15 +6,52 @@ plus the Elasticsearch APIs for data ingestion and ES|QL queries.
 
 from __future__ import annotations
 
+import asyncio
 import httpx
+import json
 import logging
+import random
+import zlib
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
 
 from backend.config import config
+from src.bulk_retry import is_rejected
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT = 60.0
+# Bodies below this size are encoded/decoded inline; larger ones in a thread.
+OFFLOAD_BYTES = 64 * 1024
+# Index settings for the duration of a bulk load (see ElasticClient.ingest_mode).
+INGEST_SETTINGS: dict[str, Any] = {"refresh_interval": "-1", "number_of_replicas": 0}
+
+
+def gzip_bytes(data: bytes, level: int) -> bytes:
+    """gzip ``data`` (zlib releases the GIL, so this runs well in a thread)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def encode_body(payload: bytes, level: int, min_bytes: int) -> tuple[bytes, dict[str, str]]:
+    """Return the request body and extra headers, gzipped when worthwhile."""
+    if level <= 0 or len(payload) < min_bytes:
+        return payload, {}
+    return gzip_bytes(payload, level), {"Content-Encoding": "gzip"}
+
+
+def encode_ndjson(lines: list[dict], level: int = 0, min_bytes: int = 0) -> tuple[bytes, dict]:
+    """Serialise ``_bulk`` lines as NDJSON and optionally gzip them."""
+    body = ("\n".join(json.dumps(line) for line in lines) + "\n").encode()
+    return encode_body(body, level, min_bytes)
+
+
+def decode_json(raw: bytes, encoding: str | None) -> Any:
+    """Parse a (possibly gzip-encoded) JSON response body."""
+    if encoding == "gzip":
+        raw = zlib.decompress(raw, 31)
+    return json.loads(raw)
 
 
 class ElasticClient:
@@ -47,33 +84,130 @@ class ElasticClient:
         resp.raise_for_status()
         return resp.json()
 
+    async def es_post_body(self, path: str, payload: bytes | list[dict], content_type: str) -> dict:
+        """POST a large body; encoding, gzip and response parsing run off the loop.
+
+        ``payload`` is raw bytes, or ``_bulk`` lines to be encoded as NDJSON.
+        Responses are requested with ``Accept-Encoding: gzip`` and read raw, so
+        decompression also happens in the worker thread.
+        """
+        level, min_bytes = config.elastic.gzip_level, config.elastic.gzip_min_bytes
+        if isinstance(payload, list):
+            body, extra = await asyncio.to_thread(encode_ndjson, payload, level, min_bytes)
+        elif level > 0 and len(payload) >= min_bytes:
+            body, extra = await asyncio.to_thread(encode_body, payload, level, min_bytes)
+        else:
+            body, extra = payload, {}
+        client = await self._get_client()
+        headers = {
+            **config.elastic.es_headers,
+            "Content-Type": content_type,
+            "Accept-Encoding": "gzip",
+            **extra,
+        }
+        request = client.build_request(
+            "POST", f"{self.es_url}/{path.lstrip('/')}", headers=headers, content=body
+        )
+        resp = await client.send(request, stream=True)
+        try:
+            raw = b"".join([chunk async for chunk in resp.aiter_raw()])
+        finally:
+            await resp.aclose()
+        resp.raise_for_status()
+        encoding = resp.headers.get("Content-Encoding")
+        if len(raw) < OFFLOAD_BYTES:
+            return decode_json(raw, encoding)
+        return await asyncio.to_thread(decode_json, raw, encoding)
+
     async def create_index(self, index: str, mappings: dict | None = None) -> dict:
         body = {}
         if mappings:
             body["mappings"] = mappings
         return await self.es_request("PUT", f"/{index}", json=body)
 
-    async def bulk_index(self, index: str, documents: list[dict]) -> dict:
-        lines = []
-        for doc in documents:
-            lines.append({"index": {"_index": index}})
-            lines.append(doc)
-        # Use ndjson format
-        client = await self._get_client()
-        url = f"{self.es_url}/_bulk"
-        headers = {**config.elastic.es_headers, "Content-Type": "application/x-ndjson"}
-        import json as json_mod
+    async def put_index_template(self, name: str, template: dict) -> dict:
+        return await self.es_request("PUT", f"/_index_template/{name}", json=template)
 
-        body = "\n".join(json_mod.dumps(line) for line in lines) + "\n"
-        resp = await client.post(url, headers=headers, content=body)
-        resp.raise_for_status()
-        return resp.json()
+    async def create_data_stream(self, name: str) -> bool:
+        """Create data stream ``name``; returns False if it already exists."""
+        try:
+            await self.es_request("PUT", f"/_data_stream/{name}")
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code == 400 and "already_exists" in exc.response.text:
+                return False
+            raise
+        return True
+
+    @asynccontextmanager
+    async def ingest_mode(
+        self, target: str, settings: dict[str, Any] | None = None
+    ) -> AsyncIterator[None]:
+        """Apply bulk-load ``settings`` to ``target`` and restore them on exit.
+
+        ``settings`` default to ``INGEST_SETTINGS`` (refresh disabled, no
+        replicas).  The previous per-index values are put back afterwards
+        (settings that weren't set explicitly are reset to their default)
+        and ``target`` is refreshed so the loaded documents become visible.
+        """
+        settings = settings or INGEST_SETTINGS
+        names = ",".join(f"index.{key}" for key in settings)
+        current = await self.es_request(
+            "GET", f"/{target}/_settings/{names}", params={"flat_settings": "true"}
+        )
+        await self.es_request("PUT", f"/{target}/_settings", json={"index": settings})
+        try:
+            yield
+        finally:
+            for index, body in current.items():
+                previous = body.get("settings", {})
+                restore = {f"index.{key}": previous.get(f"index.{key}") for key in settings}
+                await self.es_request("PUT", f"/{index}/_settings", json=restore)
+            await self.es_request("POST", f"/{target}/_refresh")
+
+    async def bulk_index(self, index: str, documents: list[dict], op_type: str = "index") -> dict:
+        """Index ``documents``; items rejected with 429 are retried with backoff.
+
+        Only the rejected items are re-sent, up to ``bulk_max_retries`` times.
+        The response has one item per document, in order, holding its final
+        result; ``errors`` is true if any item still failed.  ``op_type`` is
+        the bulk action: ``index``, or ``create`` for data streams, which
+        accept nothing else.
+        """
+        items: list[dict | None] = [None] * len(documents)
+        pending = list(range(len(documents)))
+        retries = config.elastic.bulk_max_retries
+        for attempt in range(retries + 1):
+            lines = []
+            for i in pending:
+                lines.append({op_type: {"_index": index}})
+                lines.append(documents[i])
+            try:
+                response = await self.es_post_body("/_bulk", lines, "application/x-ndjson")
+                results = response["items"]
+            except httpx.HTTPStatusError as exc:
+                if exc.response.status_code != 429:
+                    raise
+                rejected = {"status": 429, "error": {"type": "es_rejected_execution_exception"}}
+                results = [{op_type: rejected}] * len(pending)
+            retry = []
+            for i, item in zip(pending, results):
+                items[i] = item
+                if is_rejected(next(iter(item.values()))):
+                    retry.append(i)
+            if not retry or attempt == retries:
+                break
+            pending = retry
+            delay = config.elastic.bulk_retry_backoff * 2**attempt
+            logger.warning("Retrying %d rejected bulk items in %.1fs", len(retry), delay)
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+        errors = any("error" in next(iter(item.values())) for item in items if item)
+        return {"errors": errors, "items": items}
 
     async def run_esql(self, query: str, params: list[dict] | None = None) -> dict:
         body: dict[str, Any] = {"query": query}
         if params:
             body["params"] = params
-        return await self.es_request("POST", "/_query", json=body)
+        return await self.es_post_body("/_query", json.dumps(body).encode(), "application/json")
 
     async def index_exists(self, index: str) -> bool:
         try:
@@ -0,0 +1,548 @@
+"""Long-running Incident Commander daemon with an HTTP alert endpoint.
+
+Run with ``python -m backend.server``.  The daemon keeps its Kibana and
+Elasticsearch clients (and their connection pools) open for its whole
+lifetime and warms them up at start, so per-alert latency no longer
+includes process start-up, imports and TLS handshakes.
+
+Endpoints:
+
+- ``POST /alerts``: one alert object or a list of them.  Alerts are queued
+  (``202``) and processed by ``workers`` concurrent tasks.  When the
+  in-memory queue is full alerts spill to disk; ``503`` only if that fails.
+- ``GET /health``: liveness plus queue depth.
+- ``GET /metrics``: Prometheus text format counters.
+- ``GET /timeline/stream``: server-sent events with incident timeline
+  deltas (``backend/timeline_feed.py``); resume with ``Last-Event-ID`` or
+  ``?since=<seq>``, filter with ``?incident=<id>``.
+- ``GET /incidents`` and ``GET /incidents/<id>``: current snapshots, for
+  first load and after a ``reset`` event.
+- ``POST /alerts`` with a ``broker`` (distributed mode, ``backend/broker.py``):
+  alerts are published to the shared queue instead and the workers lease
+  them from the node's shards, stealing from others when idle.
+- ``POST /deployments``: ``{"service.name": ...}`` deployment notice; drops
+  that service's cached remediation decisions.
+
+The HTTP layer is a small asyncio HTTP/1.1 server (keep-alive,
+``Content-Length`` bodies), so the daemon needs no web framework.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import logging
+import signal
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+from backend.alert_queue import QueueFullError, SpilloverQueue
+from backend.broker import (
+    AlertBroker,
+    DedupCache,
+    ElasticsearchBroker,
+    LocalBroker,
+    ShardWorker,
+    owned_shards,
+)
+from backend.config import config
+from backend.timeline_feed import TimelineFeed
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict[str, Any]], Awaitable[Any]]
+MAX_BODY_BYTES = 1024 * 1024
+SHUTDOWN_GRACE_SECONDS = 10.0
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    headers: dict[str, str]
+    body: bytes
+    query: dict[str, str] = field(default_factory=dict)
+
+    def json(self) -> Any:
+        return json.loads(self.body or b"null")
+
+
+@dataclass
+class DaemonMetrics:
+    """Counters exposed on ``/metrics``."""
+
+    received: int = 0
+    rejected: int = 0
+    spilled: int = 0
+    processed: int = 0
+    failed: int = 0
+    processing_seconds: float = 0.0
+    started: float = field(default_factory=time.time)
+
+
+class IncidentDaemon:
+    """Queues alerts from the HTTP endpoint and runs ``handler`` on each.
+
+    Args:
+        handler: Coroutine function processing one alert (e.g.
+            ``IncidentOrchestrator.handle_alert``).
+        queue: Alert queue; defaults to one built from ``ServerConfig``.
+        workers: Alerts processed concurrently.
+        warmups: Coroutine functions run once at start (connection warm-up);
+            failures are logged, not fatal.
+        closers: Coroutine functions run at shutdown (close client pools).
+        feed: Timeline feed served to dashboards; pass the same feed as the
+            orchestrator's incident ``listener``.
+        counters: Extra ``/metrics`` counters, read on each scrape (e.g. the
+            routing policy's ``stats.as_dict``).
+        on_deployment: Called with the service of each ``POST /deployments``;
+            returns the number of cache entries it invalidated.
+        on_push: Called with each A2A push notification (``POST /a2a/push``,
+            e.g. ``A2ATaskManager.handle_push``); returns whether a running
+            task took it.
+        broker: Shared alert queue (distributed mode); replaces ``queue``.
+        shards: Broker shards this node owns (default: all).
+        node: This node's name, used for its workers' leases.
+        exporters: Return extra Prometheus text for ``/metrics`` (e.g.
+            ``SeverityScheduler.prometheus`` with its labelled series).
+    """
+
+    def __init__(
+        self,
+        handler: Handler,
+        queue: SpilloverQueue | None = None,
+        workers: int | None = None,
+        warmups: list[Callable[[], Awaitable[Any]]] | None = None,
+        closers: list[Callable[[], Awaitable[Any]]] | None = None,
+        feed: TimelineFeed | None = None,
+        counters: Callable[[], dict[str, int]] | None = None,
+        on_deployment: Callable[[str], int] | None = None,
+        on_push: Callable[[dict[str, Any]], bool] | None = None,
+        broker: AlertBroker | None = None,
+        shards: Iterable[int] | None = None,
+        node: str | None = None,
+        exporters: list[Callable[[], str]] | None = None,
+    ) -> None:
+        server = config.server
+        self.handler = handler
+        self.queue = queue or SpilloverQueue(
+            server.queue_size, Path(server.spill_path) if server.spill_path else None
+        )
+        self.workers = workers or server.workers
+        self.warmups = warmups or []
+        self.closers = closers or []
+        self.metrics = DaemonMetrics()
+        self.feed = feed or TimelineFeed()
+        self.counters = counters
+        self.on_deployment = on_deployment
+        self.on_push = on_push
+        self.broker = broker
+        if broker is not None and shards is None:
+            shards = range(broker.num_shards)
+        self.shards = frozenset(shards or ())
+        self.node = node or server.node_id
+        self.exporters = exporters or []
+        self.shard_workers: list[ShardWorker] = []
+        self._in_flight: dict[int, dict[str, Any]] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._server: asyncio.Server | None = None
+        self._connections: set[asyncio.Task] = set()
+
+    # ── lifecycle ───────────────────────────────────────────────────
+
+    async def start(self, host: str | None = None, port: int | None = None) -> None:
+        """Warm up the clients, start the workers and listen for HTTP."""
+        results = await asyncio.gather(*(w() for w in self.warmups), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Warm-up failed: %s", result)
+        if self.broker is not None:
+            dedup = DedupCache(config.server.dedup_window)
+            self.shard_workers = [
+                ShardWorker(
+                    self.broker,
+                    functools.partial(self._handle_leased, i),
+                    f"{self.node}/{i}",
+                    self.shards,
+                    lease_seconds=config.server.lease_seconds,
+                    dedup=dedup if config.server.dedup_window > 0 else None,
+                )
+                for i in range(self.workers)
+            ]
+            self._tasks = [asyncio.create_task(w.run()) for w in self.shard_workers]
+        else:
+            self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        self._server = await asyncio.start_server(
+            self._serve,
+            host or config.server.host,
+            config.server.port if port is None else port,
+        )
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self, grace: float = SHUTDOWN_GRACE_SECONDS) -> None:
+        """Stop accepting alerts, let workers finish, persist the rest."""
+        if self._server is not None:
+            self._server.close()
+            # Idle keep-alive and event-stream connections would keep
+            # wait_closed() waiting; requests are handled without awaiting,
+            # so cancelling the connection tasks loses nothing.
+            for task in self._connections:
+                task.cancel()
+            await self._server.wait_closed()
+        if self._in_flight:
+            deadline = time.monotonic() + grace
+            while self._in_flight and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+        # With a broker, cancelled workers release their leases instead.
+        interrupted = [] if self.broker else list(self._in_flight.values())
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self.queue.spill_path is not None and (interrupted or self.queue.in_memory):
+            kept = self.queue.drain_to_disk(interrupted)
+            logger.info("Persisted %d queued alerts to %s", kept, self.queue.spill_path)
+        for close in self.closers:
+            await close()
+
+    async def serve_forever(self) -> None:
+        """Run until SIGINT/SIGTERM, then shut down gracefully."""
+        await self.start()
+        logger.info("Incident daemon listening on %s:%d", config.server.host, self.port)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        await stop.wait()
+        await self.stop()
+
+    # ── processing ──────────────────────────────────────────────────
+
+    async def _worker(self, number: int) -> None:
+        while True:
+            alert = await self.queue.get()
+            self._in_flight[number] = alert
+            started = time.perf_counter()
+            try:
+                await self.handler(alert)
+                self.metrics.processed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.metrics.failed += 1
+                logger.exception("Failed to process alert %s", alert.get("title", ""))
+            finally:
+                self.metrics.processing_seconds += time.perf_counter() - started
+            # Only cleared once handled: a cancelled alert stays for stop().
+            del self._in_flight[number]
+
+    async def _handle_leased(self, number: int, alert: dict[str, Any]) -> None:
+        """``handler`` for a ``ShardWorker``: errors go back to it (lease release)."""
+        self._in_flight[number] = alert
+        started = time.perf_counter()
+        try:
+            await self.handler(alert)
+            self.metrics.processed += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.metrics.failed += 1
+            raise
+        finally:
+            self.metrics.processing_seconds += time.perf_counter() - started
+            del self._in_flight[number]
+
+    def enqueue(self, alerts: list[dict[str, Any]]) -> int:
+        """Queue ``alerts``; returns how many went to disk."""
+        spilled = 0
+        for alert in alerts:
+            spilled += self.queue.put_nowait(alert)
+            self.metrics.received += 1
+        self.metrics.spilled += spilled
+        return spilled
+
+    # ── HTTP ────────────────────────────────────────────────────────
+
+    async def route(self, request: Request) -> tuple[int, Any]:
+        if request.method == "POST" and request.path == "/alerts":
+            try:
+                payload = request.json()
+            except ValueError:
+                return 400, {"error": "body must be JSON"}
+            alerts = payload if isinstance(payload, list) else [payload]
+            if not alerts or not all(isinstance(a, dict) for a in alerts):
+                return 400, {"error": "expected an alert object or a list of them"}
+            if self.broker is not None:
+                try:
+                    shards = await self.broker.publish(alerts)
+                except Exception as exc:
+                    self.metrics.rejected += 1
+                    return 503, {"error": f"could not queue alerts: {exc}"}
+                self.metrics.received += len(alerts)
+                return 202, {"queued": len(alerts), "shards": shards}
+            try:
+                spilled = self.enqueue(alerts)
+            except QueueFullError as exc:
+                self.metrics.rejected += 1
+                return 503, {"error": str(exc)}
+            return 202, {"queued": len(alerts), "spilled": spilled, "depth": self.queue.qsize()}
+        if request.method == "POST" and request.path == "/deployments":
+            try:
+                payload = request.json()
+            except ValueError:
+                return 400, {"error": "body must be JSON"}
+            service = payload.get("service.name") if isinstance(payload, dict) else None
+            if not service:
+                return 400, {"error": 'expected {"service.name": ...}'}
+            invalidated = self.on_deployment(service) if self.on_deployment else 0
+            return 200, {"service": service, "invalidated": invalidated}
+        if request.method == "POST" and request.path == "/a2a/push" and self.on_push:
+            try:
+                payload = request.json()
+            except ValueError:
+                return 400, {"error": "body must be JSON"}
+            if not isinstance(payload, dict):
+                return 400, {"error": "expected an A2A task update object"}
+            return 200, {"accepted": self.on_push(payload)}
+        if request.method == "GET" and request.path == "/health":
+            return 200, {
+                "status": "ok",
+                "workers": self.workers,
+                "busy": len(self._in_flight),
+                "queue": {"memory": self.queue.in_memory, "disk": self.queue.spilled},
+                "uptime_seconds": round(time.time() - self.metrics.started, 1),
+                **({"node": self.node, "shards": sorted(self.shards)} if self.broker else {}),
+            }
+        if request.method == "GET" and request.path == "/metrics":
+            return 200, self.prometheus()
+        if request.method == "GET" and request.path == "/timeline/stream":
+            since = request.headers.get("last-event-id") or request.query.get("since")
+            try:
+                cursor = int(since) if since else None
+            except ValueError:
+                return 400, {"error": f"invalid event id {since!r}"}
+            return 200, self.feed.stream(cursor, request.query.get("incident"))
+        if request.method == "GET" and request.path == "/incidents":
+            return 200, {"last_seq": self.feed.last_seq, "incidents": self.feed.snapshot()}
+        if request.method == "GET" and request.path.startswith("/incidents/"):
+            snapshot = self.feed.snapshot(request.path.removeprefix("/incidents/"))
+            if snapshot is None:
+                return 404, {"error": "unknown incident"}
+            return 200, snapshot
+        return 404, {"error": f"no route for {request.method} {request.path}"}
+
+    def prometheus(self) -> str:
+        m = self.metrics
+        lines = [
+            ("incident_alerts_received_total", "counter", m.received),
+            ("incident_alerts_rejected_total", "counter", m.rejected),
+            ("incident_alerts_spilled_total", "counter", m.spilled),
+            ("incident_alerts_processed_total", "counter", m.processed),
+            ("incident_alerts_failed_total", "counter", m.failed),
+            ("incident_processing_seconds_total", "counter", round(m.processing_seconds, 6)),
+            ("incident_queue_memory", "gauge", self.queue.in_memory),
+            ("incident_queue_disk", "gauge", self.queue.spilled),
+            ("incident_workers_busy", "gauge", len(self._in_flight)),
+        ]
+        if self.shard_workers:
+            totals = sum((w.stats for w in self.shard_workers), Counter())
+            lines += [
+                (f"incident_broker_{name}_total", "counter", totals[name])
+                for name in ("processed", "stolen", "deduplicated", "failed", "dropped", "lost")
+            ]
+        if self.counters is not None:
+            lines += [
+                (f"incident_routing_{name}_total", "counter", value)
+                for name, value in self.counters().items()
+            ]
+        out = []
+        for name, kind, value in lines:
+            out += [f"# TYPE {name} {kind}", f"{name} {value}"]
+        return "\n".join(out) + "\n" + "".join(export() for export in self.exporters)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except ValueError as exc:
+                    await _write_response(writer, 400, {"error": str(exc)}, keep_alive=False)
+                    return
+                if request is None:
+                    return
+                status, body = await self.route(request)
+                if isinstance(body, AsyncIterator):
+                    await _write_stream(writer, body)
+                    return
+                keep_alive = request.headers.get("connection", "").lower() != "close"
+                await _write_response(writer, status, body, keep_alive)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Request | None:
+    """Parse one HTTP/1.1 request; ``None`` when the client closed the connection."""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _version = line.decode("latin-1").split()
+    except ValueError:
+        raise ValueError("malformed request line") from None
+    headers: dict[str, str] = {}
+    while (header := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, _, value = header.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length > MAX_BODY_BYTES:
+        raise ValueError(f"body larger than {MAX_BODY_BYTES} bytes")
+    body = await reader.readexactly(length) if length else b""
+    url = urlsplit(target)
+    return Request(method.upper(), url.path, headers, body, dict(parse_qsl(url.query)))
+
+
+async def _write_response(
+    writer: asyncio.StreamWriter, status: int, body: Any, keep_alive: bool
+) -> None:
+    if isinstance(body, str):
+        data, content_type = body.encode(), "text/plain; version=0.0.4"
+    else:
+        data, content_type = json.dumps(body).encode(), "application/json"
+    head = (
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(data)}\r\n"
+        f"Access-Control-Allow-Origin: {config.server.frontend_url}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode() + data)
+    await writer.drain()
+
+
+async def _write_stream(writer: asyncio.StreamWriter, frames: AsyncIterator[bytes]) -> None:
+    """Send a ``text/event-stream`` response until the client disconnects."""
+    head = (
+        "HTTP/1.1 200 OK\r\n"
+        "Content-Type: text/event-stream\r\n"
+        "Cache-Control: no-cache\r\n"
+        f"Access-Control-Allow-Origin: {config.server.frontend_url}\r\n"
+        "Connection: close\r\n\r\n"
+    )
+    writer.write(head.encode())
+    try:
+        async for frame in frames:
+            writer.write(frame)
+            await writer.drain()
+    finally:
+        await frames.aclose()
+
+
+def build_daemon() -> IncidentDaemon:
+    """The production daemon: orchestrator pipeline over pooled, warmed clients."""
+    from backend.elastic_client import ElasticClient
+    from incident_commander.agents import ALL_AGENTS
+    from incident_commander.elastic_client import AgentBuilderClient
+    from src.agent_builder.a2a import A2AClient, A2ATaskManager
+    from src.incident_commander.history import IncidentHistory
+    from src.incident_commander.orchestrator import IncidentOrchestrator
+    from src.incident_commander.remediation_cache import RemediationCache
+    from src.incident_commander.routing import RoutingPolicy
+    from src.incident_commander.scheduler import SeverityScheduler, parse_reservations
+
+    kibana = AgentBuilderClient()
+    # Agent calls are submitted and polled, with per-phase deadlines.
+    a2a_url = kibana.cfg.a2a_server_url or f"{kibana.cfg.agent_builder_base_url}/a2a"
+    # With A2A_PUSH_URL set, agents push task updates to POST /a2a/push and
+    # polling falls back to the slowest backoff.
+    tasks = A2ATaskManager(
+        A2AClient(a2a_url, kibana.cfg.kibana_api_key),
+        push_url=config.server.a2a_push_url or None,
+    )
+    elastic = ElasticClient()
+    roles = ["triage", "diagnosis", "remediation", "communication"]
+    agent_ids = {role: agent["agentId"] for role, agent in zip(roles, ALL_AGENTS)}
+    feed = TimelineFeed()
+    path = config.server.routing_policy_path
+    policy = RoutingPolicy.load(path) if path else RoutingPolicy()
+    index = config.server.history_index
+    history = IncidentHistory(elastic, index) if index else None
+    server = config.server
+    ttl = server.remediation_cache_ttl
+    # With a broker each node has its own cache, and POST /deployments
+    # reaches only one of them: cached actions stay proposals there.
+    cache = RemediationCache(ttl=ttl, direct=not server.broker) if ttl > 0 else None
+    scheduler = None
+    if server.agent_concurrency > 0:
+        scheduler = SeverityScheduler(
+            server.agent_concurrency,
+            parse_reservations(server.scheduler_reservations),
+            server.scheduler_aging_seconds,
+        )
+    orchestrator = IncidentOrchestrator(
+        client=kibana,
+        agent_ids=agent_ids,
+        listener=feed.publish,
+        pipeline=config.server.pipeline,
+        policy=policy,
+        history=history,
+        remediation_cache=cache,
+        scheduler=scheduler,
+        task_manager=tasks,
+    )
+
+    async def warm_elastic() -> None:
+        await elastic.es_request("GET", "/")
+
+    def counters() -> dict[str, int]:
+        cached = {f"cache_{name}": count for name, count in cache.stats.items()} if cache else {}
+        return {**policy.stats.as_dict(), **cached}
+
+    warmups = [kibana.list_agents, warm_elastic]
+    if history is not None:
+        warmups.append(history.ensure_index)
+    broker: AlertBroker | None = None
+    if server.broker == "elasticsearch":
+        broker = ElasticsearchBroker(elastic, num_shards=server.alert_shards)
+        warmups.insert(0, broker.ensure_index)
+    elif server.broker == "local":
+        broker = LocalBroker(server.alert_shards)
+    elif server.broker:
+        raise ValueError(f"unknown ALERT_BROKER {server.broker!r}")
+    return IncidentDaemon(
+        orchestrator.handle_alert,
+        warmups=warmups,
+        closers=[tasks.close, tasks.client.close, kibana.close, elastic.close],
+        feed=feed,
+        counters=counters,
+        on_deployment=cache.invalidate if cache else None,
+        on_push=tasks.handle_push,
+        broker=broker,
+        shards=owned_shards(server.node_id, server.nodes, server.alert_shards),
+        node=server.node_id,
+        exporters=[scheduler.prometheus] if scheduler else None,
+    )
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    asyncio.run(build_daemon().serve_forever())
+
+
+if __name__ == "__main__":
+    main()
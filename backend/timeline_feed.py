@@ -0,0 +1,134 @@
+"""Incremental incident timeline feed for dashboard viewers.
+
+``TimelineFeed.publish`` is the ``listener`` of the orchestrator's
+incidents: every delta (incident opened, timeline event, phase change)
+gets the next global sequence number and is encoded once as a
+server-sent-event frame.  Each viewer keeps only a cursor into that log,
+so an update costs every viewer one pre-encoded frame, not a
+re-serialised incident snapshot.
+
+Viewers resume with ``Last-Event-ID`` (or ``?since=``).  If their cursor
+fell out of the retained window they receive a ``reset`` frame and should
+reload the snapshot from ``/incidents/<id>`` before following the stream
+again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator
+from itertools import islice
+from typing import Any
+
+HEARTBEAT_SECONDS = 15.0
+
+
+def sse_frame(seq: int | None, event: str, data: Any) -> bytes:
+    """Encode one server-sent event."""
+    head = f"id: {seq}\n" if seq is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, default=str)}\n\n".encode()
+
+
+class TimelineFeed:
+    """Sequenced log of incident deltas with per-viewer cursors.
+
+    Args:
+        max_deltas: Deltas retained for resuming viewers.
+        max_incidents: Incident snapshots kept for ``snapshot()`` / reloads.
+    """
+
+    def __init__(self, max_deltas: int = 10_000, max_incidents: int = 200) -> None:
+        self.max_incidents = max_incidents
+        self._log: deque[tuple[int, str, bytes]] = deque(maxlen=max_deltas)
+        self._seq = 0
+        self._changed = asyncio.Event()
+        self._incidents: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    @property
+    def first_seq(self) -> int:
+        """Oldest sequence number still retained (``last_seq + 1`` if empty)."""
+        return self._log[0][0] if self._log else self._seq + 1
+
+    def publish(self, _incident: Any, delta: dict[str, Any]) -> int:
+        """Append ``delta`` (an ``Incident.listener``); returns its sequence number."""
+        self._seq += 1
+        incident_id = delta["incident"]
+        self._log.append((self._seq, incident_id, sse_frame(self._seq, delta["type"], delta)))
+        self._apply(incident_id, delta)
+        # Wake every waiting viewer, then arm a fresh event for the next delta.
+        self._changed.set()
+        self._changed = asyncio.Event()
+        return self._seq
+
+    def _apply(self, incident_id: str, delta: dict[str, Any]) -> None:
+        fields = {k: v for k, v in delta.items() if k not in ("type", "incident")}
+        if delta["type"] == "incident":
+            self._incidents[incident_id] = {**fields, "timeline": []}
+            while len(self._incidents) > self.max_incidents:
+                self._incidents.popitem(last=False)
+            return
+        snapshot = self._incidents.get(incident_id)
+        if snapshot is None:
+            return
+        if delta["type"] == "event":
+            fields.pop("index", None)
+            snapshot["timeline"].append(fields)
+        else:
+            snapshot.update(fields)
+        snapshot["seq"] = self._seq
+
+    def snapshot(self, incident_id: str | None = None) -> Any:
+        """Current state of one incident, or summaries of all retained ones."""
+        if incident_id is not None:
+            return self._incidents.get(incident_id)
+        return [
+            {k: v for k, v in snap.items() if k != "timeline"} for snap in self._incidents.values()
+        ]
+
+    def frames_since(self, cursor: int, incident_id: str | None = None) -> list[bytes]:
+        """Encoded frames after ``cursor`` (a sequence number), oldest first.
+
+        Walks the log from its newest end, so the cost is the number of
+        missed deltas, not the size of the log.
+        """
+        missed = min(self._seq - cursor, len(self._log))
+        frames = [
+            frame
+            for _, incident, frame in islice(reversed(self._log), max(0, missed))
+            if incident_id is None or incident == incident_id
+        ]
+        frames.reverse()
+        return frames
+
+    async def stream(
+        self,
+        cursor: int | None = None,
+        incident_id: str | None = None,
+        heartbeat: float = HEARTBEAT_SECONDS,
+    ) -> AsyncIterator[bytes]:
+        """SSE frames from ``cursor`` on (``None``: only new deltas), forever."""
+        if cursor is None:
+            cursor = self._seq
+        while True:
+            if not self.first_seq - 1 <= cursor <= self._seq:
+                # The deltas after the viewer's cursor are gone (or it comes
+                # from before a restart): it must reload a snapshot.
+                data = {"first_seq": self.first_seq, "last_seq": self._seq}
+                yield sse_frame(None, "reset", data)
+                cursor = self._seq
+            changed = self._changed
+            frames = self.frames_since(cursor, incident_id)
+            cursor = self._seq
+            if frames:
+                yield b"".join(frames)
+                continue
+            try:
+                await asyncio.wait_for(changed.wait(), heartbeat)
+            except TimeoutError:
+                yield b": keep-alive\n\n"
@@ -1,13 +1,31 @@
-"""Configuration management for Elastic Incident Commander."""
+"""Configuration management for Elastic Incident Commander.
+
+Nothing is read at import time: ``.env`` is loaded the first time a
+setting is needed, and the shared ``settings`` instance is created on
+first access (``get_settings()``, or ``config.settings`` via the module
+``__getattr__``).  This keeps ``incident-commander`` startup fast for
+commands that never touch the configuration.
+"""
 
 from __future__ import annotations
 
+import base64
+import functools
 import os
 from dataclasses import dataclass, field
 
-from dotenv import load_dotenv
 
-load_dotenv()
+@functools.cache
+def load_env() -> None:
+    """Load ``.env`` into the environment (once)."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+def _env(name: str) -> str:
+    load_env()
+    return os.getenv(name, "")
 
 
 @dataclass
@@ -18,20 +36,37 @@ class Settings:
     so the app can start without credentials (for testing / local dev).
     """
 
-    elastic_cloud_id: str = field(default_factory=lambda: os.getenv("ELASTIC_CLOUD_ID", ""))
-    elastic_api_key: str = field(default_factory=lambda: os.getenv("ELASTIC_API_KEY", ""))
-    kibana_url: str = field(default_factory=lambda: os.getenv("KIBANA_URL", ""))
-    kibana_api_key: str = field(default_factory=lambda: os.getenv("KIBANA_API_KEY", ""))
-    llm_connector_id: str = field(default_factory=lambda: os.getenv("LLM_CONNECTOR_ID", ""))
-    agent_id: str = field(default_factory=lambda: os.getenv("AGENT_ID", ""))
-    mcp_server_url: str = field(default_factory=lambda: os.getenv("MCP_SERVER_URL", ""))
-    a2a_server_url: str = field(default_factory=lambda: os.getenv("A2A_SERVER_URL", ""))
+    elastic_cloud_id: str = field(default_factory=lambda: _env("ELASTIC_CLOUD_ID"))
+    elastic_api_key: str = field(default_factory=lambda: _env("ELASTIC_API_KEY"))
+    kibana_url: str = field(default_factory=lambda: _env("KIBANA_URL"))
+    kibana_api_key: str = field(default_factory=lambda: _env("KIBANA_API_KEY"))
+    llm_connector_id: str = field(default_factory=lambda: _env("LLM_CONNECTOR_ID"))
+    agent_id: str = field(default_factory=lambda: _env("AGENT_ID"))
+    mcp_server_url: str = field(default_factory=lambda: _env("MCP_SERVER_URL"))
+    a2a_server_url: str = field(default_factory=lambda: _env("A2A_SERVER_URL"))
 
     @property
     def agent_builder_base_url(self) -> str:
         """Base URL for Agent Builder API endpoints."""
         return f"{self.kibana_url}/api/agent_builder"
 
+    @property
+    def elasticsearch_url(self) -> str:
+        """Elasticsearch endpoint encoded in ``ELASTIC_CLOUD_ID`` ("" if unset)."""
+        if not self.elastic_cloud_id:
+            return ""
+        # "<name>:base64(<domain>[:<port>]$<es id>$<kibana id>)"
+        encoded = self.elastic_cloud_id.rpartition(":")[2]
+        decoded = base64.b64decode(encoded + "=" * (-len(encoded) % 4)).decode()
+        domain, es_id = decoded.split("$")[:2]
+        host, _, port = domain.partition(":")
+        return f"https://{es_id}.{host}:{port or 443}"
+
+    @property
+    def elasticsearch_headers(self) -> dict[str, str]:
+        """Headers for direct Elasticsearch requests (``ELASTIC_API_KEY``)."""
+        return {"Authorization": f"ApiKey {self.elastic_api_key}"}
+
     @property
     def kibana_headers(self) -> dict[str, str]:
         """Standard headers for Kibana API requests."""
@@ -52,5 +87,14 @@ class Settings:
         return [k for k, v in required.items() if not v]
 
 
-# Module-level singleton
-settings = Settings()
+@functools.cache
+def get_settings() -> Settings:
+    """The shared ``Settings`` instance, created on first use."""
+    return Settings()
+
+
+def __getattr__(name: str) -> Settings:
+    # Lazy module-level singleton: ``from incident_commander.config import settings``.
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
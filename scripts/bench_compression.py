@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Benchmark gzip levels for ``_bulk`` request bodies.
+
+Builds NDJSON bulk bodies from synthetic log documents (or ``--file``),
+gzips them at each level and reports CPU time, compression ratio and the
+estimated time to ship one body at ``--mbps`` of upload bandwidth
+(compression + transfer).  Pick the lowest level past which the total stops
+improving; for log data that is usually level 1.
+
+Usage:
+    uv run python scripts/bench_compression.py --docs 5000 --mbps 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, ".")
+
+from backend.elastic_client import encode_ndjson, gzip_bytes  # noqa: E402
+
+
+def _documents(count: int) -> list[dict]:
+    return [
+        {
+            "@timestamp": f"2026-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}.{i % 1000:03d}Z",
+            "service.name": f"svc-{i % 12}",
+            "host.name": f"node-{i % 40:02d}",
+            "log.level": "error" if i % 9 == 0 else "info",
+            "message": f"GET /api/v1/orders/{i * 7919 % 100000} completed in {i % 500} ms",
+            "http.response.status_code": 500 if i % 9 == 0 else 200,
+            "trace.id": f"{i * 2654435761 % 2**64:016x}",
+        }
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--file", type=Path, default=None, help="JSONL file to sample from")
+    parser.add_argument("--docs", type=int, default=5000, help="Documents per bulk body")
+    parser.add_argument("--mbps", type=float, default=50.0, help="Upload bandwidth (Mbit/s)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.file:
+        with args.file.open() as f:
+            docs = [json.loads(line) for _, line in zip(range(args.docs), f)]
+    else:
+        docs = _documents(args.docs)
+    lines: list[dict] = []
+    for doc in docs:
+        lines.append({"index": {"_index": "logs"}})
+        lines.append(doc)
+    body, _ = encode_ndjson(lines)
+    size = len(body)
+    bytes_per_s = args.mbps * 1_000_000 / 8
+    print(f"bulk body: {len(docs)} docs, {size / 1_000_000:.2f} MB, uplink {args.mbps} Mbit/s")
+    print(f"  {'level':>5} {'ratio':>7} {'cpu ms':>8} {'MB/s':>8} {'send ms':>9} {'total ms':>9}")
+
+    for level in range(10):
+        best = float("inf")
+        out = body
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            out = gzip_bytes(body, level) if level else body
+            best = min(best, time.perf_counter() - start)
+        cpu = best if level else 0.0
+        send = len(out) / bytes_per_s
+        rate = size / 1_000_000 / cpu if cpu else float("inf")
+        print(
+            f"  {level:>5} {size / len(out):>6.1f}x {cpu * 1000:>8.1f} {rate:>8.0f} "
+            f"{send * 1000:>9.1f} {(cpu + send) * 1000:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Benchmark the memory-mapped JSONL reader against line-by-line text I/O.
+
+Generates a synthetic log dump (or uses ``--file``) and reports parse
+throughput in MB/s for the old ``open()`` + ``strip()`` + ``json.loads``
+loop, ``load_jsonl``, ``load_jsonl_parallel`` (documents shipped back to the
+parent) and ``map_jsonl_ranges`` (work stays in the workers).  The parallel
+rows report per-process MB/s plus wall-clock MB/s.
+
+Usage:
+    uv run python scripts/bench_jsonl_reader.py --docs 200000 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, ".")
+
+from src.data_loader import (  # noqa: E402
+    LoadStats,
+    load_jsonl,
+    load_jsonl_parallel,
+    map_jsonl_ranges,
+)
+
+
+def _generate(path: Path, docs: int) -> None:
+    with path.open("w") as f:
+        for i in range(docs):
+            doc = {
+                "@timestamp": f"2026-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}Z",
+                "service.name": f"svc-{i % 12}",
+                "log.level": "error" if i % 9 == 0 else "info",
+                "message": f"request {i} handled in {i % 500} ms " + "x" * (i % 80),
+                "http": {"status_code": 500 if i % 9 == 0 else 200, "latency_ms": i % 500},
+            }
+            f.write(json.dumps(doc) + "\n")
+
+
+def _text_io(path: Path) -> int:
+    count = 0
+    with path.open() as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                json.loads(line)
+                count += 1
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--file", type=Path, default=None)
+    parser.add_argument("--docs", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    path = args.file
+    if path is None:
+        path = Path(tempfile.mkstemp(suffix=".jsonl")[1])
+        _generate(path, args.docs)
+    size_mb = path.stat().st_size / 1_000_000
+    print(f"{path} ({size_mb:.1f} MB)")
+
+    start = time.perf_counter()
+    count = _text_io(path)
+    elapsed = time.perf_counter() - start
+    print(f"  {'text I/O + json.loads':<28} {size_mb / elapsed:8.1f} MB/s  {count} docs")
+
+    stats = LoadStats()
+    for _ in load_jsonl(path, stats=stats):
+        pass
+    print(f"  {'load_jsonl (mmap)':<28} {stats.mb_per_s:8.1f} MB/s  {stats.documents} docs")
+
+    stats = LoadStats()
+    start = time.perf_counter()
+    for _ in load_jsonl_parallel(path, workers=args.workers, range_size=8_000_000, stats=stats):
+        pass
+    wall = size_mb / (time.perf_counter() - start)
+    label = f"load_jsonl_parallel x{args.workers}"
+    print(f"  {label:<28} {stats.mb_per_s:8.1f} MB/s  {stats.documents} docs  wall {wall:.1f} MB/s")
+
+    stats = LoadStats()
+    start = time.perf_counter()
+    count = sum(map_jsonl_ranges(path, len, args.workers, range_size=8_000_000, stats=stats))
+    wall = size_mb / (time.perf_counter() - start)
+    label = f"map_jsonl_ranges x{args.workers}"
+    print(f"  {label:<28} {stats.mb_per_s:8.1f} MB/s  {count} docs  wall {wall:.1f} MB/s")
+
+    if args.file is None:
+        path.unlink()
+
+
+if __name__ == "__main__":
+    main()
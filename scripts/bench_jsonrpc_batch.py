@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark JSON-RPC batching against one POST per call.
+
+Simulates a fixed network round-trip with a mocked transport and compares
+N sequential ``MCPClient.call_tool`` calls, N concurrent calls, and one
+``call_tools`` batch.  Also compares ``A2AClient.get_task`` polling with a
+single ``get_tasks`` batch.
+
+Usage:
+    uv run python scripts/bench_jsonrpc_batch.py --calls 20 --rtt-ms 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, ".")
+
+from src.agent_builder.a2a import A2AClient  # noqa: E402
+from src.agent_builder.mcp import MCPClient  # noqa: E402
+
+
+def _transport(rtt: float, counter: list[int]) -> httpx.MockTransport:
+    def answer(body: dict) -> dict:
+        return {"jsonrpc": "2.0", "id": body["id"], "result": {"ok": True}}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        counter[0] += 1
+        await asyncio.sleep(rtt)
+        body = json.loads(request.content)
+        if isinstance(body, list):
+            return httpx.Response(200, json=[answer(b) for b in body])
+        return httpx.Response(200, json=answer(body))
+
+    return httpx.MockTransport(handler)
+
+
+async def _timed(label: str, coro, counter: list[int]) -> None:
+    counter[0] = 0
+    start = time.perf_counter()
+    await coro
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"  {label:<28} {elapsed:8.1f} ms  {counter[0]:4d} round-trips")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--rtt-ms", type=float, default=40.0)
+    args = parser.parse_args()
+
+    counter = [0]
+    transport = _transport(args.rtt_ms / 1000, counter)
+
+    mcp = MCPClient("https://mcp.example.com", "bench")
+    mcp._http = httpx.AsyncClient(transport=transport)
+    calls = [(f"tool_{i}", {"i": i}) for i in range(args.calls)]
+
+    async def sequential() -> None:
+        for name, arguments in calls:
+            await mcp.call_tool(name, arguments)
+
+    print(f"MCP tools/call x{args.calls} (rtt {args.rtt_ms:.0f} ms)")
+    await _timed("sequential call_tool", sequential(), counter)
+    await _timed(
+        "concurrent call_tool",
+        asyncio.gather(*(mcp.call_tool(n, a) for n, a in calls)),
+        counter,
+    )
+    await _timed("call_tools batch", mcp.call_tools(calls), counter)
+
+    a2a = A2AClient("https://a2a.example.com", "bench")
+    a2a._http = httpx.AsyncClient(transport=transport)
+    task_ids = [f"INC-{i}-triage" for i in range(args.calls)]
+
+    print(f"\nA2A tasks/get x{args.calls}")
+    await _timed(
+        "concurrent get_task",
+        asyncio.gather(*(a2a.get_task(t) for t in task_ids)),
+        counter,
+    )
+    await _timed("get_tasks batch", a2a.get_tasks(task_ids), counter)
+
+    await mcp.close()
+    await a2a.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
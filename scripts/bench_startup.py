@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Measure ``incident-commander`` import time with ``python -X importtime``.
+
+Imports the CLI module in a fresh interpreter ``--repeat`` times, reports
+the best cumulative import time and the slowest top-level imports, and
+exits non-zero if the time exceeds ``--budget-ms`` or if any ``--forbid``
+module was imported at startup (those must stay lazy).
+
+Usage:
+    uv run python scripts/bench_startup.py --budget-ms 150
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+
+# Heavy modules that CLI startup must not import; commands import them on use.
+DEFAULT_FORBID = ("rich", "dotenv", "httpx", "elasticsearch")
+
+
+def import_times(module: str) -> tuple[dict[str, int], list[tuple[int, str]]]:
+    """Cumulative import time (µs) per module for ``import module``.
+
+    Also returns ``(µs, name)`` of the modules imported directly by
+    ``module`` (interpreter startup imports such as ``site`` excluded).
+    """
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    times: dict[str, int] = {}
+    children: list[tuple[int, str]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, field = line.split("|")
+        name = field.strip()
+        depth = (len(field) - len(field.lstrip()) - 1) // 2
+        times[name] = int(cumulative)
+        if depth == 0 and name != module:
+            children = []  # a top-level import that isn't ours
+        elif depth == 1:
+            children.append((int(cumulative), name))
+        if name == module:
+            break
+    return times, children
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="incident_commander.cli")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--forbid", default=",".join(DEFAULT_FORBID))
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.repeat)]
+    best, children = min(runs, key=lambda run: run[0][args.module])
+    total_ms = best[args.module] / 1000
+    print(f"{args.module}: {total_ms:.1f} ms (best of {args.repeat})")
+    for us, name in sorted(children, reverse=True)[:8]:
+        print(f"  {us / 1000:>7.1f} ms  {name}")
+
+    failed = False
+    loaded = [name for name in args.forbid.split(",") if name and name in best]
+    if loaded:
+        print(f"FAIL: imported at startup: {', '.join(loaded)}")
+        failed = True
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"FAIL: {total_ms:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
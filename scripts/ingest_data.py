@@ -3,36 +3,161 @@
 
 Usage:
     uv run python scripts/ingest_data.py --index <name> --file <path>
+
+``--file`` may be ``.json``/``.jsonl`` or their ``.gz``/``.zst`` versions;
+compressed files are decompressed on the fly.
+
+``--pipeline`` parses and encodes bulk bodies in ``--workers`` processes and
+sends them over ``--senders`` concurrent connections, to the same cluster
+as every other step (ELASTIC_CLOUD_ID / ELASTIC_API_KEY):
+
+    uv run python scripts/ingest_data.py --index logs --file logs.jsonl \\
+        --pipeline --workers 8 --senders 4 --gzip-level 1
+
+``--data-stream`` installs the ``logs-incident-*`` / ``metrics-incident-*``
+index templates (backend/definitions/index_templates.py) and writes to
+``--index`` as a data stream; the name must match one of them.
+``--ingest-mode`` disables refresh and replicas on the target while
+loading and restores them afterwards.
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
 import sys
+from contextlib import nullcontext
 from pathlib import Path
 
 sys.path.insert(0, ".")
 
-from src.data_loader import bulk_index, create_index_if_not_exists, load_json, load_jsonl
-from src.elastic_client import get_es_client
+from incident_commander.config import get_settings
+from incident_commander.elastic_client import get_es_client
+from src.bulk_retry import DeadLetter
+from src.data_loader import (
+    LoadStats,
+    bulk_index,
+    create_data_stream_if_not_exists,
+    create_index_if_not_exists,
+    ingest_settings,
+    load_documents,
+    put_index_templates,
+)
+from src.ingest_pipeline import BulkEncoder, run_pipeline
 from src.utils import console, fatal, setup_logging
 
 setup_logging()
 
 
+def _ingest_pipeline(args: argparse.Namespace, path: Path, dead_letter: Path) -> None:
+    cfg = get_settings()  # what get_es_client connected with
+    encoder = BulkEncoder(
+        args.index,
+        id_field=args.id_field,
+        max_docs=args.bulk_docs,
+        gzip_level=args.gzip_level,
+        op_type="create" if args.data_stream else "index",
+    )
+    console.print(f"[cyan]Indexing documents from {path} (pipeline)...[/]")
+    with DeadLetter(dead_letter) as writer:
+        result = asyncio.run(
+            run_pipeline(
+                path,
+                encoder,
+                cfg.elasticsearch_url,
+                headers=cfg.elasticsearch_headers,
+                workers=args.workers,
+                senders=args.senders,
+                max_retries=args.max_retries,
+                dead_letter=writer,
+            )
+        )
+    console.print(
+        f"[bold green]Done![/] {result}, Errors: {result.errors}, Retried: {result.retried}"
+    )
+    if writer.count:
+        console.print(f"[yellow]{writer.count} failed documents written to {dead_letter}[/]")
+
+
+def _ingest(args: argparse.Namespace, es, path: Path, dead_letter: Path) -> None:
+    stats = LoadStats()
+    docs = load_documents(path, stats=stats, workers=args.decompress_threads)
+
+    console.print(f"[cyan]Indexing documents from {path}...[/]")
+    result = bulk_index(
+        args.index,
+        docs,
+        id_field=args.id_field,
+        es=es,
+        max_retries=args.max_retries,
+        dead_letter=dead_letter,
+        op_type="create" if args.data_stream else "index",
+    )
+    console.print(
+        f"[bold green]Done![/] Indexed: {result['indexed']}, Errors: {result['errors']}, "
+        f"Retried: {result['retried']}"
+    )
+    if result["dead_letter"]:
+        console.print(f"[yellow]Failed documents written to {result['dead_letter']}[/]")
+    if stats.documents:
+        console.print(f"[dim]Parsed {stats}[/]")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Ingest data into Elasticsearch")
     parser.add_argument("--index", required=True, help="Target index name")
-    parser.add_argument("--file", required=True, help="Path to JSON or JSONL file")
+    parser.add_argument(
+        "--file", required=True, help="Path to JSON or JSONL file (optionally .gz / .zst)"
+    )
     parser.add_argument("--id-field", default=None, help="Field to use as document _id")
     parser.add_argument("--mappings-file", default=None, help="Path to mappings JSON file")
+    parser.add_argument(
+        "--decompress-threads",
+        type=int,
+        default=None,
+        help="Threads for multi-member gzip / multi-frame zstd input (default: CPU count)",
+    )
+    parser.add_argument(
+        "--pipeline", action="store_true", help="Encode in worker processes, send concurrently"
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Encoder processes")
+    parser.add_argument("--senders", type=int, default=4, help="Concurrent bulk requests")
+    parser.add_argument("--bulk-docs", type=int, default=5000, help="Documents per bulk request")
+    parser.add_argument("--gzip-level", type=int, default=0, help="gzip bulk bodies (0 = off)")
+    parser.add_argument(
+        "--max-retries", type=int, default=5, help="Retries for items rejected with 429"
+    )
+    parser.add_argument(
+        "--dead-letter",
+        default=None,
+        help="JSONL file for documents that fail permanently (default: <file>.dead.jsonl)",
+    )
+    parser.add_argument(
+        "--data-stream",
+        action="store_true",
+        help="Install the logs/metrics index templates and ingest into a data stream",
+    )
+    parser.add_argument(
+        "--ingest-mode",
+        action="store_true",
+        help="Disable refresh and replicas while loading; restored afterwards",
+    )
     args = parser.parse_args()
 
     path = Path(args.file)
     if not path.exists():
         fatal(f"File not found: {path}")
 
-    es = get_es_client()
+    dead_letter = Path(args.dead_letter) if args.dead_letter else path.with_suffix(".dead.jsonl")
+
+    if args.data_stream:
+        from backend.definitions.index_templates import INDEX_TEMPLATES, template_for
+
+        if template_for(args.index) is None:
+            patterns = ", ".join(p for t in INDEX_TEMPLATES.values() for p in t["index_patterns"])
+            fatal(f"No index template matches data stream {args.index!r} (expected {patterns})")
+
+    es = get_es_client(http_compress=args.gzip_level > 0)
 
     # Create index with optional mappings
     mappings = None
@@ -42,21 +167,23 @@ def main() -> None:
         with open(args.mappings_file) as f:
             mappings = json.load(f)
 
-    created = create_index_if_not_exists(es, args.index, mappings=mappings)
-    if created:
-        console.print(f"[green]Created index: {args.index}[/]")
+    if args.data_stream:
+        put_index_templates(es, INDEX_TEMPLATES)
+        created = create_data_stream_if_not_exists(es, args.index)
+        kind = "data stream"
     else:
-        console.print(f"[yellow]Index already exists: {args.index}[/]")
-
-    # Load and index documents
-    if path.suffix == ".jsonl":
-        docs = load_jsonl(path)
+        created = create_index_if_not_exists(es, args.index, mappings=mappings)
+        kind = "index"
+    if created:
+        console.print(f"[green]Created {kind}: {args.index}[/]")
     else:
-        docs = load_json(path)
+        console.print(f"[yellow]{kind.capitalize()} already exists: {args.index}[/]")
 
-    console.print(f"[cyan]Indexing documents from {path}...[/]")
-    result = bulk_index(args.index, docs, id_field=args.id_field)
-    console.print(f"[bold green]Done![/] Indexed: {result['indexed']}, Errors: {result['errors']}")
+    with ingest_settings(es, args.index) if args.ingest_mode else nullcontext():
+        if args.pipeline:
+            _ingest_pipeline(args, path, dead_letter)
+        else:
+            _ingest(args, es, path, dead_letter)
 
 
 if __name__ == "__main__":
@@ -9,15 +9,25 @@ Key concepts:
 - tasks/get: Check task status
 - tasks/cancel: Cancel a running task
 - Agent Card: Discovery document describing agent capabilities
+
+``A2ATaskManager`` builds on the client to run tasks asynchronously: submit
+without blocking, poll ``tasks/get`` with adaptive backoff, coalescing polls
+that fall due together into one JSON-RPC batch (or accept pushed
+updates from a webhook receiver), enforce deadlines, and ``tasks/cancel``
+work that timed out or was superseded.
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 from dataclasses import dataclass, field
 from typing import Any
 
 import httpx
 
+from .jsonrpc import post_batch, rpc_request
+
 
 @dataclass
 class A2AMessage:
@@ -67,6 +77,12 @@ class A2AClient:
             },
             timeout=60.0,
         )
+        self._request_id = 100
+        self._batch_supported: bool | None = None
+
+    def _next_id(self) -> int:
+        self._request_id += 1
+        return self._request_id
 
     async def get_agent_card(self) -> dict:
         """Fetch the A2A agent card (discovery document)."""
@@ -104,5 +120,276 @@ class A2AClient:
         resp.raise_for_status()
         return resp.json()
 
+    async def get_tasks(self, task_ids: list[str]) -> list[dict]:
+        """Get the status of several tasks in one JSON-RPC batch.
+
+        Falls back to one ``tasks/get`` per task if the server rejects batches.
+        Responses are returned in ``task_ids`` order.
+        """
+        if not task_ids:
+            return []
+        requests = [rpc_request("tasks/get", self._next_id(), {"id": t}) for t in task_ids]
+        responses: list[dict | None] = [None] * len(requests)
+        if self._batch_supported is not False and len(requests) > 1:
+            batched = await post_batch(self._http, self.a2a_url, requests)
+            self._batch_supported = batched is not None
+            if batched is not None:
+                responses = batched
+        missing = [i for i, r in enumerate(responses) if r is None]
+        singles = await asyncio.gather(*(self.get_task(task_ids[i]) for i in missing))
+        for i, response in zip(missing, singles):
+            responses[i] = response
+        return responses  # type: ignore[return-value]
+
     async def close(self) -> None:
         await self._http.aclose()
+
+
+# ── Task manager ────────────────────────────────────────────────
+
+TERMINAL_STATES = frozenset({"completed", "failed", "canceled", "rejected"})
+
+
+class A2ATaskError(RuntimeError):
+    """A managed task failed, was canceled, or was superseded."""
+
+
+def task_state(response: dict) -> str:
+    """Return ``result.status.state`` from a JSON-RPC task response."""
+    if "error" in response:
+        raise A2ATaskError(f"A2A error: {response['error']}")
+    result = response.get("result", response)
+    status = result.get("status") if isinstance(result, dict) else None
+    return str(status.get("state", "unknown")) if isinstance(status, dict) else "unknown"
+
+
+@dataclass
+class PollBackoff:
+    """Adaptive ``tasks/get`` polling interval.
+
+    Polling starts fast, backs off geometrically while the task state stays
+    the same, and snaps back to ``initial`` whenever the state changes.
+    """
+
+    initial: float = 0.25
+    maximum: float = 5.0
+    factor: float = 2.0
+
+    def next(self, delay: float, state_changed: bool) -> float:
+        if state_changed:
+            return self.initial
+        return min(delay * self.factor, self.maximum)
+
+
+@dataclass
+class ManagedTask:
+    """Book-keeping for one task owned by ``A2ATaskManager``."""
+
+    task: A2ATask
+    group: str | None
+    deadline: float
+    state: str = "pending"
+    response: dict | None = None
+    polls: int = 0
+    superseded: bool = False
+    driver: asyncio.Task | None = field(default=None, repr=False)
+    pushed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def task_id(self) -> str:
+        return self.task.task_id
+
+    @property
+    def done(self) -> bool:
+        return self.state in TERMINAL_STATES
+
+
+class A2ATaskManager:
+    """Run A2A tasks without blocking the caller.
+
+    ``submit`` returns immediately; a background driver sends the task, then
+    follows it to a terminal state by polling or by pushed updates delivered
+    through ``handle_push``.  Polls that fall due within ``batch_window`` of
+    each other are sent as one ``tasks/get`` batch.  Each task has a deadline
+    after which it is canceled on the server.  Tasks can be grouped (e.g. by
+    incident ID) so a superseded group is canceled in one call.
+    """
+
+    def __init__(
+        self,
+        client: A2AClient,
+        backoff: PollBackoff | None = None,
+        push_url: str | None = None,
+        batch_window: float = 0.005,
+    ) -> None:
+        self.client = client
+        self.backoff = backoff or PollBackoff()
+        self.push_url = push_url
+        self.batch_window = batch_window
+        self._tasks: dict[str, ManagedTask] = {}
+        self._due_polls: dict[str, list[asyncio.Future]] = {}
+        self._flusher: asyncio.Task | None = None
+
+    # ── Submission ──────────────────────────────────────────────
+
+    def submit(self, task: A2ATask, group: str | None = None, timeout: float = 60.0) -> ManagedTask:
+        """Start ``task`` in the background and return its handle."""
+        if task.task_id in self._tasks and not self._tasks[task.task_id].done:
+            raise A2ATaskError(f"Task {task.task_id} is already running")
+        if self.push_url:
+            task.metadata.setdefault("pushNotification", {"url": self.push_url})
+        loop = asyncio.get_running_loop()
+        managed = ManagedTask(task=task, group=group, deadline=loop.time() + timeout)
+        managed.driver = asyncio.create_task(self._drive(managed), name=f"a2a-{task.task_id}")
+        self._tasks[task.task_id] = managed
+        return managed
+
+    async def wait(self, task_id: str) -> dict:
+        """Wait for a submitted task and return its final JSON-RPC response.
+
+        A finished task is forgotten once waited for, so wait only once.
+
+        Raises:
+            TimeoutError: The deadline passed; the task was canceled.
+            A2ATaskError: The task failed, was rejected, or was superseded.
+        """
+        managed = self._tasks[task_id]
+        assert managed.driver is not None
+        try:
+            return await asyncio.shield(managed.driver)
+        except asyncio.CancelledError:
+            if managed.superseded and managed.driver.cancelled():
+                raise A2ATaskError(f"Task {task_id} was superseded") from None
+            raise
+        finally:
+            # Finished and collected: don't keep its message and response.
+            if managed.driver.done() and self._tasks.get(task_id) is managed:
+                del self._tasks[task_id]
+
+    async def run(self, task: A2ATask, group: str | None = None, timeout: float = 60.0) -> dict:
+        """Submit ``task`` and wait for it."""
+        return await self.wait(self.submit(task, group=group, timeout=timeout).task_id)
+
+    def get(self, task_id: str) -> ManagedTask | None:
+        return self._tasks.get(task_id)
+
+    def in_flight(self, group: str | None = None) -> list[ManagedTask]:
+        """Tasks not yet in a terminal state, optionally limited to ``group``."""
+        return [
+            t for t in self._tasks.values() if not t.done and (group is None or t.group == group)
+        ]
+
+    # ── Push updates ────────────────────────────────────────────
+
+    def handle_push(self, payload: dict) -> bool:
+        """Feed a pushed task update (from a webhook receiver) to its driver.
+
+        Returns False when the task is unknown or already finished.
+        """
+        result = payload.get("result", payload)
+        managed = self._tasks.get(str(result.get("id", "")))
+        if managed is None or managed.done:
+            return False
+        managed.response = payload if "result" in payload else {"result": payload}
+        managed.pushed.set()
+        return True
+
+    # ── Cancellation ────────────────────────────────────────────
+
+    async def cancel(self, task_id: str) -> None:
+        """Stop driving ``task_id`` and cancel it on the server."""
+        managed = self._tasks.get(task_id)
+        if managed is None or managed.done:
+            return
+        managed.superseded = True
+        if managed.driver is not None:
+            managed.driver.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await managed.driver
+        await self._cancel_remote(managed)
+
+    async def supersede(self, group: str) -> int:
+        """Cancel every in-flight task in ``group``. Returns how many were canceled."""
+        live = self.in_flight(group)
+        await asyncio.gather(*(self.cancel(t.task_id) for t in live))
+        return len(live)
+
+    async def close(self) -> None:
+        """Cancel everything still running."""
+        await asyncio.gather(*(self.cancel(t.task_id) for t in self.in_flight()))
+
+    # ── Internals ───────────────────────────────────────────────
+
+    async def _drive(self, managed: ManagedTask) -> dict:
+        try:
+            async with asyncio.timeout_at(managed.deadline):
+                return await self._follow(managed)
+        except TimeoutError:
+            await self._cancel_remote(managed)
+            raise TimeoutError(f"A2A task {managed.task_id} exceeded its deadline") from None
+
+    async def _follow(self, managed: ManagedTask) -> dict:
+        response = await self.client.send_task(managed.task)
+        managed.state = task_state(response)
+        managed.response = response
+        delay = self.backoff.maximum if self.push_url else self.backoff.initial
+
+        while not managed.done:
+            pushed = False
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(managed.pushed.wait(), delay)
+                pushed = True
+            if pushed:
+                managed.pushed.clear()
+                response = managed.response or {}
+            else:
+                response = await self._poll(managed.task_id)
+                managed.polls += 1
+            previous, managed.state = managed.state, task_state(response)
+            managed.response = response
+            if not self.push_url:
+                delay = self.backoff.next(delay, managed.state != previous)
+
+        if managed.state != "completed":
+            raise A2ATaskError(f"Task {managed.task_id} ended in state {managed.state!r}")
+        return managed.response or {}
+
+    async def _poll(self, task_id: str) -> dict:
+        """Queue a ``tasks/get`` for the next batched flush."""
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._due_polls.setdefault(task_id, []).append(future)
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_polls())
+        return await future
+
+    async def _flush_polls(self) -> None:
+        await asyncio.sleep(self.batch_window)
+        due, self._due_polls, self._flusher = self._due_polls, {}, None
+        # Drop polls whose waiters gave up (deadline, cancel): polling a task
+        # after its tasks/cancel would only race the cancellation.
+        for task_id in list(due):
+            managed = self._tasks.get(task_id)
+            if all(f.done() for f in due[task_id]) or managed is None or managed.done:
+                for future in due.pop(task_id):
+                    future.cancel()
+        task_ids = list(due)
+        if not task_ids:
+            return
+        try:
+            responses = await self.client.get_tasks(task_ids)
+        except Exception as exc:  # noqa: BLE001 — delivered to every waiter
+            for future in (f for futures in due.values() for f in futures):
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for task_id, response in zip(task_ids, responses):
+            for future in due[task_id]:
+                if not future.done():
+                    future.set_result(response)
+
+    async def _cancel_remote(self, managed: ManagedTask) -> None:
+        if managed.done:
+            return
+        managed.state = "canceled"
+        with contextlib.suppress(httpx.HTTPError):
+            await self.client.cancel_task(managed.task_id)
@@ -0,0 +1,174 @@
+"""Tool catalog cache for the MCP server and Kibana tool APIs.
+
+Listing tools is a full round-trip that returns the same catalog almost
+every time.  ``ToolCatalogCache`` keeps each catalog in memory and on disk,
+so a fresh process starts warm, and turns tool discovery into a dict lookup.
+
+Freshness:
+- Entries older than ``max_age`` are revalidated.  Kibana answers an
+  ``If-None-Match`` with 304 when the ETag still matches; for MCP, which has
+  no ETag, the catalog's content hash serves as its version.
+- ``notifications/tools/list_changed`` from an MCP server invalidates the
+  entry immediately, so servers that advertise ``tools.listChanged`` never
+  serve a stale catalog.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+TOOLS_LIST_CHANGED = "notifications/tools/list_changed"
+
+# fetch(previous_version) -> (tools, version); tools is None when not modified.
+CatalogFetcher = Callable[[str | None], Awaitable[tuple[list[dict] | None, str | None]]]
+
+
+def catalog_version(tools: list[dict]) -> str:
+    """Content hash used as the version of catalogs that carry no ETag."""
+    canonical = json.dumps(tools, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+def _default_cache_dir() -> Path:
+    base = os.getenv("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "agent_builder" / "catalogs"
+
+
+@dataclass
+class CatalogEntry:
+    """One cached tool catalog."""
+
+    tools: list[dict]
+    version: str
+    fetched_at: float
+    by_name: dict[str, dict] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        if not self.by_name:
+            self.by_name = {
+                str(t.get("name") or t.get("id") or t.get("toolId")): t for t in self.tools
+            }
+
+    def age(self, now: float | None = None) -> float:
+        return (now if now is not None else time.time()) - self.fetched_at
+
+
+class ToolCatalogCache:
+    """In-memory + on-disk cache of tool catalogs, keyed by endpoint."""
+
+    def __init__(self, cache_dir: Path | None = None, max_age: float = 300.0) -> None:
+        self.cache_dir = cache_dir or _default_cache_dir()
+        self.max_age = max_age
+        self._entries: dict[str, CatalogEntry] = {}
+
+    # ── Lookup ──────────────────────────────────────────────────
+
+    def get(self, key: str) -> CatalogEntry | None:
+        """Return the entry for ``key`` from memory, else from disk."""
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._read(key)
+            if entry is not None:
+                self._entries[key] = entry
+        return entry
+
+    def is_fresh(self, entry: CatalogEntry) -> bool:
+        return entry.age() < self.max_age
+
+    def lookup(self, key: str, name: str) -> dict | None:
+        """Find one tool by name in the cached catalog (no network)."""
+        entry = self.get(key)
+        return entry.by_name.get(name) if entry else None
+
+    # ── Updates ─────────────────────────────────────────────────
+
+    def put(self, key: str, tools: list[dict], version: str | None = None) -> CatalogEntry:
+        entry = CatalogEntry(
+            tools=tools, version=version or catalog_version(tools), fetched_at=time.time()
+        )
+        self._entries[key] = entry
+        self._write(key, entry)
+        return entry
+
+    def touch(self, key: str) -> None:
+        """Mark the entry as revalidated without replacing it."""
+        entry = self.get(key)
+        if entry is not None:
+            entry.fetched_at = time.time()
+            self._write(key, entry)
+
+    def invalidate(self, key: str | None = None) -> None:
+        """Drop one catalog (or all of them) from memory and disk."""
+        keys = [key] if key is not None else list(self._entries)
+        for k in keys:
+            self._entries.pop(k, None)
+            self._path(k).unlink(missing_ok=True)
+
+    def handle_notification(self, key: str, message: dict[str, Any]) -> bool:
+        """Invalidate ``key`` on ``notifications/tools/list_changed``."""
+        if message.get("method") != TOOLS_LIST_CHANGED:
+            return False
+        self.invalidate(key)
+        return True
+
+    async def get_or_fetch(
+        self, key: str, fetch: CatalogFetcher, refresh: bool = False
+    ) -> CatalogEntry:
+        """Return a fresh catalog, revalidating with ``fetch`` when needed."""
+        entry = self.get(key)
+        if entry is not None and not refresh and self.is_fresh(entry):
+            return entry
+        tools, version = await fetch(entry.version if entry else None)
+        if tools is None and entry is not None:
+            self.touch(key)
+            return entry
+        tools = tools or []
+        version = version or catalog_version(tools)
+        if entry is not None and version == entry.version:
+            self.touch(key)
+            return entry
+        return self.put(key, tools, version)
+
+    # ── Disk ────────────────────────────────────────────────────
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode()).hexdigest()[:24]
+        return self.cache_dir / f"{digest}.json"
+
+    def _read(self, key: str) -> CatalogEntry | None:
+        try:
+            data = json.loads(self._path(key).read_text())
+        except (OSError, ValueError):
+            return None
+        if data.get("key") != key:
+            return None
+        return CatalogEntry(
+            tools=data["tools"], version=data["version"], fetched_at=data["fetched_at"]
+        )
+
+    def _write(self, key: str, entry: CatalogEntry) -> None:
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(
+                json.dumps(
+                    {
+                        "key": key,
+                        "version": entry.version,
+                        "fetched_at": entry.fetched_at,
+                        "tools": entry.tools,
+                    }
+                )
+            )
+            tmp.replace(path)
+        except OSError:
+            # The on-disk copy is an optimisation; memory still has the entry.
+            pass
@@ -2,22 +2,36 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 import httpx
-from elasticsearch import Elasticsearch
 
+from agent_builder.catalog import ToolCatalogCache
 from agent_builder.config import settings
 
+if TYPE_CHECKING:
+    from elasticsearch import Elasticsearch
+
+
+def get_es_client(http_compress: bool = False) -> Elasticsearch:
+    """Create an Elasticsearch client from environment settings.
 
-def get_es_client() -> Elasticsearch:
-    """Create an Elasticsearch client from environment settings."""
+    ``http_compress`` gzips request bodies (``_bulk`` NDJSON compresses
+    5-10x) and asks for gzip-encoded responses.
+    """
     if not settings.is_configured:
         raise RuntimeError(
             "Elastic Cloud credentials not configured. "
             "Set ELASTIC_CLOUD_ID and ELASTIC_API_KEY in .env"
         )
+    # Imported here: the elasticsearch client adds ~250 ms to startup and
+    # the Kibana-only commands never need it.
+    from elasticsearch import Elasticsearch
+
     return Elasticsearch(
         cloud_id=settings.elastic_cloud_id,
         api_key=settings.elastic_api_key,
+        http_compress=http_compress,
     )
 
 
@@ -31,9 +45,15 @@ class AgentBuilderClient:
     - Accessing A2A and MCP server endpoints
     """
 
-    def __init__(self, kibana_url: str | None = None, api_key: str | None = None) -> None:
+    def __init__(
+        self,
+        kibana_url: str | None = None,
+        api_key: str | None = None,
+        catalog: ToolCatalogCache | None = None,
+    ) -> None:
         self.kibana_url = (kibana_url or settings.kibana_url).rstrip("/")
         self.api_key = api_key or settings.elastic_api_key
+        self.catalog = catalog
         self._http = httpx.AsyncClient(
             base_url=self.kibana_url,
             headers={
@@ -107,11 +127,29 @@ class AgentBuilderClient:
 
     # ── Tool CRUD ───────────────────────────────────────────────
 
-    async def list_tools(self) -> dict:
-        """List all custom tools."""
-        resp = await self._http.get("/api/agent_builder/tools")
-        resp.raise_for_status()
-        return resp.json()
+    async def list_tools(self, refresh: bool = False) -> dict:
+        """List all custom tools.
+
+        With a catalog cache attached, a stale entry is revalidated with
+        ``If-None-Match`` and reused when Kibana answers 304.
+        """
+        if self.catalog is None:
+            resp = await self._http.get("/api/agent_builder/tools")
+            resp.raise_for_status()
+            return resp.json()
+
+        async def fetch(etag: str | None) -> tuple[list[dict] | None, str | None]:
+            headers = {"If-None-Match": etag} if etag else {}
+            resp = await self._http.get("/api/agent_builder/tools", headers=headers)
+            if resp.status_code == 304:
+                return None, etag
+            resp.raise_for_status()
+            body = resp.json()
+            tools = body.get("results", body.get("tools", [])) if isinstance(body, dict) else body
+            return tools, resp.headers.get("ETag")
+
+        entry = await self.catalog.get_or_fetch(f"kibana:{self.kibana_url}", fetch, refresh=refresh)
+        return {"results": entry.tools}
 
     async def create_esql_tool(
         self,
@@ -218,17 +256,28 @@ class AgentBuilderClient:
 
     # ── MCP ─────────────────────────────────────────────────────
 
-    async def mcp_list_tools(self) -> dict:
+    async def mcp_list_tools(self, refresh: bool = False) -> dict:
         """List tools exposed by the Agent Builder MCP server."""
         mcp_url = settings.agent_builder_mcp_url or f"{self.kibana_url}/api/agent_builder/mcp"
-        payload = {
-            "jsonrpc": "2.0",
-            "method": "tools/list",
-            "id": 1,
-        }
-        resp = await self._http.post(mcp_url, json=payload)
-        resp.raise_for_status()
-        return resp.json()
+
+        async def fetch_response() -> dict:
+            payload = {
+                "jsonrpc": "2.0",
+                "method": "tools/list",
+                "id": 1,
+            }
+            resp = await self._http.post(mcp_url, json=payload)
+            resp.raise_for_status()
+            return resp.json()
+
+        if self.catalog is None:
+            return await fetch_response()
+
+        async def fetch(_version: str | None) -> tuple[list[dict], None]:
+            return (await fetch_response()).get("result", {}).get("tools", []), None
+
+        entry = await self.catalog.get_or_fetch(f"mcp:{mcp_url}", fetch, refresh=refresh)
+        return {"jsonrpc": "2.0", "result": {"tools": entry.tools}}
 
     async def mcp_call_tool(self, tool_name: str, arguments: dict) -> dict:
         """Call a tool via the Agent Builder MCP server."""
@@ -7,17 +7,22 @@ from elasticsearch import Elasticsearch
 from agent_builder.config import settings
 
 
-def get_es_client() -> Elasticsearch:
-    """Create and return an Elasticsearch client from settings."""
+def get_es_client(http_compress: bool = False) -> Elasticsearch:
+    """Create and return an Elasticsearch client from settings.
+
+    ``http_compress`` gzips request bodies and accepts gzip responses.
+    """
     if settings.elastic_cloud_id:
         return Elasticsearch(
             cloud_id=settings.elastic_cloud_id,
             api_key=settings.elastic_api_key,
+            http_compress=http_compress,
         )
     if settings.elastic_url:
         return Elasticsearch(
             hosts=[settings.elastic_url],
             api_key=settings.elastic_api_key,
+            http_compress=http_compress,
         )
     raise ValueError(
         "Set ELASTIC_CLOUD_ID or ELASTIC_URL in your environment / .env file."
@@ -0,0 +1,544 @@
+"""Local execution engine for ``WorkflowDefinition``.
+
+Runs a workflow's steps as a DAG instead of a flat list:
+
+- Data dependencies are inferred from ``{{step.field}}`` references in a
+  step's configuration.  Steps with no path between them run concurrently.
+- ``IF`` gates the steps that follow it (or the ones named in its ``steps``
+  list); when the condition is false they are skipped.
+- ``WAIT`` is a barrier: it waits for everything before it, sleeps for its
+  ``duration``, and everything after it waits for it.
+- ``FOREACH`` renders its nested ``step`` once per element of ``items`` and
+  runs up to ``concurrency`` of them at a time (default 1).  Handlers with a
+  ``bulk`` method may fold the items into fewer requests; the Elasticsearch
+  handler sends ``index`` actions as one ``_bulk`` request per
+  ``bulk_size`` documents, each under the executor's ``max_concurrency``
+  limit.  Failed items are reported by index.
+
+Templates and conditions are compiled once per workflow (``compile_workflow``),
+so a reference to an unknown name fails before any step runs and FOREACH
+bodies are not re-parsed per item.
+
+Action steps (ELASTICSEARCH / KIBANA / EXTERNAL) are executed by handlers
+supplied per ``StepType``.  Every step records its start/finish time, and
+the run reports its critical path.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import re
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any, Protocol
+
+from .templates import (  # noqa: F401 — render/resolve_path are re-exported
+    Template,
+    TemplateError,
+    compile_template,
+    render,
+    resolve_path,
+    template_refs,
+)
+from .workflows import StepType, WorkflowDefinition, WorkflowStep
+
+# handler(step, rendered_configuration) -> step output
+StepHandler = Callable[[WorkflowStep, dict[str, Any]], Awaitable[Any]]
+
+_CONDITION_RE = re.compile(r"^\s*(.+?)\s*(==|!=|>=|<=|>|<)\s*(.+?)\s*$")
+_DURATION_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(ms|s|m|h)?\s*$")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0, None: 1.0}
+
+
+# ── Results ──────────────────────────────────────────────────────
+
+
+class ItemError(RuntimeError):
+    """One FOREACH item failed (e.g. a rejected ``_bulk`` item)."""
+
+    def __init__(self, message: str, detail: Any = None) -> None:
+        super().__init__(message)
+        self.detail = detail
+
+
+class ForeachError(RuntimeError):
+    """Some FOREACH items failed; ``outputs`` holds every item's outcome."""
+
+    def __init__(self, step: str, failures: dict[int, str], outputs: list[Any]) -> None:
+        first = min(failures)
+        super().__init__(
+            f"{len(failures)} of {len(outputs)} items of {step!r} failed; "
+            f"first: [{first}] {failures[first]}"
+        )
+        self.failures = failures
+        self.outputs = outputs
+
+
+@dataclass
+class StepResult:
+    """Outcome and timing of one step."""
+
+    name: str
+    status: str  # "completed" | "skipped" | "failed"
+    output: Any = None
+    error: str | None = None
+    started_at: float = 0.0
+    finished_at: float = 0.0
+
+    @property
+    def duration(self) -> float:
+        return self.finished_at - self.started_at
+
+
+@dataclass
+class WorkflowRun:
+    """Outcome of a whole workflow run."""
+
+    workflow: str
+    dependencies: dict[str, set[str]]
+    results: dict[str, StepResult] = field(default_factory=dict)
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(r.status != "failed" for r in self.results.values())
+
+    def critical_path(self) -> list[str]:
+        """Chain of steps that determined the run's wall-clock time."""
+        if not self.results:
+            return []
+        name = max(self.results, key=lambda n: self.results[n].finished_at)
+        path = [name]
+        while self.dependencies.get(name):
+            name = max(self.dependencies[name], key=lambda n: self.results[n].finished_at)
+            path.append(name)
+        return path[::-1]
+
+    def timings(self) -> dict[str, float]:
+        return {name: r.duration for name, r in self.results.items()}
+
+
+# ── Dependency inference ─────────────────────────────────────────
+
+
+def step_dependencies(workflow: WorkflowDefinition) -> dict[str, set[str]]:
+    """Map each step to the steps it must wait for.
+
+    Raises:
+        ValueError: duplicate step names, or a reference to a step that is
+            not defined earlier in the workflow.
+    """
+    names = [s.name for s in workflow.steps]
+    if len(names) != len(set(names)):
+        raise ValueError(f"Workflow {workflow.name!r} has duplicate step names")
+    all_names = set(names)
+
+    deps: dict[str, set[str]] = {}
+    gates: list[tuple[str, set[str] | None]] = []
+    barrier: str | None = None
+    for index, step in enumerate(workflow.steps):
+        earlier = set(names[:index])
+        refs = template_refs(step.configuration) & all_names
+        if refs - earlier:
+            missing = ", ".join(sorted(refs - earlier))
+            raise ValueError(f"Step {step.name!r} references later step(s): {missing}")
+        needs = set(refs)
+        for gate, scope in gates:
+            if scope is None or step.name in scope:
+                needs.add(gate)
+        if barrier is not None:
+            needs.add(barrier)
+        if step.type == StepType.WAIT:
+            needs |= earlier
+            barrier = step.name
+        if step.type == StepType.IF:
+            scope = step.configuration.get("steps")
+            gates.append((step.name, set(scope) if scope is not None else None))
+        deps[step.name] = needs
+    return deps
+
+
+# ── Rendering & conditions ───────────────────────────────────────
+
+
+def _literal(value: Any) -> Any:
+    if isinstance(value, str):
+        text = value.strip().strip("\"'")
+        for cast in (int, float):
+            try:
+                return cast(text)
+            except ValueError:
+                pass
+        return {"true": True, "false": False}.get(text.lower(), text)
+    return value
+
+
+_COMPARE: dict[str, Callable[[Any, Any], bool]] = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    ">=": lambda a, b: a >= b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    "<": lambda a, b: a < b,
+}
+
+
+@dataclass(frozen=True)
+class Condition:
+    """A compiled ``lhs <op> rhs`` (or bare value) condition."""
+
+    left: Template
+    op: str | None = None
+    right: Template | None = None
+
+    def __call__(self, scope: dict[str, Any]) -> bool:
+        if self.op is None or self.right is None:
+            value = _literal(self.left.render(scope))
+            return any(value) if isinstance(value, list) else bool(value)
+        left = self.left.render(scope)
+        right = _literal(self.right.render(scope))
+        compare = _COMPARE[self.op]
+        lefts = left if isinstance(left, list) else [left]
+        return any(compare(_literal(v), right) for v in lefts)
+
+
+def compile_condition(condition: str, known: set[str] | None = None) -> Condition:
+    """Split and compile a condition once; see ``evaluate_condition``."""
+    match = _CONDITION_RE.match(condition)
+    if not match:
+        return Condition(compile_template(condition, known))
+    lhs, op, rhs = match.groups()
+    return Condition(compile_template(lhs, known), op, compile_template(rhs, known))
+
+
+def evaluate_condition(condition: str, scope: dict[str, Any]) -> bool:
+    """Evaluate ``lhs <op> rhs`` (or a bare value) after rendering.
+
+    A list operand is true if any element satisfies the comparison, so
+    ``{{query_errors.error_count}} > 100`` reads as "any service over 100".
+    """
+    return compile_condition(condition)(scope)
+
+
+def parse_duration(value: Any) -> float:
+    """Seconds from ``5``, ``"250ms"``, ``"5s"``, ``"2m"`` or ``"1h"``."""
+    if isinstance(value, int | float):
+        return float(value)
+    match = _DURATION_RE.match(str(value))
+    if not match:
+        raise ValueError(f"Invalid duration: {value!r}")
+    return float(match.group(1)) * _DURATION_UNITS[match.group(2)]
+
+
+# ── Compilation ──────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class StepPlan:
+    """Pre-compiled templates of one step."""
+
+    config: Template | None = None
+    condition: Condition | None = None
+    items: Template | None = None
+    body: Template | None = None
+    inner: WorkflowStep | None = None
+
+
+@dataclass(frozen=True)
+class CompiledWorkflow:
+    """A workflow with its dependency graph and templates compiled once."""
+
+    workflow: WorkflowDefinition
+    dependencies: dict[str, set[str]]
+    plans: dict[str, StepPlan]
+
+
+def compile_workflow(
+    workflow: WorkflowDefinition, variables: set[str] | None = None
+) -> CompiledWorkflow:
+    """Infer dependencies and compile every step's templates.
+
+    Each step may reference ``now``, the run ``variables`` and the steps
+    before it; FOREACH bodies may also reference ``item``.
+
+    Raises:
+        ValueError: a dependency error (see ``step_dependencies``), or a
+            ``TemplateError`` for a reference to an unknown name.
+    """
+    deps = step_dependencies(workflow)
+    known = {"now", *(variables or ())}
+    plans: dict[str, StepPlan] = {}
+    for step in workflow.steps:
+        config = step.configuration
+        try:
+            if step.type == StepType.IF:
+                plans[step.name] = StepPlan(condition=compile_condition(config["condition"], known))
+            elif step.type == StepType.WAIT:
+                plans[step.name] = StepPlan()
+            elif step.type == StepType.FOREACH:
+                plans[step.name] = StepPlan(
+                    items=compile_template(config["items"], known),
+                    body=compile_template(config["step"], known | {"item"}),
+                    inner=WorkflowStep(
+                        name=f"{step.name}[]",
+                        type=StepType(config.get("type", StepType.ELASTICSEARCH.value)),
+                        configuration=config["step"],
+                    ),
+                )
+            else:
+                plans[step.name] = StepPlan(config=compile_template(config, known))
+        except TemplateError as exc:
+            raise TemplateError(f"Step {step.name!r}: {exc}") from None
+        known.add(step.name)
+    return CompiledWorkflow(workflow=workflow, dependencies=deps, plans=plans)
+
+
+# ── Executor ─────────────────────────────────────────────────────
+
+
+class WorkflowExecutor:
+    """Run workflows locally with maximal step concurrency.
+
+    Args:
+        handlers: Coroutine per action ``StepType`` that performs the step.
+        variables: Extra template variables (e.g. ``KIBANA_URL``).
+        max_concurrency: Optional cap on concurrently running action steps.
+    """
+
+    def __init__(
+        self,
+        handlers: dict[StepType, StepHandler],
+        variables: dict[str, Any] | None = None,
+        max_concurrency: int | None = None,
+    ) -> None:
+        self.handlers = handlers
+        self.variables = variables or {}
+        self._limit = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    def compile(self, workflow: WorkflowDefinition) -> CompiledWorkflow:
+        """Compile ``workflow`` against this executor's variables (reusable)."""
+        return compile_workflow(workflow, set(self.variables))
+
+    async def run(self, workflow: WorkflowDefinition | CompiledWorkflow) -> WorkflowRun:
+        compiled = workflow if isinstance(workflow, CompiledWorkflow) else self.compile(workflow)
+        workflow = compiled.workflow
+        deps = compiled.dependencies
+        run = WorkflowRun(workflow=workflow.name, dependencies=deps)
+        scope: dict[str, Any] = {
+            "now": datetime.now(UTC).isoformat(),
+            **self.variables,
+        }
+        conditions = {s.name for s in workflow.steps if s.type == StepType.IF}
+        origin = time.perf_counter()
+        tasks: dict[str, asyncio.Task] = {}
+
+        def passed(name: str) -> bool:
+            result = run.results[name]
+            if name in conditions:
+                return result.status == "completed" and result.output["condition"]
+            return result.status == "completed"
+
+        async def run_step(step: WorkflowStep) -> None:
+            await asyncio.gather(*(tasks[d] for d in deps[step.name]))
+            blocked = [d for d in deps[step.name] if not passed(d)]
+            now = time.perf_counter() - origin
+            if blocked:
+                run.results[step.name] = StepResult(
+                    step.name,
+                    "skipped",
+                    error=f"blocked by {', '.join(sorted(blocked))}",
+                    started_at=now,
+                    finished_at=now,
+                )
+                return
+            result = StepResult(step.name, "completed", started_at=now)
+            try:
+                result.output = await self._execute(step, compiled.plans[step.name], scope)
+                scope[step.name] = result.output
+            except Exception as exc:  # noqa: BLE001 — recorded on the step
+                result.status, result.error = "failed", f"{type(exc).__name__}: {exc}"
+                result.output = getattr(exc, "outputs", None)
+            result.finished_at = time.perf_counter() - origin
+            run.results[step.name] = result
+
+        for step in workflow.steps:
+            tasks[step.name] = asyncio.create_task(run_step(step))
+        await asyncio.gather(*tasks.values())
+        run.results = {s.name: run.results[s.name] for s in workflow.steps}
+        run.duration = time.perf_counter() - origin
+        return run
+
+    async def _execute(self, step: WorkflowStep, plan: StepPlan, scope: dict[str, Any]) -> Any:
+        if plan.condition is not None:
+            return {"condition": plan.condition(scope)}
+        if step.type == StepType.WAIT:
+            await asyncio.sleep(parse_duration(step.configuration.get("duration", 0)))
+            return {"waited": True}
+        if step.type == StepType.FOREACH:
+            return await self._foreach(step, plan, scope)
+        return await self._action(step, plan.config.render(scope))
+
+    def _handler(self, step: WorkflowStep) -> StepHandler:
+        handler = self.handlers.get(step.type)
+        if handler is None:
+            raise LookupError(f"No handler registered for {step.type.value} steps")
+        return handler
+
+    async def _action(self, step: WorkflowStep, config: dict[str, Any]) -> Any:
+        handler = self._handler(step)
+        if self._limit is None:
+            return await handler(step, config)
+        async with self._limit:
+            return await handler(step, config)
+
+    async def _foreach(
+        self, step: WorkflowStep, plan: StepPlan, scope: dict[str, Any]
+    ) -> list[Any]:
+        items = plan.items.render(scope)
+        if not isinstance(items, list):
+            raise TypeError(f"FOREACH items for {step.name!r} rendered to {type(items).__name__}")
+        item_scope = dict(scope)
+        configs = []
+        for item in items:
+            item_scope["item"] = item
+            configs.append(plan.body.render(item_scope))
+
+        outcomes: list[Any] = [None] * len(configs)
+        pending = list(range(len(configs)))
+        bulk = getattr(self._handler(plan.inner), "bulk", None)
+        if bulk is not None and step.configuration.get("bulk", True) and configs:
+            folded = await bulk(plan.inner, configs, limit=self._limit)
+            pending = [i for i, outcome in enumerate(folded) if outcome is None]
+            for i, outcome in enumerate(folded):
+                if outcome is not None:
+                    outcomes[i] = outcome
+
+        limit = asyncio.Semaphore(max(1, int(step.configuration.get("concurrency", 1))))
+
+        async def one(i: int) -> None:
+            async with limit:
+                try:
+                    outcomes[i] = await self._action(plan.inner, configs[i])
+                except Exception as exc:  # noqa: BLE001 — mapped to the item below
+                    outcomes[i] = exc
+
+        await asyncio.gather(*(one(i) for i in pending))
+        failures = {
+            i: f"{type(o).__name__}: {o}"
+            for i, o in enumerate(outcomes)
+            if isinstance(o, Exception)
+        }
+        if failures:
+            raise ForeachError(step.name, failures, outcomes)
+        return outcomes
+
+
+# ── Elasticsearch step handler ───────────────────────────────────
+
+
+class ElasticsearchAPI(Protocol):
+    """The subset of ``backend.elastic_client.ElasticClient`` used by steps."""
+
+    async def es_request(
+        self, method: str, path: str, json: Any = None, params: dict | None = None
+    ) -> dict: ...
+
+    async def run_esql(self, query: str, params: list[dict] | None = None) -> dict: ...
+
+    async def bulk_index(
+        self, index: str, documents: list[dict], op_type: str = "index"
+    ) -> dict: ...
+
+
+def esql_rows(response: dict) -> dict[str, Any]:
+    """Reshape an ES|QL ``{columns, values}`` response for templates.
+
+    Returns ``results`` (one dict per row) plus one list per column, so both
+    ``{{step.results}}`` and ``{{step.error_count}}`` resolve.
+    """
+    columns = [c["name"] for c in response.get("columns", [])]
+    rows = [dict(zip(columns, values)) for values in response.get("values", [])]
+    out: dict[str, Any] = {"results": rows}
+    for i, name in enumerate(columns):
+        out[name] = [values[i] for values in response.get("values", [])]
+    return out
+
+
+class ElasticsearchStepHandler:
+    """Executes ``esql`` and ``index`` actions of ELASTICSEARCH steps.
+
+    Args:
+        client: Elasticsearch client (see ``ElasticsearchAPI``).
+        bulk_size: Maximum documents per folded ``_bulk`` request.
+    """
+
+    def __init__(self, client: ElasticsearchAPI, bulk_size: int = 500) -> None:
+        self.client = client
+        self.bulk_size = bulk_size
+
+    async def __call__(self, step: WorkflowStep, config: dict[str, Any]) -> Any:
+        action = config.get("action")
+        if action == "esql":
+            return esql_rows(await self.client.run_esql(config["query"], config.get("params")))
+        if action == "index":
+            return await self.client.es_request(
+                "POST", f"/{config['index']}/_doc", json=config["document"]
+            )
+        raise ValueError(f"Unsupported elasticsearch action {action!r} in step {step.name!r}")
+
+    async def bulk(
+        self,
+        step: WorkflowStep,
+        configs: list[dict[str, Any]],
+        limit: asyncio.Semaphore | None = None,
+    ) -> list[Any]:
+        """Fold the ``index`` actions of a FOREACH into ``_bulk`` requests.
+
+        Returns one outcome per config: the bulk item result, an ``ItemError``
+        for a rejected item, or ``None`` for configs left to ``__call__``.
+        Each request holds ``limit`` (the executor's concurrency cap) while
+        it is in flight.
+        """
+        outcomes: list[Any] = [None] * len(configs)
+        # Data streams take ``op_type: create``; requests never mix op types.
+        by_target: dict[tuple[str, str], list[int]] = {}
+        for i, config in enumerate(configs):
+            if config.get("action") == "index":
+                target = (config["index"], config.get("op_type", "index"))
+                by_target.setdefault(target, []).append(i)
+
+        async def send(target: tuple[str, str], positions: list[int]) -> None:
+            index, op_type = target
+            try:
+                async with limit or contextlib.nullcontext():
+                    response = await self.client.bulk_index(
+                        index, [configs[i]["document"] for i in positions], op_type=op_type
+                    )
+            except Exception as exc:  # noqa: BLE001 — every item of the request failed
+                for i in positions:
+                    outcomes[i] = exc
+                return
+            items = response.get("items", [])
+            for n, i in enumerate(positions):
+                if n >= len(items):
+                    outcomes[i] = ItemError(f"no bulk result for item {n}")
+                    continue
+                result = next(iter(items[n].values()))
+                error = result.get("error")
+                if error:
+                    reason = error.get("reason", error) if isinstance(error, dict) else error
+                    outcomes[i] = ItemError(f"{result.get('status')}: {reason}", result)
+                else:
+                    outcomes[i] = result
+
+        await asyncio.gather(
+            *(
+                send(target, positions[start : start + self.bulk_size])
+                for target, positions in by_target.items()
+                for start in range(0, len(positions), self.bulk_size)
+            )
+        )
+        return outcomes
@@ -0,0 +1,47 @@
+"""JSON-RPC 2.0 batch helpers shared by the MCP and A2A clients.
+
+A batch packs many calls into one HTTP POST as a JSON array; the server
+answers with an array of responses in any order, matched back by ``id``.
+Servers that don't implement batching usually answer the array with an HTTP
+4xx or a single ``Invalid Request`` error object, which callers treat as a
+signal to fall back to one POST per call.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import httpx
+
+INVALID_REQUEST = -32600
+
+# Status codes a server uses when it refuses a batch body outright.
+_BATCH_REJECTED_STATUS = {400, 405, 413, 415, 422, 501}
+
+
+def rpc_request(method: str, request_id: int, params: dict[str, Any] | None = None) -> dict:
+    """Build a JSON-RPC 2.0 request object."""
+    payload: dict[str, Any] = {"jsonrpc": "2.0", "method": method, "id": request_id}
+    if params is not None:
+        payload["params"] = params
+    return payload
+
+
+async def post_batch(
+    http: httpx.AsyncClient, url: str, requests: list[dict]
+) -> list[dict | None] | None:
+    """POST ``requests`` as one batch.
+
+    Returns the responses in request order (``None`` where the server left a
+    request unanswered), or ``None`` if the server rejected batching.
+    """
+    resp = await http.post(url, json=requests)
+    if resp.status_code in _BATCH_REJECTED_STATUS:
+        return None
+    resp.raise_for_status()
+    body = resp.json()
+    if not isinstance(body, list):
+        # A lone error object (typically -32600) answers the array as a whole.
+        return None
+    by_id = {r.get("id"): r for r in body if isinstance(r, dict)}
+    return [by_id.get(r["id"]) for r in requests]
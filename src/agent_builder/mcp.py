@@ -9,15 +9,33 @@ Key MCP operations:
 - tools/list: Discover available tools
 - tools/call: Execute a tool
 - resources/list: List available data resources
+
+``call_tools`` sends many tool calls as one JSON-RPC batch POST.  When a
+``ToolCatalogCache`` is attached, ``tools/list`` is served from the cache
+and only revalidated once the cached catalog ages out or the server sends
+``notifications/tools/list_changed``.
+
+``MCPSession`` speaks the streamable HTTP transport instead of stateless
+POSTs: it initializes once, reuses the ``Mcp-Session-Id``, routes responses
+from any open stream back to their callers by ``id`` (so concurrent calls
+share one session and its pooled connections), and can yield progress
+notifications while a tool call is still running.
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import json
+from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
 from typing import Any
 
 import httpx
 
+from .catalog import ToolCatalogCache
+from .jsonrpc import post_batch, rpc_request
+
 
 @dataclass
 class MCPToolDefinition:
@@ -38,31 +56,66 @@ class MCPToolDefinition:
 class MCPClient:
     """Client for interacting with Elastic Agent Builder's MCP server."""
 
-    def __init__(self, mcp_url: str, api_key: str) -> None:
+    def __init__(self, mcp_url: str, api_key: str, catalog: ToolCatalogCache | None = None) -> None:
         self.mcp_url = mcp_url.rstrip("/")
-        self._http = httpx.AsyncClient(
-            headers={
+        self.catalog = catalog
+        self._http = self._make_http(
+            {
                 "Authorization": f"ApiKey {api_key}",
                 "Content-Type": "application/json",
-            },
-            timeout=60.0,
+            }
         )
         self._request_id = 0
+        self._batch_supported: bool | None = None
+
+    def _make_http(self, headers: dict[str, str]) -> httpx.AsyncClient:
+        return httpx.AsyncClient(headers=headers, timeout=60.0)
 
     def _next_id(self) -> int:
         self._request_id += 1
         return self._request_id
 
-    async def list_tools(self) -> dict:
-        """List tools exposed by the MCP server."""
+    @property
+    def catalog_key(self) -> str:
+        return f"mcp:{self.mcp_url}"
+
+    async def list_tools(self, refresh: bool = False) -> dict:
+        """List tools exposed by the MCP server.
+
+        With a catalog cache attached, the response is rebuilt from the cache
+        unless it is stale or ``refresh`` is set.
+        """
+        if self.catalog is None:
+            return await self._fetch_tools_list()
+
+        async def fetch(_version: str | None) -> tuple[list[dict], None]:
+            response = await self._fetch_tools_list()
+            return response.get("result", {}).get("tools", []), None
+
+        entry = await self.catalog.get_or_fetch(self.catalog_key, fetch, refresh=refresh)
+        return {"jsonrpc": "2.0", "result": {"tools": entry.tools}}
+
+    async def get_tool(self, name: str) -> dict | None:
+        """Return one tool definition by name (a dict lookup when cached)."""
+        response = await self.list_tools()
+        if self.catalog is not None:
+            return self.catalog.lookup(self.catalog_key, name)
+        tools = response.get("result", {}).get("tools", [])
+        return next((t for t in tools if t.get("name") == name), None)
+
+    def handle_notification(self, message: dict[str, Any]) -> bool:
+        """Apply a server notification; returns True if the catalog was invalidated."""
+        if self.catalog is None:
+            return False
+        return self.catalog.handle_notification(self.catalog_key, message)
+
+    async def _fetch_tools_list(self) -> dict:
         payload = {
             "jsonrpc": "2.0",
             "method": "tools/list",
             "id": self._next_id(),
         }
-        resp = await self._http.post(self.mcp_url, json=payload)
-        resp.raise_for_status()
-        return resp.json()
+        return await self._post(payload)
 
     async def call_tool(self, name: str, arguments: dict[str, Any] | None = None) -> dict:
         """Call a tool on the MCP server."""
@@ -75,9 +128,7 @@ class MCPClient:
             },
             "id": self._next_id(),
         }
-        resp = await self._http.post(self.mcp_url, json=payload)
-        resp.raise_for_status()
-        return resp.json()
+        return await self._post(payload)
 
     async def list_resources(self) -> dict:
         """List resources exposed by the MCP server."""
@@ -86,9 +137,312 @@ class MCPClient:
             "method": "resources/list",
             "id": self._next_id(),
         }
+        return await self._post(payload)
+
+    async def call_tools(self, calls: list[tuple[str, dict[str, Any] | None]]) -> list[dict]:
+        """Call several tools in one round-trip.
+
+        Args:
+            calls: ``(tool_name, arguments)`` pairs.
+
+        Returns:
+            One JSON-RPC response per call, in the same order.
+        """
+        requests = [
+            rpc_request(
+                "tools/call",
+                self._next_id(),
+                {"name": name, "arguments": arguments or {}},
+            )
+            for name, arguments in calls
+        ]
+        return await self._send_batch(requests)
+
+    async def _post(self, payload: dict) -> dict:
         resp = await self._http.post(self.mcp_url, json=payload)
         resp.raise_for_status()
         return resp.json()
 
+    async def _send_batch(self, requests: list[dict]) -> list[dict]:
+        """Send ``requests`` as a batch, falling back to one POST each.
+
+        The fallback is remembered so a server that rejects batches is only
+        probed once per client.
+        """
+        if not requests:
+            return []
+        responses: list[dict | None] = [None] * len(requests)
+        if self._batch_supported is not False and len(requests) > 1:
+            batched = await post_batch(self._http, self.mcp_url, requests)
+            self._batch_supported = batched is not None
+            if batched is not None:
+                responses = batched
+        missing = [i for i, r in enumerate(responses) if r is None]
+        singles = await asyncio.gather(*(self._post(requests[i]) for i in missing))
+        for i, response in zip(missing, singles):
+            responses[i] = response
+        return responses  # type: ignore[return-value]
+
     async def close(self) -> None:
         await self._http.aclose()
+
+
+# ── Streamable HTTP session ─────────────────────────────────────
+
+MCP_PROTOCOL_VERSION = "2025-03-26"
+SESSION_HEADER = "Mcp-Session-Id"
+
+try:  # HTTP/2 lets concurrent requests share a single connection.
+    import h2  # noqa: F401
+
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+
+async def iter_sse(response: httpx.Response) -> AsyncIterator[tuple[str | None, dict]]:
+    """Yield ``(event_id, message)`` for each JSON ``data`` event of an SSE stream."""
+    data: list[str] = []
+    event_id: str | None = None
+    async for line in response.aiter_lines():
+        if not line:
+            if data:
+                with contextlib.suppress(ValueError):
+                    yield event_id, json.loads("\n".join(data))
+            data, event_id = [], None
+            continue
+        name, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if name == "data":
+            data.append(value)
+        elif name == "id":
+            event_id = value
+    if data:
+        with contextlib.suppress(ValueError):
+            yield event_id, json.loads("\n".join(data))
+
+
+def _is_response(message: dict) -> bool:
+    return "id" in message and ("result" in message or "error" in message)
+
+
+class MCPSession(MCPClient):
+    """MCP client bound to one streamable-HTTP session.
+
+    The session is initialized lazily on the first call.  Every POST carries
+    the ``Mcp-Session-Id`` and accepts either a JSON body or an SSE stream;
+    each message read from any stream is dispatched by ``id`` (responses) or
+    ``progressToken`` (progress notifications), so many calls can be in
+    flight at once.  With ``listen=True`` a GET stream is kept open for
+    server-initiated notifications such as ``tools/list_changed``.
+    """
+
+    # Seconds before the first reconnect of a dropped GET stream (doubling, to 30).
+    reconnect_delay = 0.5
+
+    def __init__(
+        self,
+        mcp_url: str,
+        api_key: str,
+        catalog: ToolCatalogCache | None = None,
+        listen: bool = True,
+        client_info: dict[str, str] | None = None,
+    ) -> None:
+        super().__init__(mcp_url, api_key, catalog=catalog)
+        self.listen = listen
+        self.client_info = client_info or {"name": "agent-builder-hackathon", "version": "0.1.0"}
+        self.session_id: str | None = None
+        self.server_capabilities: dict[str, Any] = {}
+        self._initializing = False
+        self._init_lock = asyncio.Lock()
+        self._queues: dict[Any, asyncio.Queue] = {}
+        self._listener: asyncio.Task | None = None
+        # Resume point of the GET stream; POST response streams are not resumed.
+        self._listen_event_id: str | None = None
+
+    def _make_http(self, headers: dict[str, str]) -> httpx.AsyncClient:
+        # Tool calls may stream for longer than any read timeout.
+        return httpx.AsyncClient(
+            headers=headers, timeout=httpx.Timeout(60.0, read=None), http2=_HTTP2
+        )
+
+    # ── Lifecycle ───────────────────────────────────────────────
+
+    async def initialize(self) -> dict[str, Any]:
+        """Run the ``initialize`` handshake once; returns server capabilities."""
+        async with self._init_lock:
+            if self.session_id is not None:
+                return self.server_capabilities
+            payload = rpc_request(
+                "initialize",
+                self._next_id(),
+                {
+                    "protocolVersion": MCP_PROTOCOL_VERSION,
+                    "capabilities": {},
+                    "clientInfo": self.client_info,
+                },
+            )
+            self._initializing = True
+            try:
+                response = await self._roundtrip(payload)
+            finally:
+                self._initializing = False
+            if "error" in response:
+                self.session_id = None
+                raise RuntimeError(f"MCP initialize failed: {response['error']}")
+            self.session_id = self.session_id or ""
+            self.server_capabilities = response.get("result", {}).get("capabilities", {})
+            await self._notify("notifications/initialized")
+            if self.listen and self.server_capabilities.get("tools", {}).get("listChanged"):
+                self._listener = asyncio.create_task(self._listen())
+            return self.server_capabilities
+
+    async def close(self) -> None:
+        """Stop listening, end the session on the server, and close the pool."""
+        await self._stop_listener()
+        if self.session_id:
+            with contextlib.suppress(httpx.HTTPError):
+                await self._http.delete(self.mcp_url, headers=self._session_headers())
+        self.session_id = None
+        await super().close()
+
+    async def _stop_listener(self) -> None:
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await listener
+
+    # ── Calls ───────────────────────────────────────────────────
+
+    async def stream_tool(
+        self, name: str, arguments: dict[str, Any] | None = None
+    ) -> AsyncIterator[dict]:
+        """Call a tool, yielding progress notifications and then the final response."""
+        request_id = self._next_id()
+        payload = rpc_request(
+            "tools/call",
+            request_id,
+            {"name": name, "arguments": arguments or {}, "_meta": {"progressToken": request_id}},
+        )
+        await self.initialize()
+        async for message in self._exchange(payload):
+            yield message
+
+    async def _post(self, payload: dict) -> dict:
+        await self.initialize()
+        return await self._roundtrip(payload)
+
+    async def _send_batch(self, requests: list[dict]) -> list[dict]:
+        # Calls already share the session; send them concurrently rather than batched.
+        return list(await asyncio.gather(*(self._post(r) for r in requests)))
+
+    # ── Transport ───────────────────────────────────────────────
+
+    def _session_headers(self) -> dict[str, str]:
+        headers = {"Accept": "application/json, text/event-stream"}
+        if self.session_id:
+            headers[SESSION_HEADER] = self.session_id
+        return headers
+
+    async def _roundtrip(self, payload: dict) -> dict:
+        final: dict = {}
+        async for message in self._exchange(payload):
+            final = message
+        return final
+
+    async def _exchange(self, payload: dict) -> AsyncIterator[dict]:
+        """POST one request and yield the messages addressed to it."""
+        request_id = payload["id"]
+        token = payload.get("params", {}).get("_meta", {}).get("progressToken")
+        queue: asyncio.Queue = asyncio.Queue()
+        self._queues[request_id] = queue
+        if token is not None:
+            self._queues[("progress", token)] = queue
+        sender = asyncio.create_task(self._send(payload))
+        sender.add_done_callback(queue.put_nowait)
+        try:
+            while True:
+                item = await queue.get()
+                if isinstance(item, asyncio.Task):
+                    if item.cancelled() or item.exception() is None:
+                        if self._listener is None:
+                            raise RuntimeError(f"MCP server sent no response to {request_id}")
+                        continue  # the response may still arrive on the GET stream
+                    raise item.exception()  # type: ignore[misc]
+                yield item
+                if _is_response(item):
+                    return
+        finally:
+            self._queues.pop(request_id, None)
+            self._queues.pop(("progress", token), None)
+            if not sender.done():
+                sender.cancel()
+
+    async def _send(self, payload: dict, retry: bool = True) -> None:
+        async with self._http.stream(
+            "POST", self.mcp_url, json=payload, headers=self._session_headers()
+        ) as resp:
+            if resp.status_code == 404 and self.session_id and retry:
+                # The server expired the session: start a new one and replay.
+                # Its GET stream belongs to the old session; drop it too.
+                self.session_id = None
+                await self._stop_listener()
+                self._listen_event_id = None
+                await self.initialize()
+                await self._send(payload, retry=False)
+                return
+            if resp.status_code >= 400:
+                await resp.aread()
+            resp.raise_for_status()
+            if self._initializing and SESSION_HEADER in resp.headers:
+                self.session_id = resp.headers[SESSION_HEADER]
+            if resp.headers.get("content-type", "").startswith("text/event-stream"):
+                async for _event_id, message in iter_sse(resp):
+                    self._dispatch(message)
+            elif resp.status_code != 202:
+                body = json.loads(await resp.aread())
+                for message in body if isinstance(body, list) else [body]:
+                    self._dispatch(message)
+
+    async def _notify(self, method: str) -> None:
+        resp = await self._http.post(
+            self.mcp_url,
+            json={"jsonrpc": "2.0", "method": method},
+            headers=self._session_headers(),
+        )
+        resp.raise_for_status()
+
+    async def _listen(self) -> None:
+        """Hold the GET stream open for server notifications, reconnecting on drop."""
+        delay = self.reconnect_delay
+        while True:
+            headers = {**self._session_headers(), "Accept": "text/event-stream"}
+            if self._listen_event_id:
+                headers["Last-Event-ID"] = self._listen_event_id
+            try:
+                async with self._http.stream("GET", self.mcp_url, headers=headers) as resp:
+                    if resp.status_code == 405:
+                        self._listener = None
+                        return  # the server offers no standalone stream
+                    resp.raise_for_status()
+                    delay = self.reconnect_delay
+                    async for event_id, message in iter_sse(resp):
+                        self._listen_event_id = event_id or self._listen_event_id
+                        self._dispatch(message)
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+    def _dispatch(self, message: dict) -> None:
+        if _is_response(message):
+            queue = self._queues.get(message["id"])
+        elif message.get("method") == "notifications/progress":
+            token = message.get("params", {}).get("progressToken")
+            queue = self._queues.get(("progress", token))
+        else:
+            self.handle_notification(message)
+            return
+        if queue is not None:
+            queue.put_nowait(message)
@@ -0,0 +1,183 @@
+"""Compiled ``{{...}}`` templates for workflow configurations and tool specs.
+
+Workflow steps reference earlier outputs (``{{query_errors.error_count}}``),
+loop items (``{{item._index}}``) and run variables (``{{now}}``); custom
+tool definitions use ``{{KIBANA_URL}}``.  Rather than re-scanning strings for
+every render, a configuration is compiled once into a tree of small render
+functions with the reference paths already split.  Rendering a FOREACH body
+for thousands of items then only walks that tree: constant sub-trees are
+returned as-is (treat rendered output as read-only) and a string that is a
+single placeholder yields the referenced value without formatting.
+
+Compiling against a set of known root names rejects unknown references up
+front, before any step runs.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+_REF_RE = re.compile(r"\{\{\s*([A-Za-z_@][\w.@-]*)\s*\}\}")
+
+Renderer = Callable[[dict[str, Any]], Any]
+
+
+class TemplateError(ValueError):
+    """A template references a name that is not available where it is used."""
+
+
+# ── Path lookup ──────────────────────────────────────────────────
+
+
+def _lookup(obj: Any, parts: tuple[str, ...], start: int, path: str) -> Any:
+    """Resolve ``parts[start:]`` inside ``obj``.
+
+    Dotted keys such as ``service.name`` (as returned by ES|QL) are matched
+    longest-first before descending, and lists are mapped element-wise.
+    """
+    n = len(parts)
+    i = start
+    while i < n:
+        if isinstance(obj, dict):
+            if i + 1 == n:
+                if parts[i] not in obj:
+                    break
+                obj = obj[parts[i]]
+                i = n
+                continue
+            for j in range(n, i, -1):
+                key = ".".join(parts[i:j]) if j - i > 1 else parts[i]
+                if key in obj:
+                    obj = obj[key]
+                    i = j
+                    break
+            else:
+                break
+        elif isinstance(obj, list):
+            if parts[i].isdigit():
+                obj = obj[int(parts[i])]
+                i += 1
+            else:
+                return [_lookup(item, parts, i, path) for item in obj]
+        else:
+            break
+    else:
+        return obj
+    raise KeyError(f"Unresolved template reference {{{{{path}}}}}")
+
+
+def resolve_path(scope: dict[str, Any], path: str) -> Any:
+    """Look up ``a.b.c`` in ``scope``; lists are mapped element-wise."""
+    return _lookup(scope, tuple(path.split(".")), 0, path)
+
+
+@dataclass(frozen=True)
+class Ref:
+    """A pre-split ``{{root.path}}`` reference."""
+
+    path: str
+    parts: tuple[str, ...]
+
+    @property
+    def root(self) -> str:
+        return self.parts[0]
+
+    def __call__(self, scope: dict[str, Any]) -> Any:
+        return _lookup(scope, self.parts, 0, self.path)
+
+
+def _ref(path: str) -> Ref:
+    return Ref(path=path, parts=tuple(path.split(".")))
+
+
+# ── Compilation ──────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class Template:
+    """A compiled configuration: call ``render(scope)`` to instantiate it."""
+
+    source: Any
+    refs: frozenset[str]
+    _render: Renderer
+
+    def render(self, scope: dict[str, Any]) -> Any:
+        return self._render(scope)
+
+
+def _const(value: Any) -> Renderer:
+    return lambda _scope: value
+
+
+def _compile(value: Any, refs: set[str]) -> tuple[Renderer, bool]:
+    """Return ``(renderer, is_constant)`` for ``value``."""
+    if isinstance(value, str):
+        matches = list(_REF_RE.finditer(value))
+        if not matches:
+            return _const(value), True
+        if len(matches) == 1 and matches[0].group(0) == value.strip():
+            ref = _ref(matches[0].group(1))
+            refs.add(ref.root)
+            return ref, False
+        pieces: list[str | Ref] = []
+        pos = 0
+        for m in matches:
+            if m.start() > pos:
+                pieces.append(value[pos : m.start()])
+            ref = _ref(m.group(1))
+            refs.add(ref.root)
+            pieces.append(ref)
+            pos = m.end()
+        if pos < len(value):
+            pieces.append(value[pos:])
+        frozen = tuple(pieces)
+
+        def interpolate(scope: dict[str, Any]) -> str:
+            return "".join(p if isinstance(p, str) else str(p(scope)) for p in frozen)
+
+        return interpolate, False
+
+    if isinstance(value, dict):
+        compiled = [(k, *_compile(v, refs)) for k, v in value.items()]
+        if all(const for _, _, const in compiled):
+            return _const(value), True
+        items = tuple((k, r) for k, r, _ in compiled)
+        return (lambda scope: {k: r(scope) for k, r in items}), False
+
+    if isinstance(value, list):
+        compiled_items = [_compile(v, refs) for v in value]
+        if all(const for _, const in compiled_items):
+            return _const(value), True
+        renderers = tuple(r for r, _ in compiled_items)
+        return (lambda scope: [r(scope) for r in renderers]), False
+
+    return _const(value), True
+
+
+def compile_template(value: Any, known: set[str] | frozenset[str] | None = None) -> Template:
+    """Compile ``value`` (str / dict / list tree) into a ``Template``.
+
+    Args:
+        value: The configuration to compile.
+        known: Root names the template may reference.  When given, any other
+            root raises ``TemplateError`` now rather than at render time.
+    """
+    refs: set[str] = set()
+    renderer, _ = _compile(value, refs)
+    if known is not None and refs - set(known):
+        missing = ", ".join(sorted(refs - set(known)))
+        raise TemplateError(f"Unknown template reference(s): {missing}")
+    return Template(source=value, refs=frozenset(refs), _render=renderer)
+
+
+def template_refs(value: Any) -> set[str]:
+    """Root names referenced by ``{{...}}`` placeholders anywhere in ``value``."""
+    return set(compile_template(value).refs)
+
+
+def render(value: Any, scope: dict[str, Any]) -> Any:
+    """One-off render (compiles on every call; prefer ``compile_template``)."""
+    return compile_template(value).render(scope)
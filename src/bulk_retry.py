@@ -0,0 +1,195 @@
+"""Per-item ``_bulk`` result handling: retry rejections, dead-letter the rest.
+
+A ``_bulk`` request succeeds as a whole even when some of its items fail.
+Items rejected because the cluster is overloaded (HTTP 429 /
+``es_rejected_execution_exception``) succeed when sent again later, so only
+those are retried, with jittered exponential backoff.  Every other failure
+(mapping conflicts, malformed documents) would fail again; those documents
+go to a dead-letter JSONL file, together with the error, so they can be
+fixed and replayed without re-running the whole ingest.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+REJECTED_TYPE = "es_rejected_execution_exception"
+
+
+def item_result(item: dict[str, Any]) -> dict[str, Any]:
+    """The result of one ``_bulk`` item (``{"index": {...}}`` -> ``{...}``)."""
+    return next(iter(item.values()))
+
+
+def is_rejected(result: dict[str, Any]) -> bool:
+    """Whether a failed item was rejected for load and is worth retrying."""
+    error = result.get("error")
+    kind = error.get("type") if isinstance(error, dict) else None
+    return result.get("status") == 429 or kind == REJECTED_TYPE
+
+
+def classify_items(
+    items: list[dict[str, Any]],
+) -> tuple[int, list[int], list[tuple[int, dict[str, Any]]]]:
+    """Split a ``_bulk`` response's items.
+
+    Returns the number of successful items, the positions to retry and the
+    ``(position, result)`` of items that failed permanently.
+    """
+    ok = 0
+    retry: list[int] = []
+    failed: list[tuple[int, dict[str, Any]]] = []
+    for position, item in enumerate(items):
+        result = item_result(item)
+        if "error" not in result:
+            ok += 1
+        elif is_rejected(result):
+            retry.append(position)
+        else:
+            failed.append((position, result))
+    return ok, retry, failed
+
+
+def backoff(attempt: int, initial: float = 0.5, maximum: float = 30.0) -> float:
+    """Delay before retry ``attempt`` (0-based): exponential, capped, jittered."""
+    return min(maximum, initial * 2**attempt) * random.uniform(0.5, 1.0)
+
+
+@dataclass
+class BulkResult:
+    """Exact outcome of a bulk ingest.
+
+    ``indexed + failed`` equals the number of documents sent; ``retried``
+    counts item re-sends (one document may be retried several times).
+    """
+
+    indexed: int = 0
+    failed: int = 0
+    retried: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {"indexed": self.indexed, "errors": self.failed, "retried": self.retried}
+
+
+class DeadLetter:
+    """Appends permanently failed documents to a JSONL file.
+
+    Each line holds the target ``index``, ``id``, item ``status``, ``error``
+    and the original ``document``.  The file is only created on the first
+    failure.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.count = 0
+        self._file: IO[str] | None = None
+
+    def write(
+        self,
+        index: str | None,
+        document: Any,
+        result: dict[str, Any],
+        doc_id: Any = None,
+    ) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+        record = {
+            "index": index,
+            "id": doc_id,
+            "status": result.get("status"),
+            "error": result.get("error"),
+            "document": document,
+        }
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self.count += 1
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> DeadLetter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _chunks(actions: Iterable[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    chunk: list[dict[str, Any]] = []
+    for action in actions:
+        chunk.append(action)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _operations(chunk: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    lines: list[dict[str, Any]] = []
+    for action in chunk:
+        meta = {"_index": action["_index"]}
+        if "_id" in action:
+            meta["_id"] = action["_id"]
+        lines += ({action.get("_op_type", "index"): meta}, action["_source"])
+    return lines
+
+
+def bulk_with_retry(
+    es: Any,
+    actions: Iterable[dict[str, Any]],
+    chunk_size: int = 500,
+    max_retries: int = 5,
+    initial_backoff: float = 0.5,
+    max_backoff: float = 30.0,
+    dead_letter: DeadLetter | None = None,
+    sleep: Callable[[float], None] | None = None,
+) -> BulkResult:
+    """Index ``actions`` (``{"_index", "_source", "_id"?}``) with ``es.bulk``.
+
+    Rejected items are re-sent (alone) up to ``max_retries`` times, as is a
+    whole chunk answered with HTTP 429.  Items that fail otherwise, or are
+    still rejected after the last retry, count as ``failed`` and are written
+    to ``dead_letter`` when given.  ``sleep`` defaults to ``time.sleep``,
+    looked up at call time.
+    """
+    sleep = sleep or time.sleep
+    result = BulkResult()
+    for chunk in _chunks(actions, chunk_size):
+        pending = chunk
+        for attempt in range(max_retries + 1):
+            last = attempt == max_retries
+            try:
+                response = es.bulk(operations=_operations(pending))
+            except Exception as exc:
+                if getattr(exc, "status_code", None) != 429:
+                    raise
+                # The whole request was rejected: every item is retryable.
+                rejected = {"status": 429, "error": {"type": REJECTED_TYPE, "reason": str(exc)}}
+                items = [{"index": rejected}] * len(pending)
+            else:
+                items = getattr(response, "body", response)["items"]
+            ok, retry, failed = classify_items(items)
+            result.indexed += ok
+            if last:
+                failed += [(p, item_result(items[p])) for p in retry]
+                retry = []
+            for position, item in failed:
+                result.failed += 1
+                if dead_letter is not None:
+                    action = pending[position]
+                    dead_letter.write(action["_index"], action["_source"], item, action.get("_id"))
+            if not retry:
+                break
+            pending = [pending[p] for p in retry]
+            result.retried += len(pending)
+            sleep(backoff(attempt, initial_backoff, max_backoff))
+    return result
@@ -1,33 +1,438 @@
-"""Data ingestion utilities for loading datasets into Elasticsearch."""
+"""Data ingestion utilities for loading datasets into Elasticsearch.
+
+JSONL files are memory-mapped and parsed straight from the mapped buffer, so
+a multi-GB log dump never goes through Python text I/O.  With orjson (or
+simdjson) installed each line is parsed from a zero-copy slice; otherwise
+each 1 MB block of lines is decoded once and parsed with a single
+``json.loads`` call.  ``split_ranges`` cuts a file into newline-aligned byte
+ranges that worker processes parse independently.
+
+JSON array files are parsed incrementally (``iter_json_array``), so both
+``.json`` and ``.jsonl`` inputs stream into ``bulk_index``.  gzip and zstd
+inputs are decompressed on the fly by ``decompression.open_chunks``.
+"""
 
 from __future__ import annotations
 
+import codecs
+import gc
 import json
+import mmap
+import os
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing.context import BaseContext
 from pathlib import Path
-from typing import Any, Iterator
+from typing import Any, TypeVar
 
 from elasticsearch import Elasticsearch
-from elasticsearch.helpers import bulk
 
-from .elastic_client import get_es_client
+from .bulk_retry import DeadLetter, bulk_with_retry
+from .decompression import compression_of, open_chunks, stripped_suffix
+
+try:
+    import orjson
+
+    _fast_loads: Any = orjson.loads
+    _ZERO_COPY = True  # orjson parses memoryview slices of the map directly
+except ImportError:  # pragma: no cover - depends on the environment
+    _ZERO_COPY = False
+    try:
+        import simdjson
+
+        _simdjson = simdjson.Parser()
+
+        def _fast_loads(data: bytes) -> Any:
+            # simdjson returns lazy proxies; materialise them for pickling/indexing.
+            return _simdjson.parse(data).as_dict()
+
+    except ImportError:
+        _fast_loads = None
+
+_BLANK = b" \t\r\n"
+BLOCK_SIZE = 1024 * 1024
+DEFAULT_RANGE_SIZE = 64 * 1024 * 1024
+
+T = TypeVar("T")
+
+# Index settings for the duration of a bulk load (see ``ingest_settings``).
+INGEST_SETTINGS: dict[str, Any] = {"refresh_interval": "-1", "number_of_replicas": 0}
+
+
+@dataclass
+class LoadStats:
+    """Bytes and documents parsed, for throughput reporting."""
+
+    bytes: int = 0
+    documents: int = 0
+    seconds: float = 0.0
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.bytes / 1_000_000 / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.documents} docs, {self.bytes / 1_000_000:.1f} MB "
+            f"in {self.seconds:.2f}s ({self.mb_per_s:.1f} MB/s)"
+        )
+
+
+def _parse_lines(lines: list[str]) -> list[dict[str, Any]]:
+    """Careful per-line parse: skips blank lines, reports the bad line."""
+    docs = []
+    for line in lines:
+        if line.strip():
+            docs.append(json.loads(line))
+    return docs
+
+
+def _parse_text_block(text: str) -> list[dict[str, Any]]:
+    """Stdlib path: one ``json.loads`` call per block instead of per line.
+
+    The block's lines are joined into a JSON array so the C scanner handles
+    the whole block; a block that doesn't parse that way (blank lines with
+    stray whitespace, or a bad document) is re-parsed line by line.
+    """
+    lines = text.split("\n")
+    try:
+        return json.loads("[" + ",".join(line for line in lines if line) + "]")
+    except json.JSONDecodeError:
+        return _parse_lines(lines)
+
 
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Suspend the cyclic GC while a block's dicts are allocated.
+
+    Parsed documents contain no reference cycles, but allocating thousands
+    of containers triggers repeated young-generation collections.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _parse_block(
+    mm: mmap.mmap | bytes, view: memoryview, pos: int, end: int
+) -> list[dict[str, Any]]:
+    """Parse the complete lines in ``[pos, end)`` of the mapped file."""
+    with _gc_paused():
+        if _fast_loads is None:
+            return _parse_text_block(mm[pos:end].decode())
+        docs = []
+        while pos < end:
+            nl = mm.find(b"\n", pos, end)
+            line_end = end if nl == -1 else nl
+            if line_end > pos and not (mm[pos] in _BLANK and not mm[pos:line_end].strip(_BLANK)):
+                docs.append(_fast_loads(view[pos:line_end] if _ZERO_COPY else mm[pos:line_end]))
+            pos = line_end + 1
+        return docs
+
+
+def split_ranges(
+    path: Path, parts: int | None = None, range_size: int = DEFAULT_RANGE_SIZE
+) -> list[tuple[int, int]]:
+    """Split ``path`` into newline-aligned ``(start, end)`` byte ranges.
+
+    Args:
+        path: JSONL file.
+        parts: Number of ranges; defaults to ``size / range_size`` (at least 1).
+        range_size: Target bytes per range when ``parts`` is not given.
+    """
+    size = path.stat().st_size
+    if size == 0:
+        return []
+    parts = parts or max(1, -(-size // range_size))
+    bounds = [0]
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for i in range(1, parts):
+            cut = mm.find(b"\n", max(bounds[-1], size * i // parts))
+            if cut == -1:
+                break
+            if cut + 1 > bounds[-1]:
+                bounds.append(cut + 1)
+    if bounds[-1] != size:
+        bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def iter_jsonl(
+    path: Path, start: int = 0, end: int | None = None, stats: LoadStats | None = None
+) -> Iterator[dict[str, Any]]:
+    """Yield documents from the lines in ``[start, end)`` of a JSONL file.
+
+    ``start`` must be the first byte of a line (see ``split_ranges``).  The
+    range is parsed in ``BLOCK_SIZE`` blocks cut at line boundaries; only
+    parsing time counts towards ``stats.seconds``.
+    """
+    if path.stat().st_size == 0:
+        return
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        view = memoryview(mm)
+        stop = len(mm) if end is None else min(end, len(mm))
+        pos = start
+        try:
+            while pos < stop:
+                began = time.perf_counter()
+                nl = mm.find(b"\n", min(pos + BLOCK_SIZE, stop) - 1, stop)
+                block_end = stop if nl == -1 else nl + 1
+                docs = _parse_block(mm, view, pos, block_end)
+                if stats is not None:
+                    stats.bytes += block_end - pos
+                    stats.documents += len(docs)
+                    stats.seconds += time.perf_counter() - began
+                pos = block_end
+                yield from docs
+        finally:
+            view.release()
+
+
+def iter_jsonl_chunks(
+    chunks: Iterable[bytes], stats: LoadStats | None = None
+) -> Iterator[dict[str, Any]]:
+    """Yield documents from JSONL content arriving as byte chunks.
+
+    Each chunk is parsed up to its last newline; the partial line is
+    carried into the next chunk.
+    """
+    tail = b""
+    for chunk in chunks:
+        began = time.perf_counter()
+        buf = tail + chunk if tail else chunk
+        cut = buf.rfind(b"\n") + 1
+        tail = buf[cut:]
+        docs = _parse_block(buf, memoryview(buf), 0, cut) if cut else []
+        if stats is not None:
+            stats.bytes += cut
+            stats.documents += len(docs)
+            stats.seconds += time.perf_counter() - began
+        yield from docs
+    if tail.strip(_BLANK):
+        began = time.perf_counter()
+        docs = _parse_block(tail, memoryview(tail), 0, len(tail))
+        if stats is not None:
+            stats.bytes += len(tail)
+            stats.documents += len(docs)
+            stats.seconds += time.perf_counter() - began
+        yield from docs
+
+
+def load_jsonl(
+    path: Path, stats: LoadStats | None = None, workers: int | None = None
+) -> Iterator[dict[str, Any]]:
+    """Yield documents from a JSONL file, gzip/zstd-compressed or not.
+
+    ``workers`` bounds the decompression threads for compressed input.
+    """
+    if compression_of(path):
+        yield from iter_jsonl_chunks(open_chunks(path, workers), stats)
+    else:
+        yield from iter_jsonl(path, stats=stats)
 
-def load_jsonl(path: Path) -> Iterator[dict[str, Any]]:
-    """Yield documents from a JSONL file."""
-    with path.open() as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                yield json.loads(line)
 
+def _documents(docs: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return docs
 
-def load_json(path: Path) -> list[dict[str, Any]]:
-    """Load a JSON array file."""
-    with path.open() as f:
-        data = json.load(f)
-    if isinstance(data, list):
-        return data
-    raise ValueError(f"Expected JSON array, got {type(data).__name__}")
+
+def _parse_range(
+    args: tuple[str, int, int, Callable[[list[dict[str, Any]]], T]],
+) -> tuple[T, LoadStats]:
+    path, start, end, func = args
+    stats = LoadStats()
+    docs = list(iter_jsonl(Path(path), start, end, stats))
+    return func(docs), stats
+
+
+def map_jsonl_ranges(
+    path: Path,
+    func: Callable[[list[dict[str, Any]]], T],
+    workers: int | None = None,
+    range_size: int = DEFAULT_RANGE_SIZE,
+    stats: LoadStats | None = None,
+    mp_context: BaseContext | None = None,
+) -> Iterator[T]:
+    """Parse byte ranges of a JSONL file in worker processes.
+
+    Each worker parses one range and returns ``func(docs)`` (``func`` must be
+    picklable, i.e. a module-level function), so work such as serialising
+    bulk bodies happens next to the parser and only its result crosses the
+    process boundary.  Results are yielded in file order; at most
+    ``2 * workers`` ranges are in flight, so memory is bounded by the range
+    size rather than the file size.  ``stats.seconds`` sums the workers'
+    parse time, so ``mb_per_s`` is the per-process rate.  Pass a
+    ``forkserver``/``spawn`` ``mp_context`` when calling from a threaded
+    process (e.g. next to an event loop).
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = iter(split_ranges(path, range_size=range_size))
+    window: deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+
+        def submit() -> bool:
+            for start, end in ranges:
+                window.append(pool.submit(_parse_range, (str(path), start, end, func)))
+                return True
+            return False
+
+        while len(window) < 2 * workers and submit():
+            pass
+        while window:
+            result, part = window.popleft().result()
+            submit()
+            if stats is not None:
+                stats.bytes += part.bytes
+                stats.documents += part.documents
+                stats.seconds += part.seconds
+            yield result
+
+
+def load_jsonl_parallel(
+    path: Path,
+    workers: int | None = None,
+    range_size: int = DEFAULT_RANGE_SIZE,
+    stats: LoadStats | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Parse a JSONL file in worker processes, yielding documents in file order.
+
+    Documents are pickled back to this process, which costs about as much as
+    parsing them; prefer ``map_jsonl_ranges`` when the per-document work can
+    run in the workers too.
+    """
+    if (workers or os.cpu_count() or 1) == 1:
+        yield from iter_jsonl(path, stats=stats)
+        return
+    for docs in map_jsonl_ranges(path, _documents, workers, range_size, stats):
+        yield from docs
+
+
+_WHITESPACE = " \t\r\n"
+_ROOT_TYPES = {"{": "dict", '"': "str", "t": "bool", "f": "bool", "n": "NoneType"}
+
+
+def iter_json_array(
+    path: Path,
+    chunk_size: int = BLOCK_SIZE,
+    stats: LoadStats | None = None,
+    workers: int | None = None,
+) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array file one at a time.
+
+    The (decompressed) file is read in ``chunk_size`` pieces, see
+    ``iter_json_array_chunks``.  Memory is bounded by the chunk size plus the
+    largest single element, not by the file size.
+    """
+    yield from iter_json_array_chunks(open_chunks(path, workers, chunk_size), stats)
+
+
+def iter_json_array_chunks(
+    chunks: Iterable[bytes], stats: LoadStats | None = None
+) -> Iterator[Any]:
+    """Yield the elements of a JSON array arriving as byte chunks.
+
+    Every complete element in the buffer is decoded with ``raw_decode``; the
+    unparsed tail is carried into the next chunk.
+    """
+    decode = json.JSONDecoder().raw_decode
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buf = ""
+    pos = 0
+    state = "start"  # start -> first (after "[") -> next (after an element) -> done
+    source = iter(chunks)
+    eof = False
+    while state != "done":
+        chunk = next(source, b"")
+        eof = not chunk
+        began = time.perf_counter()
+        buf = buf[pos:] + decoder.decode(chunk, final=eof)
+        pos = 0
+        docs: list[Any] = []
+        with _gc_paused():
+            while True:
+                while pos < len(buf) and buf[pos] in _WHITESPACE:
+                    pos += 1
+                if pos == len(buf):
+                    break
+                char = buf[pos]
+                if state == "start":
+                    if char != "[":
+                        kind = _ROOT_TYPES.get(char, "number")
+                        raise ValueError(f"Expected JSON array, got {kind}")
+                    pos += 1
+                    state = "first"
+                    continue
+                if char == "]":
+                    if state == "element":
+                        raise json.JSONDecodeError("Trailing comma", buf, pos)
+                    pos += 1
+                    state = "done"
+                    break
+                if state == "next":
+                    if char != ",":
+                        raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos)
+                    pos += 1
+                    state = "element"
+                    continue
+                try:
+                    doc, end = decode(buf, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    break  # element continues in the next chunk
+                if end == len(buf) and not eof:
+                    break  # a scalar may be cut off at the buffer end
+                docs.append(doc)
+                pos = end
+                state = "next"
+        if stats is not None:
+            stats.bytes += len(chunk)
+            stats.documents += len(docs)
+            stats.seconds += time.perf_counter() - began
+        yield from docs
+        if eof and state != "done":
+            raise json.JSONDecodeError("Unterminated JSON array", buf, pos)
+
+
+def _array_root(path: Path) -> None:
+    """Raise ``ValueError`` now, not on first iteration, if the root isn't an array."""
+    with path.open("rb") as f:
+        head = f.read(64).decode("utf-8-sig", errors="replace").lstrip(_WHITESPACE)
+    if head and head[0] != "[":
+        raise ValueError(f"Expected JSON array, got {_ROOT_TYPES.get(head[0], 'number')}")
+
+
+def load_json(
+    path: Path, stats: LoadStats | None = None, workers: int | None = None
+) -> Iterator[dict[str, Any]]:
+    """Stream the documents of a JSON array file, gzip/zstd-compressed or not.
+
+    Raises:
+        ValueError: the file's root value is not an array (checked up front
+            for uncompressed files, on first iteration otherwise).
+    """
+    if not compression_of(path):
+        _array_root(path)
+    return iter_json_array(path, stats=stats, workers=workers)
+
+
+def load_documents(
+    path: Path, stats: LoadStats | None = None, workers: int | None = None
+) -> Iterator[dict[str, Any]]:
+    """Stream documents from ``.jsonl``/``.ndjson`` or ``.json`` files.
+
+    A ``.gz``/``.zst`` suffix (or just the magic bytes) selects decompression.
+    """
+    if stripped_suffix(path) in (".jsonl", ".ndjson"):
+        return load_jsonl(path, stats=stats, workers=workers)
+    return load_json(path, stats=stats, workers=workers)
 
 
 def create_index_if_not_exists(
@@ -48,11 +453,53 @@ def create_index_if_not_exists(
     return True
 
 
+def put_index_templates(es: Elasticsearch, templates: dict[str, dict[str, Any]]) -> None:
+    """Install (or overwrite) composable index templates, by name."""
+    for name, template in templates.items():
+        es.indices.put_index_template(name=name, **template)
+
+
+def create_data_stream_if_not_exists(es: Elasticsearch, name: str) -> bool:
+    """Create a data stream (its index template must exist). Returns True if created."""
+    if es.indices.exists(index=name):
+        return False
+    es.indices.create_data_stream(name=name)
+    return True
+
+
+@contextmanager
+def ingest_settings(
+    es: Elasticsearch, target: str, settings: dict[str, Any] | None = None
+) -> Iterator[None]:
+    """Apply bulk-load index settings to ``target`` and restore them on exit.
+
+    Defaults to ``INGEST_SETTINGS`` (refresh disabled, no replicas).  Each
+    index's previous values are put back afterwards (``None`` resets a
+    setting that wasn't set explicitly) and ``target`` is refreshed.
+    """
+    settings = settings or INGEST_SETTINGS
+    names = [f"index.{key}" for key in settings]
+    current = es.indices.get_settings(index=target, name=names, flat_settings=True)
+    es.indices.put_settings(index=target, settings={"index": settings})
+    try:
+        yield
+    finally:
+        for index, body in current.items():
+            previous = body.get("settings", {})
+            es.indices.put_settings(index=index, settings={n: previous.get(n) for n in names})
+        es.indices.refresh(index=target)
+
+
 def bulk_index(
     index: str,
     documents: Iterator[dict[str, Any]] | list[dict[str, Any]],
     id_field: str | None = None,
     chunk_size: int = 500,
+    es: Elasticsearch | None = None,
+    http_compress: bool = False,
+    max_retries: int = 5,
+    dead_letter: Path | None = None,
+    op_type: str = "index",
 ) -> dict[str, Any]:
     """Bulk-index documents into Elasticsearch.
 
@@ -61,21 +508,42 @@ def bulk_index(
         documents: Iterable of document dicts.
         id_field: Optional field to use as _id.
         chunk_size: Batch size for bulk API.
+        es: Client to use; defaults to ``get_es_client()``.  To gzip the
+            request bodies of a client you pass in, create it with
+            ``Elasticsearch(..., http_compress=True)``.
+        http_compress: gzip request bodies of the default client.
+        max_retries: Times an item rejected with 429 is re-sent (with backoff).
+        dead_letter: JSONL file receiving documents that failed permanently.
+        op_type: ``index``, or ``create`` for data streams.
 
     Returns:
-        Summary with success/error counts.
+        Exact counts: ``indexed``, ``errors`` (failed documents), ``retried``
+        (item re-sends) and ``dead_letter`` (the file, if anything was written).
     """
-    es = get_es_client()
+    if es is None:
+        from incident_commander.elastic_client import get_es_client
+
+        es = get_es_client(http_compress=http_compress)
 
     def _actions():
         for doc in documents:
             action: dict[str, Any] = {
                 "_index": index,
+                "_op_type": op_type,
                 "_source": doc,
             }
             if id_field and id_field in doc:
                 action["_id"] = doc[id_field]
             yield action
 
-    success, errors = bulk(es, _actions(), chunk_size=chunk_size, raise_on_error=False)
-    return {"indexed": success, "errors": len(errors) if isinstance(errors, list) else errors}
+    writer = DeadLetter(dead_letter) if dead_letter else None
+    try:
+        result = bulk_with_retry(
+            es, _actions(), chunk_size=chunk_size, max_retries=max_retries, dead_letter=writer
+        )
+    finally:
+        if writer is not None:
+            writer.close()
+    summary: dict[str, Any] = result.as_dict()
+    summary["dead_letter"] = str(writer.path) if writer is not None and writer.count else None
+    return summary
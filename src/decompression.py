@@ -0,0 +1,243 @@
+"""Streaming readers for gzip- and zstd-compressed ingest files.
+
+``open_chunks`` yields the decompressed bytes of a file in order, without
+writing anything to disk.  Files made of many independent members/frames
+are decompressed in parallel threads (zlib and zstandard release the GIL):
+
+- gzip: concatenated members (``bgzip`` output, rotated logs ``cat``-ed
+  together).  The file is cut at candidate member headers;
+  each segment is only accepted if it decompresses to exactly its end.  A
+  false candidate (header-like bytes inside compressed data) fails that
+  check, and reading continues sequentially from the last verified
+  boundary.
+- zstd: files with several frames (``pzstd`` output, ``.zst`` files
+  concatenated together).  Frame boundaries are found exactly by walking
+  block headers, so no verification is needed.
+
+Single-member gzip and single-frame zstd files are streamed sequentially.
+zstd support needs the optional ``zstandard`` package.
+"""
+
+from __future__ import annotations
+
+import gzip
+import mmap
+import os
+import zlib
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+GZIP_MAGIC = b"\x1f\x8b\x08"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+CHUNK_SIZE = 1024 * 1024
+SEGMENT_SIZE = 4 * 1024 * 1024  # compressed bytes per parallel work unit
+_FEED = 64 * 1024
+
+
+def compression_of(path: Path) -> str | None:
+    """``"gzip"``, ``"zstd"`` or ``None``, from the file's magic bytes."""
+    with path.open("rb") as f:
+        head = f.read(4)
+    if head[:3] == GZIP_MAGIC:
+        return "gzip"
+    if head == ZSTD_MAGIC or (
+        len(head) == 4 and 0x184D2A50 <= int.from_bytes(head, "little") <= 0x184D2A5F
+    ):
+        return "zstd"
+    return None
+
+
+def stripped_suffix(path: Path) -> str:
+    """File suffix ignoring a compression suffix (``a.jsonl.gz`` -> ``.jsonl``)."""
+    suffixes = [s for s in path.suffixes if s not in (".gz", ".gzip", ".zst", ".zstd")]
+    return suffixes[-1] if suffixes else ""
+
+
+def open_chunks(
+    path: Path, workers: int | None = None, chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Yield the (decompressed) contents of ``path`` as byte chunks, in order."""
+    workers = workers or os.cpu_count() or 1
+    kind = compression_of(path)
+    if kind == "gzip":
+        yield from _gzip_chunks(path, workers, chunk_size)
+    elif kind == "zstd":
+        yield from _zstd_chunks(path, workers, chunk_size)
+    else:
+        with path.open("rb") as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+
+def _ordered(
+    pool: ThreadPoolExecutor,
+    func: Callable[[int, int], bytes | None],
+    segments: list[tuple[int, int]],
+    window: int,
+) -> Iterator[tuple[tuple[int, int], bytes | None]]:
+    """Run ``func`` over ``segments`` with at most ``window`` in flight, in order."""
+    todo = iter(segments)
+    pending: deque[tuple[tuple[int, int], Future]] = deque()
+    for segment in todo:
+        pending.append((segment, pool.submit(func, *segment)))
+        if len(pending) >= window:
+            break
+    while pending:
+        segment, future = pending.popleft()
+        for nxt in todo:
+            pending.append((nxt, pool.submit(func, *nxt)))
+            break
+        yield segment, future.result()
+
+
+# ── gzip ─────────────────────────────────────────────────────────
+
+
+def _is_gzip_header(buf: mmap.mmap, pos: int) -> bool:
+    """Plausible gzip member header at ``pos`` (RFC 1952 fixed fields)."""
+    if buf[pos : pos + 3] != GZIP_MAGIC or pos + 10 > len(buf):
+        return False
+    flags, xfl, os_id = buf[pos + 3], buf[pos + 8], buf[pos + 9]
+    return flags & 0xE0 == 0 and xfl in (0, 2, 4) and (os_id <= 13 or os_id == 255)
+
+
+def gzip_segments(buf: mmap.mmap, segment_size: int = SEGMENT_SIZE) -> list[tuple[int, int]]:
+    """Cut ``buf`` at candidate member headers roughly every ``segment_size`` bytes."""
+    size = len(buf)
+    cuts = [0]
+    target = segment_size
+    while target < size:
+        pos = buf.find(GZIP_MAGIC, target)
+        while pos != -1 and not _is_gzip_header(buf, pos):
+            pos = buf.find(GZIP_MAGIC, pos + 1)
+        if pos == -1:
+            break
+        cuts.append(pos)
+        target = pos + segment_size
+    cuts.append(size)
+    return list(zip(cuts, cuts[1:]))
+
+
+def inflate_members(buf: mmap.mmap | bytes, start: int, end: int) -> bytes | None:
+    """Decompress the gzip members in ``[start, end)``.
+
+    Returns ``None`` unless the range holds whole members that end exactly
+    at ``end`` (trailing zero padding is allowed).
+    """
+    out: list[bytes] = []
+    pos = start
+    while pos < end:
+        if buf[pos] == 0 and not buf[pos:end].strip(b"\0"):
+            break
+        inflater = zlib.decompressobj(31)
+        while not inflater.eof:
+            if pos >= end:
+                return None
+            piece = buf[pos : min(pos + _FEED, end)]
+            pos += len(piece)
+            try:
+                out.append(inflater.decompress(piece))
+            except zlib.error:
+                return None
+        pos -= len(inflater.unused_data)
+    return b"".join(out)
+
+
+def _gzip_stream(path: Path, offset: int, chunk_size: int) -> Iterator[bytes]:
+    with path.open("rb") as raw:
+        raw.seek(offset)
+        with gzip.GzipFile(fileobj=raw) as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+
+def _gzip_chunks(path: Path, workers: int, chunk_size: int) -> Iterator[bytes]:
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        segments = gzip_segments(buf)
+        if workers == 1 or len(segments) == 1:
+            yield from _gzip_stream(path, 0, chunk_size)
+            return
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for (start, _end), data in _ordered(
+                pool, lambda s, e: inflate_members(buf, s, e), segments, workers + 1
+            ):
+                if data is None:
+                    # ``start`` is the last verified boundary: finish sequentially.
+                    yield from _gzip_stream(path, start, chunk_size)
+                    return
+                for i in range(0, len(data), chunk_size):
+                    yield data[i : i + chunk_size]
+
+
+# ── zstd ─────────────────────────────────────────────────────────
+
+_FCS_SIZES = (0, 2, 4, 8)
+_DICT_ID_SIZES = (0, 1, 2, 4)
+
+
+def zstd_frames(buf: mmap.mmap | bytes) -> list[tuple[int, int]]:
+    """``(start, end)`` of every frame in ``buf`` (RFC 8878), skippable frames excluded."""
+    frames: list[tuple[int, int]] = []
+    pos, size = 0, len(buf)
+    while pos < size:
+        magic = int.from_bytes(buf[pos : pos + 4], "little")
+        if 0x184D2A50 <= magic <= 0x184D2A5F:
+            pos += 8 + int.from_bytes(buf[pos + 4 : pos + 8], "little")
+            continue
+        if buf[pos : pos + 4] != ZSTD_MAGIC:
+            raise ValueError(f"Not a zstd frame at offset {pos}")
+        start = pos
+        descriptor = buf[pos + 4]
+        single_segment = descriptor & 0x20
+        fcs_size = _FCS_SIZES[descriptor >> 6] or (1 if single_segment else 0)
+        pos += 5 + (0 if single_segment else 1) + _DICT_ID_SIZES[descriptor & 0x03] + fcs_size
+        while True:
+            if pos + 3 > size:
+                raise ValueError(f"Truncated zstd frame at offset {start}")
+            header = int.from_bytes(buf[pos : pos + 3], "little")
+            block_type = (header >> 1) & 0x03
+            block_size = header >> 3
+            pos += 3 + (1 if block_type == 1 else block_size)
+            if header & 0x01:
+                break
+        if descriptor & 0x04:
+            pos += 4  # content checksum
+        frames.append((start, pos))
+    return frames
+
+
+def _zstd_decompress(buf: mmap.mmap, frames: list[tuple[int, int]]) -> bytes:
+    dctx = zstandard.ZstdDecompressor()
+    return b"".join(dctx.decompressobj().decompress(buf[s:e]) for s, e in frames)
+
+
+def _zstd_chunks(path: Path, workers: int, chunk_size: int) -> Iterator[bytes]:
+    if zstandard is None:
+        raise ImportError("Reading .zst input requires the 'zstandard' package")
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        frames = zstd_frames(buf)
+        if workers == 1 or len(frames) < 2:
+            reader = zstandard.ZstdDecompressor().stream_reader(buf, read_across_frames=True)
+            while chunk := reader.read(chunk_size):
+                yield chunk
+            return
+        # Group consecutive frames into segments of about SEGMENT_SIZE bytes.
+        groups: list[list[tuple[int, int]]] = [[]]
+        for frame in frames:
+            if groups[-1] and frame[1] - groups[-1][0][0] > SEGMENT_SIZE:
+                groups.append([])
+            groups[-1].append(frame)
+        spans = {(g[0][0], g[-1][1]): g for g in groups}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for _span, data in _ordered(
+                pool, lambda s, e: _zstd_decompress(buf, spans[(s, e)]), list(spans), workers + 1
+            ):
+                for i in range(0, len(data), chunk_size):
+                    yield data[i : i + chunk_size]
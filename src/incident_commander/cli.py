@@ -2,22 +2,36 @@
 
 from __future__ import annotations
 
+import functools
+from typing import TYPE_CHECKING
+
 import typer
-from rich.console import Console
-from rich.table import Table
 
-from incident_commander.config import settings
+from incident_commander.config import get_settings
+
+if TYPE_CHECKING:
+    from rich.console import Console
 
 app = typer.Typer(
     name="incident-commander",
     help="DevOps Incident Commander — AI-powered incident response",
 )
-console = Console()
+
+
+@functools.cache
+def _console() -> Console:
+    # rich is imported on first output, not at startup (alert hooks run
+    # the CLI once per alert, so import time is paid on every call).
+    from rich.console import Console
+
+    return Console()
 
 
 @app.command()
 def check() -> None:
     """Verify Elastic Cloud connection and configuration."""
+    console = _console()
+    settings = get_settings()
     missing = settings.validate()
     if missing:
         console.print(f"[red]Missing config: {', '.join(missing)}[/red]")
@@ -30,6 +44,8 @@ def check() -> None:
 @app.command()
 def agents() -> None:
     """List configured Incident Commander agents."""
+    from rich.table import Table
+
     from incident_commander.agents import ALL_AGENTS
 
     table = Table(title="Incident Commander Agents")
@@ -46,12 +62,14 @@ def agents() -> None:
             ", ".join(agent["tools"]),
         )
 
-    console.print(table)
+    _console().print(table)
 
 
 @app.command()
 def tools() -> None:
     """List all available tools."""
+    from rich.table import Table
+
     from incident_commander.tools import ALL_TOOLS
 
     table = Table(title="Available Tools")
@@ -62,7 +80,7 @@ def tools() -> None:
     for tool in ALL_TOOLS:
         table.add_row(tool["toolId"], tool["type"], tool["description"])
 
-    console.print(table)
+    _console().print(table)
 
 
 if __name__ == "__main__":
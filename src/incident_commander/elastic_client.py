@@ -4,14 +4,14 @@ from __future__ import annotations
 
 import httpx
 
-from incident_commander.config import Settings, settings as default_settings
+from incident_commander.config import Settings, get_settings
 
 
 class AgentBuilderClient:
     """Client for Elastic Agent Builder Kibana APIs."""
 
     def __init__(self, cfg: Settings | None = None) -> None:
-        self.cfg = cfg or default_settings
+        self.cfg = cfg or get_settings()
         self._http = httpx.AsyncClient(
             base_url=self.cfg.agent_builder_base_url,
             headers=self.cfg.kibana_headers,
@@ -0,0 +1,210 @@
+"""Similarity index of resolved incidents.
+
+Every resolved incident is stored in ``incidents-history`` (matched by the
+``search_incident_history`` tool's ``incidents-*``) with its alert
+fingerprint and an embedding of the alert text.  At triage time
+``IncidentHistory.similar`` runs one hybrid search: kNN on the embedding
+plus a boosted exact match on the fingerprint.  A close enough match
+gives the orchestrator a root cause without a Diagnosis Agent run.
+
+Embeddings come from ``embed``: a signed feature-hashing vector over the
+alert's word unigrams and bigrams.  It runs locally in microseconds and
+needs no model download or inference endpoint; swap in a real model via
+``IncidentHistory(embedder=...)`` with a matching ``dims``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+HISTORY_INDEX = "incidents-history"
+EMBEDDING_DIMS = 256
+# Added to the kNN score (0..1) of a hit with the same alert fingerprint.
+FINGERPRINT_BOOST = 2.0
+# Alert fields whose values describe what went wrong.
+ALERT_TEXT_FIELDS = ("title", "alert.name", "service.name", "message", "error.type")
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+class SearchClient(Protocol):
+    async def es_request(
+        self, method: str, path: str, json: Any = None, params: dict | None = None
+    ) -> dict: ...
+
+    async def index_exists(self, index: str) -> bool: ...
+
+    async def create_index(self, index: str, mappings: dict | None = None) -> dict: ...
+
+
+def history_mappings(dims: int = EMBEDDING_DIMS) -> dict[str, Any]:
+    return {
+        "properties": {
+            "@timestamp": {"type": "date"},
+            "incident.id": {"type": "keyword"},
+            "incident.title": {"type": "text"},
+            "incident.severity": {"type": "keyword"},
+            "incident.fingerprint": {"type": "keyword"},
+            "incident.service": {"type": "keyword"},
+            "incident.root_cause": {
+                "type": "text",
+                "fields": {"keyword": {"type": "keyword", "ignore_above": 512}},
+            },
+            "incident.resolution": {"type": "text"},
+            "incident.mttr_minutes": {"type": "float"},
+            "incident.embedding": {
+                "type": "dense_vector",
+                "dims": dims,
+                "index": True,
+                "similarity": "cosine",
+            },
+        }
+    }
+
+
+def alert_text(alert: dict[str, Any]) -> str:
+    """The descriptive text of an alert, as embedded."""
+    return " ".join(str(alert[name]) for name in ALERT_TEXT_FIELDS if alert.get(name))
+
+
+def embed(text: str, dims: int = EMBEDDING_DIMS) -> list[float]:
+    """Unit-length signed feature-hashing vector of ``text``'s words and bigrams."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    vector = [0.0] * dims
+    for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+        digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+        vector[digest % dims] += 1.0 if digest >> 63 else -1.0
+    norm = math.sqrt(sum(v * v for v in vector))
+    if norm == 0:
+        # dense_vector cosine rejects zero vectors.
+        vector[0], norm = 1.0, 1.0
+    return [v / norm for v in vector]
+
+
+@dataclass
+class SimilarIncident:
+    """A past incident returned by ``IncidentHistory.similar``."""
+
+    id: str
+    title: str
+    root_cause: str
+    resolution: str
+    similarity: float
+    exact: bool
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "root_cause": self.root_cause,
+            "resolution": self.resolution,
+            "similarity": round(self.similarity, 4),
+            "exact": self.exact,
+        }
+
+
+class IncidentHistory:
+    """Stores resolved incidents and finds the ones most like a new alert.
+
+    Args:
+        es: Client with ``es_request`` (e.g. ``backend.elastic_client.ElasticClient``).
+        index: History index name.
+        min_similarity: kNN similarity (0..1) at which a match is trusted
+            for its root cause, fingerprint match or not.
+        embedder: Text → vector function of length ``dims``.
+    """
+
+    def __init__(
+        self,
+        es: SearchClient,
+        index: str = HISTORY_INDEX,
+        min_similarity: float = 0.95,
+        embedder: Callable[[str], list[float]] = embed,
+        dims: int = EMBEDDING_DIMS,
+    ) -> None:
+        self.es = es
+        self.index = index
+        self.min_similarity = min_similarity
+        self.embedder = embedder
+        self.dims = dims
+
+    async def ensure_index(self) -> None:
+        """Create the history index if it doesn't exist yet."""
+        if not await self.es.index_exists(self.index):
+            await self.es.create_index(self.index, history_mappings(self.dims))
+
+    def document(self, incident: Any, fingerprint: str) -> dict[str, Any]:
+        """History document for a resolved ``Incident``."""
+        data = incident.to_dict()
+        alert = incident.alert_payload
+        mttr = data["mttr_seconds"]
+        return {
+            "@timestamp": data["resolved_at"] or data["started_at"],
+            "incident.id": data["id"],
+            "incident.title": data["title"],
+            "incident.severity": data["severity"],
+            "incident.fingerprint": fingerprint,
+            "incident.service": alert.get("service.name"),
+            "incident.root_cause": data["root_cause"],
+            "incident.resolution": data["remediation_action"],
+            "incident.mttr_minutes": None if mttr is None else round(mttr / 60, 2),
+            "incident.embedding": self.embedder(alert_text(alert) or data["title"]),
+        }
+
+    async def record(self, incident: Any, fingerprint: str) -> None:
+        """Index a resolved incident (keyed by its id, so re-runs overwrite)."""
+        await self.es.es_request(
+            "PUT", f"/{self.index}/_doc/{incident.id}", json=self.document(incident, fingerprint)
+        )
+
+    async def similar(
+        self, alert: dict[str, Any], fingerprint: str, k: int = 3
+    ) -> list[SimilarIncident]:
+        """The ``k`` past incidents most like ``alert``, best first."""
+        body = {
+            "size": k,
+            "knn": {
+                "field": "incident.embedding",
+                "query_vector": self.embedder(alert_text(alert)),
+                "k": k,
+                "num_candidates": max(50, 10 * k),
+            },
+            # constant_score, so an exact match adds exactly FINGERPRINT_BOOST.
+            "query": {
+                "constant_score": {
+                    "filter": {"term": {"incident.fingerprint": fingerprint}},
+                    "boost": FINGERPRINT_BOOST,
+                }
+            },
+            "_source": {"excludes": ["incident.embedding"]},
+        }
+        response = await self.es.es_request("POST", f"/{self.index}/_search", json=body)
+        matches = []
+        for hit in response.get("hits", {}).get("hits", []):
+            source = hit["_source"]
+            exact = source.get("incident.fingerprint") == fingerprint
+            matches.append(
+                SimilarIncident(
+                    id=source.get("incident.id", hit["_id"]),
+                    title=source.get("incident.title", ""),
+                    root_cause=source.get("incident.root_cause", ""),
+                    resolution=source.get("incident.resolution", ""),
+                    similarity=hit["_score"] - FINGERPRINT_BOOST * exact,
+                    exact=exact,
+                )
+            )
+        return matches
+
+    def trusted(self, matches: list[SimilarIncident]) -> SimilarIncident | None:
+        """The best match whose root cause can replace a diagnosis, if any."""
+        for match in matches:
+            # A shared fingerprint only ranks a match first; the alert text
+            # must still agree, or a stale root cause would stick forever.
+            if match.root_cause and match.similarity >= self.min_similarity:
+                return match
+        return None
@@ -0,0 +1,96 @@
+"""Collision-free, time-sortable incident IDs.
+
+IDs are 128 bits, written as 26 Crockford base32 characters (the ULID
+alphabet) after a prefix, e.g. ``INC-01JAB3K7Q8X2M4ZC9V5T0WNR6Y``:
+
+    48 bits  milliseconds since the Unix epoch
+    32 bits  node: random, drawn per process (again after a fork)
+    48 bits  sequence within the millisecond
+
+Within a process IDs strictly increase, also when the clock steps back
+or many IDs share a millisecond.  Across workers and processes no
+coordination is needed: two processes only collide if they draw the same
+32-bit node and hit the same millisecond and sequence number.  IDs sort
+by creation time as plain strings.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable
+
+CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+# Crockford digit → the digit of the same value in int(..., 32)'s alphabet.
+_TO_INT_DIGITS = str.maketrans(CROCKFORD, "0123456789abcdefghijklmnopqrstuv")
+# Two characters per 10 bits: 13 table lookups encode an ID.
+_PAIRS = [CROCKFORD[i >> 5] + CROCKFORD[i & 31] for i in range(1024)]
+_SHIFTS = range(120, -1, -10)
+
+TIME_BITS, NODE_BITS, SEQ_BITS = 48, 32, 48
+ENCODED_LENGTH = 26  # ceil(128 / 5)
+
+
+def encode(value: int) -> str:
+    """26 Crockford base32 characters of a 128-bit ``value``."""
+    return "".join([_PAIRS[(value >> shift) & 1023] for shift in _SHIFTS])
+
+
+def decode(text: str) -> int:
+    return int(text.upper().translate(_TO_INT_DIGITS), 32)
+
+
+class IdGenerator:
+    """Thread-safe generator of prefixed, sortable IDs.
+
+    Args:
+        prefix: Prepended to every ID.
+        clock: Current time in milliseconds.
+    """
+
+    def __init__(
+        self,
+        prefix: str = "INC-",
+        clock: Callable[[], int] = lambda: time.time_ns() // 1_000_000,
+    ) -> None:
+        self.prefix = prefix
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._pid = 0
+        self._node = 0
+        self._last_ms = 0
+        self._seq = 0
+
+    def _reseed(self) -> None:
+        # A forked child inherits the parent's state; it needs its own node.
+        self._pid = os.getpid()
+        self._node = int.from_bytes(os.urandom(NODE_BITS // 8), "big")
+
+    def new(self) -> str:
+        """The next ID."""
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reseed()
+            now = self.clock()
+            if now > self._last_ms:
+                self._last_ms, self._seq = now, 0
+            else:
+                # Same millisecond, or the clock went back: keep counting.
+                self._seq += 1
+                if self._seq >> SEQ_BITS:
+                    self._last_ms, self._seq = self._last_ms + 1, 0
+            value = (self._last_ms << (NODE_BITS + SEQ_BITS)) | (self._node << SEQ_BITS) | self._seq
+        return self.prefix + encode(value)
+
+    def timestamp_ms(self, id_: str) -> int:
+        """Creation time (ms since the epoch) of an ID from this scheme."""
+        return decode(id_.removeprefix(self.prefix)) >> (NODE_BITS + SEQ_BITS)
+
+
+incident_ids = IdGenerator("INC-")
+
+
+def new_incident_id() -> str:
+    """A new ``INC-…`` incident ID."""
+    return incident_ids.new()
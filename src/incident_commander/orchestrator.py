@@ -2,22 +2,55 @@
 
 Implements the core incident response flow:
   Alert → Triage → Diagnosis → Remediation → Communication
+
+With ``pipeline=True`` the Communication Agent drafts the status update
+and postmortem from triage and diagnosis while remediation runs, and only
+a short remediation delta is sent once the fix is in:
+  Alert → Triage → Diagnosis → Remediation ‖ Communication draft → Communication update
 """
 
 from __future__ import annotations
 
 import asyncio
 import json
-from dataclasses import dataclass, field
+import logging
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from rich.console import Console
 
 from incident_commander.elastic_client import AgentBuilderClient
 
+from ..agent_builder.a2a import A2AMessage, A2ATask
+from .ids import new_incident_id
+from .responses import (
+    CommunicationResult,
+    RemediationResult,
+    parse_response,
+    schema_instructions,
+)
+
+if TYPE_CHECKING:
+    from ..agent_builder.a2a import A2ATaskManager
+    from .history import IncidentHistory, SimilarIncident
+    from .remediation_cache import CachedRemediation, RemediationCache
+    from .routing import RoutingPolicy, Runbook
+    from .scheduler import SeverityScheduler
+
 console = Console()
+logger = logging.getLogger(__name__)
+
+# Deadline in seconds per A2A task role when a task manager runs the calls.
+PHASE_TIMEOUTS = {
+    "triage": 60.0,
+    "diagnosis": 180.0,
+    "remediation": 180.0,
+    "communication-draft": 120.0,
+    "communication": 120.0,
+}
 
 
 class Severity(str, Enum):
@@ -50,6 +83,19 @@ class IncidentEvent:
     summary: str
     details: dict[str, Any] = field(default_factory=dict)
 
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize event to dict (``details`` are omitted)."""
+        return {
+            "timestamp": self.timestamp,
+            "phase": self.phase.value,
+            "agent": self.agent,
+            "summary": self.summary,
+        }
+
+
+# Called with every change to an incident; see ``Incident.listener``.
+IncidentListener = Callable[["Incident", dict[str, Any]], None]
+
 
 @dataclass
 class Incident:
@@ -68,19 +114,41 @@ class Incident:
         default_factory=lambda: datetime.now(timezone.utc).isoformat()
     )
     resolved_at: str | None = None
+    # Receives incremental deltas (new events, phase changes) so viewers
+    # can follow the incident without re-reading ``to_dict()`` snapshots.
+    listener: IncidentListener | None = field(default=None, repr=False, compare=False)
+
+    def _emit(self, delta: dict[str, Any]) -> None:
+        if self.listener is not None:
+            self.listener(self, {"incident": self.id, **delta})
+
+    def opened(self) -> None:
+        """Announce the incident to the listener (its first delta)."""
+        self._emit({"type": "incident", **self.summary()})
 
     def add_event(self, phase: IncidentPhase, agent: str, summary: str, **details: Any) -> None:
         """Record a timeline event."""
-        self.timeline.append(
-            IncidentEvent(
-                timestamp=datetime.now(timezone.utc).isoformat(),
-                phase=phase,
-                agent=agent,
-                summary=summary,
-                details=details,
-            )
+        event = IncidentEvent(
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            phase=phase,
+            agent=agent,
+            summary=summary,
+            details=details,
         )
+        self.timeline.append(event)
+        self._emit({"type": "event", "index": len(self.timeline) - 1, **event.to_dict()})
+        if phase != self.phase:
+            self.set_phase(phase)
+
+    def set_phase(self, phase: IncidentPhase) -> None:
+        """Move to ``phase``; the delta carries the current summary fields."""
         self.phase = phase
+        self._emit({"type": "phase", **self.summary()})
+
+    def resolve(self) -> None:
+        """Mark the incident resolved now."""
+        self.resolved_at = datetime.now(timezone.utc).isoformat()
+        self.set_phase(IncidentPhase.RESOLVED)
 
     @property
     def mttr_seconds(self) -> float | None:
@@ -91,8 +159,8 @@ class Incident:
         end = datetime.fromisoformat(self.resolved_at)
         return (end - start).total_seconds()
 
-    def to_dict(self) -> dict[str, Any]:
-        """Serialize incident to dict."""
+    def summary(self) -> dict[str, Any]:
+        """Serialize everything but the timeline."""
         return {
             "id": self.id,
             "title": self.title,
@@ -103,17 +171,12 @@ class Incident:
             "mttr_seconds": self.mttr_seconds,
             "started_at": self.started_at,
             "resolved_at": self.resolved_at,
-            "timeline": [
-                {
-                    "timestamp": e.timestamp,
-                    "phase": e.phase.value,
-                    "agent": e.agent,
-                    "summary": e.summary,
-                }
-                for e in self.timeline
-            ],
         }
 
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize incident to dict."""
+        return {**self.summary(), "timeline": [e.to_dict() for e in self.timeline]}
+
 
 class IncidentOrchestrator:
     """Orchestrates the multi-agent incident response pipeline.
@@ -122,16 +185,52 @@ class IncidentOrchestrator:
       Triage → Diagnosis → Remediation → Communication
     """
 
-    def __init__(self, client: AgentBuilderClient, agent_ids: dict[str, str]) -> None:
+    def __init__(
+        self,
+        client: AgentBuilderClient,
+        agent_ids: dict[str, str],
+        listener: IncidentListener | None = None,
+        pipeline: bool = False,
+        policy: RoutingPolicy | None = None,
+        history: IncidentHistory | None = None,
+        remediation_cache: RemediationCache | None = None,
+        scheduler: SeverityScheduler | None = None,
+        task_manager: A2ATaskManager | None = None,
+        phase_timeouts: dict[str, float] | None = None,
+    ) -> None:
         """Initialize orchestrator.
 
         Args:
             client: Agent Builder API client.
             agent_ids: Mapping of agent name → Agent Builder agent ID.
                        Expected keys: "triage", "diagnosis", "remediation", "communication"
+            listener: Attached to every incident to receive its timeline deltas.
+            pipeline: Draft the communication concurrently with remediation.
+            policy: Skips or shortcuts phases by severity and alert
+                fingerprint; ``None`` runs every phase.
+            history: Past incidents; a close match replaces the Diagnosis
+                Agent, weaker ones are passed to it as hints.
+            remediation_cache: Past remediation decisions; trusted known-good
+                actions run without the Remediation Agent.
+            scheduler: Admits agent calls by incident severity, shared by
+                every incident this orchestrator handles.
+            task_manager: Submits A2A tasks and polls them instead of
+                blocking on ``client.send_a2a_task``; tasks past their phase
+                deadline, or of a failed or cancelled incident, are
+                cancelled on the server.
+            phase_timeouts: Per-role deadlines for ``task_manager`` tasks,
+                merged over ``PHASE_TIMEOUTS``.
         """
         self.client = client
         self.agent_ids = agent_ids
+        self.listener = listener
+        self.pipeline = pipeline
+        self.policy = policy
+        self.history = history
+        self.remediation_cache = remediation_cache
+        self.scheduler = scheduler
+        self.task_manager = task_manager
+        self.phase_timeouts = {**PHASE_TIMEOUTS, **(phase_timeouts or {})}
 
     async def handle_alert(self, alert: dict[str, Any]) -> Incident:
         """Process an alert through the full incident pipeline.
@@ -142,10 +241,13 @@ class IncidentOrchestrator:
         Returns:
             Completed Incident with full timeline.
         """
-        incident_id = f"INC-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}"
+        incident_id = new_incident_id()
         title = alert.get("title", alert.get("alert.name", "Unknown Alert"))
 
-        incident = Incident(id=incident_id, title=title, alert_payload=alert)
+        incident = Incident(
+            id=incident_id, title=title, alert_payload=alert, listener=self.listener
+        )
+        incident.opened()
         incident.add_event(
             IncidentPhase.ALERT_RECEIVED,
             "system",
@@ -153,28 +255,168 @@ class IncidentOrchestrator:
         )
 
         console.print(f"\n[bold red]🚨 {incident_id}: {title}[/bold red]")
+        try:
+            await self._run_phases(incident)
+        except BaseException:
+            if self.task_manager is not None:
+                # Failed or cancelled: stop the agents still working on it.
+                await self.task_manager.supersede(incident.id)
+            raise
+        console.print(
+            f"\n[bold green]✅ {incident_id} resolved in "
+            f"{incident.mttr_seconds:.0f}s[/bold green]"
+        )
 
-        # Phase 1: Triage
-        triage_result = await self._run_triage(incident)
-
-        # Phase 2: Diagnosis
-        diagnosis_result = await self._run_diagnosis(incident, triage_result)
+        return incident
 
-        # Phase 3: Remediation
-        remediation_result = await self._run_remediation(incident, diagnosis_result)
+    async def _run_phases(self, incident: Incident) -> None:
+        """Triage, diagnose, remediate and communicate ``incident``, then resolve it."""
+        alert = incident.alert_payload
+        policy = self.policy
+        skipped: frozenset[IncidentPhase] = frozenset()
+        from_history = False
+        runbook = policy.runbook(alert) if policy else None
+        if runbook is not None:
+            # Fast path: a known fingerprint goes straight to remediation.
+            skipped = frozenset({IncidentPhase.TRIAGE, IncidentPhase.DIAGNOSIS})
+            diagnosis_result = self._apply_runbook(incident, policy.fingerprint(alert), runbook)
+        else:
+            # Phase 1: Triage, with the history lookup running alongside.
+            lookup = None
+            if self.history is not None:
+                lookup = asyncio.create_task(self._similar_incidents(alert))
+            try:
+                triage_result = await self._run_triage(incident)
+            except BaseException:
+                if lookup is not None:
+                    lookup.cancel()  # nothing will await it now
+                raise
+            similar = await lookup if lookup else []
+            if policy:
+                skipped = policy.skipped(incident.severity)
+                if skipped:
+                    names = ", ".join(p.value for p in IncidentPhase if p in skipped)
+                    incident.add_event(
+                        IncidentPhase.TRIAGE,
+                        "system",
+                        f"Routing {incident.severity.value}: skipping {names}",
+                    )
+
+            # Phase 2: Diagnosis, unless a past incident already answers it.
+            diagnosis_result: dict[str, Any] = {}
+            match = self.history.trusted(similar) if self.history else None
+            if IncidentPhase.DIAGNOSIS in skipped:
+                pass
+            elif match is not None:
+                diagnosis_result = self._apply_history(incident, match, similar)
+                skipped |= {IncidentPhase.DIAGNOSIS}
+                from_history = True
+            else:
+                diagnosis_result = await self._run_diagnosis(incident, triage_result, similar)
+        if policy:
+            policy.record(skipped, fast_path=runbook is not None)
+
+        communicate = IncidentPhase.COMMUNICATION not in skipped
+        remediation_result: dict[str, Any] = {}
+        if IncidentPhase.REMEDIATION in skipped:
+            pass
+        elif self.pipeline and communicate:
+            # Phases 3 + 4: the communication draft needs only triage and
+            # diagnosis, so it runs alongside remediation.
+            draft = asyncio.create_task(self._draft_communication(incident))
+            try:
+                remediation_result = await self._remediate(incident, diagnosis_result)
+            except BaseException:
+                draft.cancel()
+                raise
+            await self._update_communication(incident, remediation_result, await draft)
+            communicate = False
+        else:
+            # Phase 3: Remediation
+            remediation_result = await self._remediate(incident, diagnosis_result)
 
         # Phase 4: Communication
-        await self._run_communication(incident, remediation_result)
+        if communicate:
+            await self._run_communication(incident, remediation_result)
 
         # Mark resolved
-        incident.resolved_at = datetime.now(timezone.utc).isoformat()
-        incident.phase = IncidentPhase.RESOLVED
-        console.print(
-            f"\n[bold green]✅ {incident_id} resolved in "
-            f"{incident.mttr_seconds:.0f}s[/bold green]"
+        incident.resolve()
+        # An incident diagnosed from history is not re-recorded: its root
+        # cause is the past one, and feeding it back would keep it trusted.
+        if self.history is not None and not from_history:
+            await self._record_history(incident)
+
+    async def _send(self, incident: Incident, task_payload: dict[str, Any]) -> dict[str, Any]:
+        """Send an A2A task, waiting for a scheduler slot first if there is one."""
+        if self.scheduler is None:
+            return await self._dispatch(incident, task_payload)
+        if incident.severity is not None:
+            severity = incident.severity.value
+        else:  # not triaged yet: go by what the alert says
+            from .scheduler import alert_severity
+
+            severity = alert_severity(incident.alert_payload)
+        async with self.scheduler.slot(severity):
+            return await self._dispatch(incident, task_payload)
+
+    async def _dispatch(self, incident: Incident, task_payload: dict[str, Any]) -> dict[str, Any]:
+        if self.task_manager is None:
+            return await self.client.send_a2a_task(task_payload)
+        params = task_payload["params"]
+        role = params["id"].removeprefix(f"{incident.id}-")
+        message = params["message"]
+        task = A2ATask(params["id"], A2AMessage(message["role"], message["parts"]))
+        timeout = self.phase_timeouts.get(role, max(self.phase_timeouts.values()))
+        return await self.task_manager.run(task, group=incident.id, timeout=timeout)
+
+    def _apply_runbook(
+        self, incident: Incident, fingerprint: str, runbook: Runbook
+    ) -> dict[str, Any]:
+        """Take severity and root cause from ``runbook`` instead of the agents."""
+        incident.severity = runbook.severity
+        incident.root_cause = runbook.root_cause
+        incident.add_event(
+            IncidentPhase.ALERT_RECEIVED,
+            "system",
+            f"Known fingerprint {fingerprint}: runbook action '{runbook.action}'",
+            runbook=asdict(runbook),
         )
+        console.print(f"  [yellow]Runbook: {runbook.action}[/yellow]")
+        return {"fingerprint": fingerprint, "runbook": asdict(runbook)}
 
-        return incident
+    def _fingerprint(self, alert: dict[str, Any]) -> str:
+        if self.policy is not None:
+            return self.policy.fingerprint(alert)
+        from .routing import fingerprint
+
+        return fingerprint(alert)
+
+    async def _similar_incidents(self, alert: dict[str, Any]) -> list[SimilarIncident]:
+        try:
+            return await self.history.similar(alert, self._fingerprint(alert))
+        except Exception as exc:  # the lookup is a shortcut, never a failure
+            logger.warning("Incident history lookup failed: %s", exc)
+            return []
+
+    def _apply_history(
+        self, incident: Incident, match: SimilarIncident, similar: list[SimilarIncident]
+    ) -> dict[str, Any]:
+        """Take the root cause of a matching past incident instead of diagnosing."""
+        incident.root_cause = match.root_cause
+        incident.add_event(
+            IncidentPhase.DIAGNOSIS,
+            "Incident History",
+            f"Root cause: {incident.root_cause} (as in {match.id})",
+            similar=[m.to_dict() for m in similar],
+        )
+        console.print(f"  [magenta]Root cause (history): {incident.root_cause}[/magenta]")
+        return {"similar_incident": match.to_dict()}
+
+    async def _record_history(self, incident: Incident) -> None:
+        try:
+            await self.history.record(incident, self._fingerprint(incident.alert_payload))
+        except Exception as exc:
+            logger.warning("Could not record %s in the incident history: %s", incident.id, exc)
 
     async def _run_triage(self, incident: Incident) -> dict[str, Any]:
         """Route alert to Triage Agent for classification."""
@@ -193,6 +435,7 @@ class IncidentOrchestrator:
                             "text": (
                                 f"Classify this alert and identify affected services:\n"
                                 f"{json.dumps(incident.alert_payload, indent=2)}"
+                                f"{schema_instructions('triage')}"
                             ),
                         }
                     ],
@@ -200,31 +443,36 @@ class IncidentOrchestrator:
             },
         }
 
-        result = await self.client.send_a2a_task(task_payload)
+        result = await self._send(incident, task_payload)
 
-        # Extract severity from response
-        severity_str = _extract_field(result, "severity", "P3-Medium")
-        try:
-            incident.severity = Severity(severity_str)
-        except ValueError:
-            incident.severity = Severity.P3_MEDIUM
+        triage = parse_response("triage", result)
+        incident.severity = Severity(triage.severity)
 
         incident.add_event(
             IncidentPhase.TRIAGE,
             "Triage Agent",
             f"Classified as {incident.severity.value}",
             result=result,
+            parsed=triage.to_dict(),
         )
 
         console.print(f"  [yellow]Severity: {incident.severity.value}[/yellow]")
         return result
 
     async def _run_diagnosis(
-        self, incident: Incident, triage_result: dict[str, Any]
+        self,
+        incident: Incident,
+        triage_result: dict[str, Any],
+        similar: Sequence[SimilarIncident] = (),
     ) -> dict[str, Any]:
         """Route triage summary to Diagnosis Agent for root cause analysis."""
         console.print("[cyan]→ Diagnosis Agent: correlating logs/metrics...[/cyan]")
 
+        hints = ""
+        if similar:
+            past = json.dumps([m.to_dict() for m in similar], default=str)
+            hints = f"Similar past incidents: {past}\n"
+
         task_payload = {
             "jsonrpc": "2.0",
             "method": "tasks/send",
@@ -238,7 +486,9 @@ class IncidentOrchestrator:
                             "text": (
                                 f"Incident {incident.id} ({incident.severity.value if incident.severity else 'unknown'}).\n"
                                 f"Triage summary: {json.dumps(triage_result, default=str)}\n"
+                                f"{hints}"
                                 "Run ES|QL queries to identify root cause."
+                                f"{schema_instructions('diagnosis')}"
                             ),
                         }
                     ],
@@ -246,25 +496,90 @@ class IncidentOrchestrator:
             },
         }
 
-        result = await self.client.send_a2a_task(task_payload)
-        incident.root_cause = _extract_field(result, "root_cause", "Under investigation")
+        result = await self._send(incident, task_payload)
+        diagnosis = parse_response("diagnosis", result)
+        incident.root_cause = diagnosis.root_cause
 
         incident.add_event(
             IncidentPhase.DIAGNOSIS,
             "Diagnosis Agent",
             f"Root cause: {incident.root_cause}",
             result=result,
+            parsed=diagnosis.to_dict(),
         )
 
         console.print(f"  [magenta]Root cause: {incident.root_cause}[/magenta]")
         return result
 
-    async def _run_remediation(
+    async def _remediate(
         self, incident: Incident, diagnosis_result: dict[str, Any]
     ) -> dict[str, Any]:
-        """Route diagnosis to Remediation Agent for automated fix."""
+        """Remediation phase: a trusted cached action, else the Remediation Agent."""
+        cache = self.remediation_cache
+        if cache is None:
+            result, _ = await self._run_remediation(incident, diagnosis_result)
+            return result
+
+        key = cache.key(incident.alert_payload, incident.root_cause)
+        cached = cache.lookup(key)
+        if cached is not None and cache.trusted(cached):
+            result = await self._run_cached_remediation(incident, cached)
+            if result is not None:
+                if self.policy:
+                    self.policy.stats.saved[IncidentPhase.REMEDIATION] += 1
+                return result
+            cache.discard(key)
+            cached = None
+
+        result, remediation = await self._run_remediation(incident, diagnosis_result, cached)
+        cache.record(key, remediation.action, remediation.status)
+        return result
+
+    async def _run_cached_remediation(
+        self, incident: Incident, cached: CachedRemediation
+    ) -> dict[str, Any] | None:
+        """Run a cached known-good action's tool directly; None if it failed."""
+        console.print(f"[cyan]→ Remediation cache: {cached.action}...[/cyan]")
+        params = {
+            "service_name": incident.alert_payload.get("service.name", ""),
+            "reason": f"{incident.id}: {incident.root_cause}",
+        }
+        try:
+            result = await self.client.execute_tool(cached.tool_id, params)
+        except Exception as exc:
+            logger.warning("Cached remediation %r failed: %s", cached.action, exc)
+            return None
+        cached.hits += 1
+        incident.remediation_action = cached.action
+        incident.add_event(
+            IncidentPhase.REMEDIATION,
+            "Remediation Cache",
+            f"Action: {cached.action} (cached, confidence {cached.confidence:.2f})",
+            result=result,
+            cached=cached.to_dict(),
+        )
+        console.print(f"  [green]Action: {incident.remediation_action} (cached)[/green]")
+        return result
+
+    async def _run_remediation(
+        self,
+        incident: Incident,
+        diagnosis_result: dict[str, Any],
+        proposal: CachedRemediation | None = None,
+    ) -> tuple[dict[str, Any], RemediationResult]:
+        """Route diagnosis to Remediation Agent for automated fix.
+
+        Returns the raw A2A result and its parsed form.
+        """
         console.print("[cyan]→ Remediation Agent: executing fix...[/cyan]")
 
+        hint = ""
+        if proposal is not None:
+            hint = (
+                f"Previously successful action for this failure: {proposal.action} "
+                f"(confidence {proposal.confidence:.2f}).\n"
+            )
+
         task_payload = {
             "jsonrpc": "2.0",
             "method": "tasks/send",
@@ -278,7 +593,9 @@ class IncidentOrchestrator:
                             "text": (
                                 f"Incident {incident.id}: root cause is '{incident.root_cause}'.\n"
                                 f"Diagnosis details: {json.dumps(diagnosis_result, default=str)}\n"
+                                f"{hint}"
                                 "Select and execute the appropriate remediation action."
+                                f"{schema_instructions('remediation')}"
                             ),
                         }
                     ],
@@ -286,18 +603,20 @@ class IncidentOrchestrator:
             },
         }
 
-        result = await self.client.send_a2a_task(task_payload)
-        incident.remediation_action = _extract_field(result, "action", "Manual review required")
+        result = await self._send(incident, task_payload)
+        remediation = parse_response("remediation", result)
+        incident.remediation_action = remediation.action
 
         incident.add_event(
             IncidentPhase.REMEDIATION,
             "Remediation Agent",
             f"Action: {incident.remediation_action}",
             result=result,
+            parsed=remediation.to_dict(),
         )
 
         console.print(f"  [green]Action: {incident.remediation_action}[/green]")
-        return result
+        return result, remediation
 
     async def _run_communication(
         self, incident: Incident, remediation_result: dict[str, Any]
@@ -327,6 +646,7 @@ class IncidentOrchestrator:
                                 f"Remediation: {incident.remediation_action}\n"
                                 f"Timeline:\n{timeline_summary}\n"
                                 "Create a status update and postmortem."
+                                f"{schema_instructions('communication')}"
                             ),
                         }
                     ],
@@ -334,42 +654,120 @@ class IncidentOrchestrator:
             },
         }
 
-        result = await self.client.send_a2a_task(task_payload)
-        incident.postmortem = _extract_field(result, "postmortem", "")
+        result = await self._send(incident, task_payload)
+        communication = parse_response("communication", result)
+        incident.postmortem = communication.postmortem
 
         incident.add_event(
             IncidentPhase.COMMUNICATION,
             "Communication Agent",
             "Incident report generated",
             result=result,
+            parsed=communication.to_dict(),
         )
 
         console.print("  [blue]Report generated ✓[/blue]")
         return result
 
+    async def _draft_communication(self, incident: Incident) -> CommunicationResult:
+        """Draft the status update and postmortem before remediation finishes.
+
+        Returns the parsed draft; nothing is recorded on the incident so the
+        timeline keeps its phase order.
+        """
+        console.print("[cyan]→ Communication Agent: drafting report...[/cyan]")
 
-def _extract_field(result: dict[str, Any], field: str, default: str = "") -> str:
-    """Best-effort extraction of a field from an A2A task result."""
-    # A2A responses may nest data differently; try common paths
-    if isinstance(result, dict):
-        # Direct field
-        if field in result:
-            return str(result[field])
-        # Nested in result
-        inner = result.get("result", result.get("data", {}))
-        if isinstance(inner, dict) and field in inner:
-            return str(inner[field])
-        # Search in message parts text
-        parts = (
-            result.get("result", {})
-            .get("message", {})
-            .get("parts", [])
+        timeline_summary = "\n".join(
+            f"  [{e.timestamp}] {e.agent}: {e.summary}" for e in incident.timeline
         )
-        for part in parts:
-            text = part.get("text", "")
-            if field.lower() in text.lower():
-                return text[:200]
-    return default
+        severity = incident.severity.value if incident.severity else "unknown"
+
+        task_payload = {
+            "jsonrpc": "2.0",
+            "method": "tasks/send",
+            "params": {
+                "id": f"{incident.id}-communication-draft",
+                "message": {
+                    "role": "user",
+                    "parts": [
+                        {
+                            "type": "text",
+                            "text": (
+                                f"Draft the incident report for {incident.id}:\n"
+                                f"Title: {incident.title}\n"
+                                f"Severity: {severity}\n"
+                                f"Root cause: {incident.root_cause}\n"
+                                "Remediation: in progress\n"
+                                f"Timeline:\n{timeline_summary}\n"
+                                "Create an initial status update and a draft postmortem; "
+                                "the remediation outcome will follow."
+                                f"{schema_instructions('communication')}"
+                            ),
+                        }
+                    ],
+                },
+            },
+        }
+
+        result = await self._send(incident, task_payload)
+        return parse_response("communication", result)
+
+    async def _update_communication(
+        self,
+        incident: Incident,
+        remediation_result: dict[str, Any],
+        draft: CommunicationResult,
+    ) -> dict[str, Any]:
+        """Finish the drafted report with the remediation outcome (pipeline mode)."""
+        console.print("[cyan]→ Communication Agent: updating report...[/cyan]")
+
+        incident.add_event(
+            IncidentPhase.COMMUNICATION,
+            "Communication Agent",
+            "Initial status update drafted",
+            parsed=draft.to_dict(),
+        )
+
+        task_payload = {
+            "jsonrpc": "2.0",
+            "method": "tasks/send",
+            "params": {
+                "id": f"{incident.id}-communication",
+                "message": {
+                    "role": "user",
+                    "parts": [
+                        {
+                            "type": "text",
+                            "text": (
+                                f"Update the incident report for {incident.id}: "
+                                f"remediation finished.\n"
+                                f"Remediation: {incident.remediation_action}\n"
+                                "Remediation details: "
+                                f"{json.dumps(remediation_result, default=str)}\n"
+                                f"Draft postmortem:\n{draft.postmortem}\n"
+                                "Return a short status update and the final postmortem."
+                                f"{schema_instructions('communication')}"
+                            ),
+                        }
+                    ],
+                },
+            },
+        }
+
+        result = await self._send(incident, task_payload)
+        communication = parse_response("communication", result)
+        incident.postmortem = communication.postmortem or draft.postmortem
+
+        incident.add_event(
+            IncidentPhase.COMMUNICATION,
+            "Communication Agent",
+            "Incident report generated",
+            result=result,
+            parsed=communication.to_dict(),
+        )
+
+        console.print("  [blue]Report generated ✓[/blue]")
+        return result
 
 
 async def demo_run(client: AgentBuilderClient, agent_ids: dict[str, str]) -> Incident:
@@ -0,0 +1,190 @@
+"""Cache of remediation decisions keyed by incident fingerprint.
+
+The key is ``(service, error type, root-cause class)``: the same failure
+on the same service maps to the same entry however the Diagnosis Agent
+worded the root cause.  Each entry carries a confidence that grows every
+time the Remediation Agent picks the same action again and resets when it
+picks a different one.
+
+A trusted entry (confidence ≥ ``min_confidence``) whose action is a
+known-good tool (``restart_service``) is run directly, with no Remediation
+Agent call.  Other entries, including rollbacks (their target version is
+the agent's call each time), are passed to the agent as a proposal.
+Entries expire after ``ttl`` seconds and are dropped for a service as
+soon as it is deployed (``invalidate``): a new release can change what
+the right fix is.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+# Actions safe to repeat without asking the agent, and the tool running each.
+# Each tool must need only ``service_name`` and ``reason``, the parameters the
+# orchestrator can fill in from the incident itself.
+KNOWN_GOOD_ACTIONS = {
+    "restart_service": "incident_cmd.restart_service",
+}
+# Agent-reported remediation statuses that count as a success.
+SUCCESS_STATUSES = frozenset(
+    {"success", "succeeded", "completed", "resolved", "done", "executed", "applied"}
+)
+# Confidence of a new entry: reported success, or no status at all.
+CONFIRMED_CONFIDENCE = 0.7
+UNCONFIRMED_CONFIDENCE = 0.5
+
+# Root-cause class → pattern over the lower-cased root cause.
+ROOT_CAUSE_CLASSES = {
+    "connection_pool": r"connection pool|pool exhaust|too many connections",
+    "database_connection": r"database|db connection|connection refused",
+    "memory": r"out of memory|\boom\b|memory (?:leak|pressure)|heap",
+    "cpu": r"\bcpu\b",
+    "disk": r"\bdisk\b|no space left",
+    "timeout": r"timeout|timed out|latency",
+    "deployment": r"deploy|release|rollout|version",
+    "dependency": r"upstream|downstream|dependency",
+}
+_CLASS_RES = [(name, re.compile(pattern)) for name, pattern in ROOT_CAUSE_CLASSES.items()]
+_ERROR_TYPE_RE = re.compile(r"\b[A-Z][A-Za-z0-9]*(?:Error|Exception|Timeout)\b")
+_WORD_RE = re.compile(r"[a-z]+")
+
+CacheKey = tuple[str, str, str]
+
+
+def root_cause_class(root_cause: str) -> str:
+    """Coarse class of a free-text root cause (its first words if unknown)."""
+    text = root_cause.lower()
+    for name, pattern in _CLASS_RES:
+        if pattern.search(text):
+            return name
+    return "_".join(_WORD_RE.findall(text)[:4]) or "unknown"
+
+
+def error_type(alert: dict[str, Any], root_cause: str) -> str:
+    """The alert's ``error.type``, else an exception name in the root cause."""
+    if alert.get("error.type"):
+        return str(alert["error.type"])
+    match = _ERROR_TYPE_RE.search(root_cause)
+    return match.group(0) if match else str(alert.get("alert.name", ""))
+
+
+def action_tool(action: str) -> str | None:
+    """The tool running ``action`` if it is a known-good action."""
+    name = re.sub(r"\W+", "_", action.strip().lower())
+    for known, tool_id in KNOWN_GOOD_ACTIONS.items():
+        if name == known or name.startswith(known + "_"):
+            return tool_id
+    return None
+
+
+@dataclass
+class CachedRemediation:
+    """A remediation decision and how far it can be trusted."""
+
+    action: str
+    confidence: float
+    expires_at: float
+    hits: int = 0
+    confirmations: int = 1
+
+    @property
+    def tool_id(self) -> str | None:
+        return action_tool(self.action)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "action": self.action,
+            "confidence": round(self.confidence, 3),
+            "hits": self.hits,
+            "confirmations": self.confirmations,
+        }
+
+
+class RemediationCache:
+    """Remediation decisions by ``(service, error type, root-cause class)``.
+
+    Args:
+        ttl: Seconds an entry stays valid after it was last confirmed.
+        min_confidence: Confidence at which a known-good action runs
+            without the Remediation Agent.
+        direct: Whether trusted actions may run without the agent at all.
+            Off when several nodes each keep a cache: a deployment
+            invalidates only the cache of the node that hears of it.
+        clock: Time source (seconds).
+    """
+
+    def __init__(
+        self,
+        ttl: float = 24 * 3600,
+        min_confidence: float = 0.85,
+        direct: bool = True,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl = ttl
+        self.min_confidence = min_confidence
+        self.direct = direct
+        self.clock = clock
+        self.entries: dict[CacheKey, CachedRemediation] = {}
+        self.stats: Counter = Counter()
+
+    def key(self, alert: dict[str, Any], root_cause: str) -> CacheKey:
+        return (
+            str(alert.get("service.name", "")),
+            error_type(alert, root_cause),
+            root_cause_class(root_cause),
+        )
+
+    def lookup(self, key: CacheKey) -> CachedRemediation | None:
+        """The live entry for ``key``; expired entries are dropped."""
+        entry = self.entries.get(key)
+        if entry is not None and entry.expires_at <= self.clock():
+            del self.entries[key]
+            self.stats["expired"] += 1
+            entry = None
+        self.stats["hits" if entry else "misses"] += 1
+        return entry
+
+    def trusted(self, entry: CachedRemediation) -> bool:
+        """Whether ``entry`` may run without asking the Remediation Agent."""
+        return self.direct and entry.tool_id is not None and entry.confidence >= self.min_confidence
+
+    def record(self, key: CacheKey, action: str, status: str = "") -> CachedRemediation | None:
+        """Remember the agent's ``action`` for ``key``.
+
+        The same action again raises the confidence halfway to 1; another
+        action replaces the entry.  Reported failures are not cached (and
+        drop an entry with the same action).
+        """
+        status = status.strip().lower()
+        entry = self.entries.get(key)
+        if not action or (status and status not in SUCCESS_STATUSES):
+            if entry is not None and entry.action == action:
+                self.discard(key)
+            return None
+        expires_at = self.clock() + self.ttl
+        if entry is not None and entry.action == action:
+            entry.confidence += (1 - entry.confidence) / 2
+            entry.confirmations += 1
+            entry.expires_at = expires_at
+            return entry
+        confidence = CONFIRMED_CONFIDENCE if status else UNCONFIRMED_CONFIDENCE
+        entry = CachedRemediation(action, confidence, expires_at)
+        self.entries[key] = entry
+        return entry
+
+    def discard(self, key: CacheKey) -> None:
+        if self.entries.pop(key, None) is not None:
+            self.stats["discarded"] += 1
+
+    def invalidate(self, service: str) -> int:
+        """Drop every entry of ``service`` (it was deployed); returns how many."""
+        stale = [key for key in self.entries if key[0] == service]
+        for key in stale:
+            del self.entries[key]
+        self.stats["invalidated"] += len(stale)
+        return len(stale)
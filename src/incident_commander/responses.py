@@ -0,0 +1,312 @@
+"""Structured response contract for the Incident Commander agents.
+
+Each agent is asked to answer with a JSON artifact matching its role's schema.
+The A2A result is parsed once into a typed object.  When an agent ignores the
+contract and answers in prose, a compiled fallback extractor recovers the
+fields in a single pass over the message text.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any
+
+# ── Typed results ──────────────────────────────────────────────────────
+
+
+@dataclass
+class TriageResult:
+    """Structured output of the Triage Agent."""
+
+    severity: str = "P3-Medium"
+    affected_services: list[str] = field(default_factory=list)
+    summary: str = ""
+    structured: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class DiagnosisResult:
+    """Structured output of the Diagnosis Agent."""
+
+    root_cause: str = "Under investigation"
+    confidence: float | None = None
+    evidence: list[str] = field(default_factory=list)
+    structured: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class RemediationResult:
+    """Structured output of the Remediation Agent."""
+
+    action: str = "Manual review required"
+    target_service: str = ""
+    status: str = ""
+    structured: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class CommunicationResult:
+    """Structured output of the Communication Agent."""
+
+    status_update: str = ""
+    postmortem: str = ""
+    structured: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+AgentResult = TriageResult | DiagnosisResult | RemediationResult | CommunicationResult
+
+RESULT_TYPES: dict[str, type] = {
+    "triage": TriageResult,
+    "diagnosis": DiagnosisResult,
+    "remediation": RemediationResult,
+    "communication": CommunicationResult,
+}
+
+# ── JSON artifact schemas (sent to the agents) ─────────────────────────
+
+RESPONSE_SCHEMAS: dict[str, dict[str, Any]] = {
+    "triage": {
+        "type": "object",
+        "required": ["severity", "affected_services"],
+        "properties": {
+            "severity": {"enum": ["P1-Critical", "P2-High", "P3-Medium", "P4-Low"]},
+            "affected_services": {"type": "array", "items": {"type": "string"}},
+            "summary": {"type": "string"},
+        },
+    },
+    "diagnosis": {
+        "type": "object",
+        "required": ["root_cause"],
+        "properties": {
+            "root_cause": {"type": "string"},
+            "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+            "evidence": {"type": "array", "items": {"type": "string"}},
+        },
+    },
+    "remediation": {
+        "type": "object",
+        "required": ["action"],
+        "properties": {
+            "action": {"type": "string"},
+            "target_service": {"type": "string"},
+            "status": {"type": "string"},
+        },
+    },
+    "communication": {
+        "type": "object",
+        "required": ["postmortem"],
+        "properties": {
+            "status_update": {"type": "string"},
+            "postmortem": {"type": "string"},
+        },
+    },
+}
+
+
+def schema_instructions(role: str) -> str:
+    """Prompt suffix asking an agent to answer with its JSON artifact."""
+    schema = json.dumps(RESPONSE_SCHEMAS[role], separators=(",", ":"))
+    return (
+        f"\nRespond with a single JSON object (no prose around it) matching this schema:\n{schema}"
+    )
+
+
+# ── Severity normalisation ─────────────────────────────────────────────
+
+_SEVERITY_BY_RANK = {"1": "P1-Critical", "2": "P2-High", "3": "P3-Medium", "4": "P4-Low"}
+_SEVERITY_BY_WORD = {"critical": "1", "high": "2", "medium": "3", "low": "4"}
+_SEVERITY_RE = re.compile(r"\bP([1-4])\b|\b(critical|high|medium|low)\b", re.IGNORECASE)
+# In free text a bare "high"/"low" is usually prose ("high error rate", "low
+# latency"): only a P-level or a word tied to "severity"/"priority" counts.
+_TEXT_SEVERITY_RE = re.compile(
+    r"\bP[1-4]\b"
+    r"|\b(?:severity|priority)\s*(?:[:=-]|\bis\b)?\s*(?:critical|high|medium|low)\b"
+    r"|\b(?:critical|high|medium|low)[\s-](?:severity|priority)\b",
+    re.IGNORECASE,
+)
+
+
+def normalize_severity(value: Any, default: str = "P3-Medium") -> str:
+    """Map "P1", "p2-high", "critical", ... onto the canonical severity labels."""
+    match = _SEVERITY_RE.search(str(value))
+    if not match:
+        return default
+    rank = match.group(1) or _SEVERITY_BY_WORD[match.group(2).lower()]
+    return _SEVERITY_BY_RANK[rank]
+
+
+# ── Fallback extractor ─────────────────────────────────────────────────
+
+_FIELD_LABELS: dict[str, dict[str, str]] = {
+    "triage": {
+        "severity": r"severity|priority",
+        "affected_services": r"affected[ _]services?|services?",
+        "summary": r"summary|impact",
+    },
+    "diagnosis": {
+        "root_cause": r"root[ _-]?cause",
+        "confidence": r"confidence",
+    },
+    "remediation": {
+        "action": r"action(?:[ _]taken)?|remediation",
+        "target_service": r"target[ _]service|service",
+        "status": r"status",
+    },
+    "communication": {
+        "status_update": r"status[ _]update",
+        "postmortem": r"post[ -]?mortem",
+    },
+}
+
+
+def _compile_extractor(labels: dict[str, str]) -> re.Pattern[str]:
+    """One alternation per role so a single ``finditer`` pass finds every field."""
+    alternatives = [
+        rf"^[\s#>*_-]*(?:{label})[*_]*\s*[:=\-]\s*(?P<{name}>.+?)\s*$"
+        for name, label in labels.items()
+    ]
+    return re.compile("|".join(alternatives), re.IGNORECASE | re.MULTILINE)
+
+
+_EXTRACTORS: dict[str, re.Pattern[str]] = {
+    role: _compile_extractor(labels) for role, labels in _FIELD_LABELS.items()
+}
+
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+
+def _extract_text_fields(role: str, text: str) -> dict[str, str]:
+    """Single-pass scan of free text for ``label: value`` lines."""
+    found: dict[str, str] = {}
+    for match in _EXTRACTORS[role].finditer(text):
+        name = match.lastgroup
+        if name and name not in found:
+            found[name] = match.group(name).strip(" \t*_`\"'")
+    return found
+
+
+# ── Response traversal ─────────────────────────────────────────────────
+
+
+def _containers(result: Any) -> list[dict[str, Any]]:
+    """Dicts that may carry the structured fields, outermost first."""
+    out: list[dict[str, Any]] = []
+    if not isinstance(result, dict):
+        return out
+    out.append(result)
+    for key in ("result", "data"):
+        inner = result.get(key)
+        if isinstance(inner, dict):
+            out.append(inner)
+    return out
+
+
+def _parts(containers: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Message and artifact parts from an A2A task (or bare message)."""
+    parts: list[dict[str, Any]] = []
+    for c in containers:
+        status = c.get("status")
+        messages = [c.get("message"), status.get("message") if isinstance(status, dict) else None]
+        for message in messages:
+            if isinstance(message, dict):
+                parts.extend(p for p in message.get("parts", []) if isinstance(p, dict))
+        for artifact in c.get("artifacts") or []:
+            if isinstance(artifact, dict):
+                parts.extend(p for p in artifact.get("parts", []) if isinstance(p, dict))
+    return parts
+
+
+def _json_payloads(parts: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Structured payloads from ``data`` parts and JSON-bearing ``text`` parts."""
+    payloads: list[dict[str, Any]] = []
+    for part in parts:
+        data = part.get("data")
+        if isinstance(data, dict):
+            payloads.append(data)
+            continue
+        text = part.get("text")
+        if not isinstance(text, str) or "{" not in text:
+            continue
+        fenced = _JSON_FENCE_RE.search(text)
+        candidate = fenced.group(1) if fenced else text[text.find("{") : text.rfind("}") + 1]
+        try:
+            parsed = json.loads(candidate)
+        except ValueError:
+            continue
+        if isinstance(parsed, dict):
+            payloads.append(parsed)
+    return payloads
+
+
+def _carries_fields(candidate: dict[str, Any], known: set[str]) -> bool:
+    """True if ``candidate`` has a schema field (A2A's ``status`` object doesn't count)."""
+    return any(not isinstance(candidate[k], dict) for k in known & candidate.keys())
+
+
+def _coerce(result_type: type, values: dict[str, Any], structured: bool) -> AgentResult:
+    kwargs: dict[str, Any] = {"structured": structured}
+    for f in fields(result_type):
+        if f.name == "structured" or f.name not in values or values[f.name] in (None, ""):
+            continue
+        value = values[f.name]
+        if f.name in ("affected_services", "evidence"):
+            if isinstance(value, str):
+                value = [v.strip() for v in value.split(",") if v.strip()]
+            elif not isinstance(value, (list, tuple)):
+                value = [value]  # a lone service name, number or object
+            kwargs[f.name] = [str(v) for v in value]
+        elif f.name == "confidence":
+            try:
+                kwargs[f.name] = float(str(value).rstrip("%")) / (100 if "%" in str(value) else 1)
+            except ValueError:
+                continue
+        elif f.name == "severity":
+            kwargs[f.name] = normalize_severity(value)
+        else:
+            kwargs[f.name] = value if isinstance(value, str) else json.dumps(value)
+    return result_type(**kwargs)
+
+
+def parse_response(role: str, result: Any) -> AgentResult:
+    """Parse an A2A task result into the typed result for ``role``.
+
+    The first JSON artifact that carries any schema field wins.  Otherwise the
+    text parts are joined once and scanned by the role's compiled extractor.
+    Fields that cannot be recovered keep their dataclass defaults.
+    """
+    result_type = RESULT_TYPES[role]
+    known = {f.name for f in fields(result_type)} - {"structured"}
+
+    containers = _containers(result)
+    for candidate in containers:
+        if _carries_fields(candidate, known):
+            return _coerce(result_type, candidate, structured=True)
+
+    parts = _parts(containers)
+    for payload in _json_payloads(parts):
+        if _carries_fields(payload, known):
+            return _coerce(result_type, payload, structured=True)
+
+    text = "\n".join(p["text"] for p in parts if isinstance(p.get("text"), str))
+    values: dict[str, Any] = _extract_text_fields(role, text)
+    if role == "triage" and "severity" not in values:
+        match = _TEXT_SEVERITY_RE.search(text)
+        if match:
+            values["severity"] = match.group(0)
+    if role == "communication" and "postmortem" not in values and text:
+        values["postmortem"] = text
+    return _coerce(result_type, values, structured=False)
@@ -0,0 +1,152 @@
+"""Routing policy: which agent phases an incident actually needs.
+
+``IncidentOrchestrator`` asks the policy twice per alert:
+
+- ``runbook(alert)`` before triage.  An alert whose fingerprint has a
+  known runbook skips triage and diagnosis and goes straight to
+  remediation with the runbook's severity, root cause and action.
+- ``skipped(severity)`` after triage.  By default a ``P4-Low`` incident
+  gets triage plus communication only.
+
+Every agent call a route leaves out is counted in ``RoutingStats``.
+
+A policy can be loaded from JSON (``RoutingPolicy.load``)::
+
+    {
+      "fingerprint_fields": ["alert.name", "service.name"],
+      "skip": {"P4-Low": ["diagnosis", "remediation"]},
+      "runbooks": {
+        "<fingerprint>": {"severity": "P2-High",
+                          "root_cause": "...", "action": "restart_service"}
+      }
+    }
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .orchestrator import IncidentPhase, Severity
+
+# Phases a route may leave out (every agent call); alert intake always runs.
+AGENT_PHASES = (
+    IncidentPhase.TRIAGE,
+    IncidentPhase.DIAGNOSIS,
+    IncidentPhase.REMEDIATION,
+    IncidentPhase.COMMUNICATION,
+)
+DEFAULT_FINGERPRINT_FIELDS = ("alert.name", "service.name")
+
+
+def _default_skip() -> dict[Severity, frozenset[IncidentPhase]]:
+    return {Severity.P4_LOW: frozenset({IncidentPhase.DIAGNOSIS, IncidentPhase.REMEDIATION})}
+
+
+def fingerprint(alert: dict[str, Any], fields: tuple[str, ...] = DEFAULT_FINGERPRINT_FIELDS) -> str:
+    """Stable identity of an alert: its own ``fingerprint`` or a hash of ``fields``."""
+    if alert.get("fingerprint"):
+        return str(alert["fingerprint"])
+    key = json.dumps([alert.get(name) for name in fields], default=str)
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+@dataclass
+class Runbook:
+    """Known resolution for a recurring alert."""
+
+    action: str
+    root_cause: str = ""
+    severity: Severity = Severity.P3_MEDIUM
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Runbook:
+        return cls(
+            action=data["action"],
+            root_cause=data.get("root_cause", ""),
+            severity=Severity(data.get("severity", Severity.P3_MEDIUM.value)),
+        )
+
+
+@dataclass
+class RoutingStats:
+    """Routed incidents and the agent calls their routes left out."""
+
+    routed: int = 0
+    fast_path: int = 0
+    saved: Counter = field(default_factory=Counter)
+
+    @property
+    def saved_calls(self) -> int:
+        return sum(self.saved.values())
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "routed": self.routed,
+            "fast_path": self.fast_path,
+            "saved_calls": self.saved_calls,
+            **{f"saved_{phase.value}": count for phase, count in self.saved.items()},
+        }
+
+
+class RoutingPolicy:
+    """Severity- and fingerprint-based phase routing.
+
+    Args:
+        skip: Phases skipped per triage severity (default: diagnosis and
+            remediation for ``P4-Low``).
+        runbooks: Fingerprint → runbook for the remediation fast path.
+        fingerprint_fields: Alert fields hashed into a fingerprint when the
+            alert carries no ``fingerprint`` of its own.
+    """
+
+    def __init__(
+        self,
+        skip: dict[Severity, frozenset[IncidentPhase]] | None = None,
+        runbooks: dict[str, Runbook] | None = None,
+        fingerprint_fields: tuple[str, ...] = DEFAULT_FINGERPRINT_FIELDS,
+    ) -> None:
+        self.skip = _default_skip() if skip is None else skip
+        self.runbooks = runbooks or {}
+        self.fingerprint_fields = tuple(fingerprint_fields)
+        self.stats = RoutingStats()
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> RoutingPolicy:
+        skip = None
+        if "skip" in data:
+            skip = {
+                Severity(severity): frozenset(IncidentPhase(phase) for phase in phases)
+                for severity, phases in data["skip"].items()
+            }
+        return cls(
+            skip=skip,
+            runbooks={fp: Runbook.from_dict(rb) for fp, rb in data.get("runbooks", {}).items()},
+            fingerprint_fields=tuple(data.get("fingerprint_fields", DEFAULT_FINGERPRINT_FIELDS)),
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> RoutingPolicy:
+        """Read a policy from a JSON file."""
+        return cls.from_dict(json.loads(Path(path).read_text()))
+
+    def fingerprint(self, alert: dict[str, Any]) -> str:
+        return fingerprint(alert, self.fingerprint_fields)
+
+    def runbook(self, alert: dict[str, Any]) -> Runbook | None:
+        """The runbook for ``alert``'s fingerprint, if one is known."""
+        return self.runbooks.get(self.fingerprint(alert))
+
+    def skipped(self, severity: Severity | None) -> frozenset[IncidentPhase]:
+        """Phases skipped for a triaged incident of ``severity``."""
+        return self.skip.get(severity, frozenset()) if severity else frozenset()
+
+    def record(self, skipped: frozenset[IncidentPhase], fast_path: bool = False) -> None:
+        """Count one routed incident and the agent calls it didn't make."""
+        self.stats.routed += 1
+        self.stats.fast_path += fast_path
+        self.stats.saved.update(phase for phase in AGENT_PHASES if phase in skipped)
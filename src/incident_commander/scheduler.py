@@ -0,0 +1,197 @@
+"""Severity-aware scheduling of agent calls.
+
+Incidents are cheap coroutines; the agent (LLM) calls they make are the
+scarce resource.  ``SeverityScheduler`` admits at most ``capacity``
+calls at a time and queues the rest by severity, so a flood of P4
+alerts cannot hold up the calls of a P1:
+
+- Priority: the queued call with the most severe incident starts next;
+  a P1 call overtakes every lower-severity call still waiting (those are
+  counted as preempted).  Calls already running are never interrupted.
+- Reservations: ``reservations[s]`` slots are held back for calls of
+  severity ``s`` or more severe: with one slot reserved for P1, a P4
+  call cannot take the last free slot while no P1 call is running.
+- Aging: every ``aging_seconds`` of waiting raises a call by one
+  severity level, so low-severity work eventually runs even under a
+  steady stream of high-severity calls.
+
+Wait time, calls and preemptions are kept per severity for ``/metrics``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from .responses import normalize_severity
+
+SEVERITIES = ("P1-Critical", "P2-High", "P3-Medium", "P4-Low")
+RANKS = {severity: rank for rank, severity in enumerate(SEVERITIES)}
+DEFAULT_RESERVATIONS = {"P1-Critical": 1}
+
+
+def alert_severity(alert: dict[str, Any], default: str = "P3-Medium") -> str:
+    """Severity an alert declares itself (``alert.severity``), before triage."""
+    return normalize_severity(alert.get("alert.severity", alert.get("severity", "")), default)
+
+
+def parse_reservations(text: str) -> dict[str, int]:
+    """``"P1=1,P2=1"`` → ``{"P1-Critical": 1, "P2-High": 1}``."""
+    reservations: dict[str, int] = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        key, _, count = item.partition("=")
+        severity = normalize_severity(key, default="")
+        if not severity or not count.strip().isdigit():
+            raise ValueError(f"bad reservation {item!r}; expected e.g. 'P1=1'")
+        reservations[severity] = int(count)
+    return reservations
+
+
+@dataclass(eq=False)
+class _Waiter:
+    severity: str
+    rank: int
+    seq: int
+    enqueued: float
+    future: asyncio.Future = field(repr=False)
+
+
+class SeverityScheduler:
+    """Admits agent calls by severity, with reservations and aging.
+
+    Args:
+        capacity: Agent calls running at once.
+        reservations: Severity → slots only calls of that severity or a
+            more severe one may use (default: one slot for P1).  Running
+            calls of a severity use up its reservation first.
+        aging_seconds: Waiting this long raises a call by one severity
+            level; ``0`` disables aging.
+        clock: Monotonic time in seconds.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 4,
+        reservations: dict[str, int] | None = None,
+        aging_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        reservations = DEFAULT_RESERVATIONS if reservations is None else reservations
+        unknown = set(reservations) - set(RANKS)
+        if unknown:
+            raise ValueError(f"unknown severities in reservations: {sorted(unknown)}")
+        if sum(reservations.values()) >= capacity:
+            raise ValueError("reservations must leave at least one unreserved slot")
+        self.capacity = capacity
+        self.reservations = {s: reservations.get(s, 0) for s in SEVERITIES}
+        self.aging_seconds = aging_seconds
+        self.clock = clock
+        self.running: Counter = Counter()
+        self.calls: Counter = Counter()
+        self.preempted: Counter = Counter()
+        self.wait_seconds: dict[str, float] = dict.fromkeys(SEVERITIES, 0.0)
+        self.max_wait_seconds: dict[str, float] = dict.fromkeys(SEVERITIES, 0.0)
+        self._waiting: list[_Waiter] = []
+        self._seq = 0
+
+    @property
+    def queued(self) -> Counter:
+        """Calls waiting for a slot, per severity."""
+        return Counter(w.severity for w in self._waiting)
+
+    @asynccontextmanager
+    async def slot(self, severity: str | None = None) -> AsyncIterator[None]:
+        """Hold one slot for an agent call of ``severity`` (``None``: P3)."""
+        severity = normalize_severity(severity) if severity else "P3-Medium"
+        await self._acquire(severity)
+        try:
+            yield
+        finally:
+            self._release(severity)
+
+    async def _acquire(self, severity: str) -> None:
+        self._seq += 1
+        waiter = _Waiter(
+            severity,
+            RANKS[severity],
+            self._seq,
+            self.clock(),
+            asyncio.get_running_loop().create_future(),
+        )
+        self._waiting.append(waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release(severity)  # granted, but the caller is gone
+            else:
+                if waiter in self._waiting:  # a dispatch may have dropped it already
+                    self._waiting.remove(waiter)
+                self._dispatch()
+            raise
+
+    def _release(self, severity: str) -> None:
+        self.running[severity] -= 1
+        self._dispatch()
+
+    def _effective_rank(self, waiter: _Waiter, now: float) -> int:
+        if self.aging_seconds <= 0:
+            return waiter.rank
+        return max(0, waiter.rank - int((now - waiter.enqueued) / self.aging_seconds))
+
+    def _free_for(self, rank: int) -> int:
+        """Slots a call of ``rank`` may take: capacity minus unused reservations above it.
+
+        Reservations are checked per level, so surplus calls of one
+        severity cannot use up the reservation of a more severe one.
+        """
+        held = reserved = running = 0
+        for severity in SEVERITIES[:rank]:
+            reserved += self.reservations[severity]
+            running += self.running[severity]
+            held = max(held, reserved - running)
+        return self.capacity - self.running.total() - held
+
+    def _dispatch(self) -> None:
+        now = self.clock()
+        # Waiters cancelled before being granted leave on their own; skip them.
+        self._waiting = [w for w in self._waiting if not w.future.done()]
+        while self._waiting:
+            ranked = {id(w): self._effective_rank(w, now) for w in self._waiting}
+            head = min(self._waiting, key=lambda w: (ranked[id(w)], w.seq))
+            # Less severe calls face at least the head's reservations: stop here.
+            if self._free_for(ranked[id(head)]) <= 0:
+                return
+            self._waiting.remove(head)
+            for waiter in self._waiting:
+                if waiter.seq < head.seq:
+                    self.preempted[waiter.severity] += 1
+            waited = now - head.enqueued
+            self.running[head.severity] += 1
+            self.calls[head.severity] += 1
+            self.wait_seconds[head.severity] += waited
+            self.max_wait_seconds[head.severity] = max(self.max_wait_seconds[head.severity], waited)
+            head.future.set_result(None)
+
+    def prometheus(self) -> str:
+        """Per-severity scheduler metrics in Prometheus text format."""
+        queued = self.queued
+        families = [
+            ("incident_scheduler_wait_seconds_total", "counter", self.wait_seconds),
+            ("incident_scheduler_wait_seconds_max", "gauge", self.max_wait_seconds),
+            ("incident_scheduler_calls_total", "counter", self.calls),
+            ("incident_scheduler_preempted_total", "counter", self.preempted),
+            ("incident_scheduler_queued", "gauge", queued),
+            ("incident_scheduler_running", "gauge", self.running),
+        ]
+        out = []
+        for name, kind, values in families:
+            out.append(f"# TYPE {name} {kind}")
+            out += [f'{name}{{severity="{s}"}} {round(values.get(s, 0), 6)}' for s in SEVERITIES]
+        return "\n".join(out) + "\n"
@@ -0,0 +1,286 @@
+"""Multi-process ingest pipeline: parse/serialise in workers, send async.
+
+A single process spends most of an ingest run parsing JSON and encoding
+NDJSON under the GIL.  The pipeline splits that work across cores:
+
+1. ``split_ranges`` cuts the JSONL file into newline-aligned byte ranges.
+2. Each worker process parses a range, applies the optional ``enrich``
+   function and encodes the documents into ready-to-send ``_bulk`` bodies
+   (optionally gzipped).  Only those byte strings travel back over the
+   pool's pipe; documents are never pickled.
+3. An asyncio loop in the parent feeds the bodies through a bounded queue
+   to ``senders`` concurrent HTTP connections.
+
+Throughput scales with worker count until the senders, the network or the
+cluster saturate; ``PipelineStats`` shows which side is waiting.  Inputs
+that can't be split by byte range (``.json`` arrays, compressed files) are
+encoded in the parent and still benefit from concurrent senders.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import multiprocessing
+import os
+import threading
+import time
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from .bulk_retry import REJECTED_TYPE, DeadLetter, backoff, classify_items, item_result
+from .data_loader import LoadStats, load_documents, map_jsonl_ranges
+from .decompression import compression_of, stripped_suffix
+
+Enricher = Callable[[dict[str, Any]], dict[str, Any] | None]
+
+
+@dataclass
+class BulkBody:
+    """One encoded ``_bulk`` request."""
+
+    body: bytes
+    documents: int
+    raw_bytes: int
+    gzipped: bool = False
+
+    def pairs(self) -> list[tuple[bytes, bytes]]:
+        """The ``(action, source)`` line pairs of the body."""
+        body = zlib.decompress(self.body, 31) if self.gzipped else self.body
+        lines = body.splitlines()
+        return list(zip(lines[::2], lines[1::2]))
+
+
+@dataclass
+class PipelineStats:
+    """Counters for one pipeline run."""
+
+    documents: int = 0
+    bodies: int = 0
+    raw_bytes: int = 0
+    sent_bytes: int = 0
+    errors: int = 0  # documents that failed permanently
+    retried: int = 0  # rejected (429) documents sent again
+    seconds: float = 0.0
+    sender_idle: float = 0.0  # time senders waited for encoded bodies
+
+    @property
+    def docs_per_s(self) -> float:
+        return self.documents / self.seconds if self.seconds else 0.0
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.raw_bytes / 1_000_000 / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.documents} docs in {self.bodies} bulk requests, "
+            f"{self.raw_bytes / 1_000_000:.1f} MB ({self.sent_bytes / 1_000_000:.1f} MB sent) "
+            f"in {self.seconds:.2f}s: {self.docs_per_s:,.0f} docs/s, {self.mb_per_s:.1f} MB/s"
+        )
+
+
+@dataclass(frozen=True)
+class BulkEncoder:
+    """Encodes documents into ``_bulk`` bodies; picklable for worker processes.
+
+    Args:
+        index: Target index (or data stream, with ``op_type="create"``).
+        id_field: Optional document field used as ``_id``.
+        max_docs: Maximum documents per body.
+        max_bytes: Body size (uncompressed) after which a new body starts.
+        gzip_level: gzip level for the bodies; 0 sends them uncompressed.
+        enrich: Module-level function applied to each document; returning
+            ``None`` drops the document.
+        op_type: ``index`` or ``create``.
+    """
+
+    index: str
+    id_field: str | None = None
+    max_docs: int = 5000
+    max_bytes: int = 5 * 1024 * 1024
+    gzip_level: int = 0
+    enrich: Enricher | None = None
+    op_type: str = "index"
+
+    def _action(self, doc: dict[str, Any]) -> bytes:
+        meta: dict[str, Any] = {"_index": self.index}
+        if self.id_field and self.id_field in doc:
+            meta["_id"] = doc[self.id_field]
+        return json.dumps({self.op_type: meta}, separators=(",", ":")).encode()
+
+    def _finish(self, lines: list[bytes], count: int, size: int) -> BulkBody:
+        body = b"\n".join(lines) + b"\n"
+        if self.gzip_level > 0:
+            compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+            return BulkBody(compressor.compress(body) + compressor.flush(), count, size, True)
+        return BulkBody(body, count, size)
+
+    def rebuild(self, pairs: list[tuple[bytes, bytes]]) -> BulkBody:
+        """A new body from ``(action, source)`` pairs of earlier bodies."""
+        lines = [line for pair in pairs for line in pair]
+        return self._finish(lines, len(pairs), sum(len(a) + len(b) + 2 for a, b in pairs))
+
+    def encode(self, docs: Iterable[dict[str, Any]]) -> Iterator[BulkBody]:
+        lines: list[bytes] = []
+        count = size = 0
+        dumps = json.dumps
+        for doc in docs:
+            if self.enrich is not None:
+                doc = self.enrich(doc)
+                if doc is None:
+                    continue
+            action = self._action(doc)
+            source = dumps(doc, separators=(",", ":")).encode()
+            lines += (action, source)
+            count += 1
+            size += len(action) + len(source) + 2
+            if count >= self.max_docs or size >= self.max_bytes:
+                yield self._finish(lines, count, size)
+                lines, count, size = [], 0, 0
+        if lines:
+            yield self._finish(lines, count, size)
+
+    def __call__(self, docs: list[dict[str, Any]]) -> list[BulkBody]:
+        return list(self.encode(docs))
+
+
+def _splittable(path: Path) -> bool:
+    return compression_of(path) is None and stripped_suffix(path) in (".jsonl", ".ndjson")
+
+
+def encoded_bodies(
+    path: Path,
+    encoder: BulkEncoder,
+    workers: int | None = None,
+    range_size: int = 8 * 1024 * 1024,
+    stats: LoadStats | None = None,
+) -> Iterator[BulkBody]:
+    """Yield the ``_bulk`` bodies for ``path``, encoded in worker processes.
+
+    Workers come from a ``forkserver`` context: this runs on a thread next
+    to the sender event loop, and forking a threaded process is unsafe.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and _splittable(path):
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        for bodies in map_jsonl_ranges(path, encoder, workers, range_size, stats, context):
+            yield from bodies
+    else:
+        yield from encoder.encode(load_documents(path, stats=stats))
+
+
+def _dead_letter(writer: DeadLetter, action: bytes, source: bytes, result: dict[str, Any]) -> None:
+    meta = item_result(json.loads(action))
+    writer.write(meta.get("_index"), json.loads(source), result, meta.get("_id"))
+
+
+async def run_pipeline(
+    path: Path,
+    encoder: BulkEncoder,
+    es_url: str,
+    headers: dict[str, str] | None = None,
+    workers: int | None = None,
+    senders: int = 4,
+    range_size: int = 8 * 1024 * 1024,
+    http: httpx.AsyncClient | None = None,
+    max_retries: int = 5,
+    initial_backoff: float = 0.5,
+    dead_letter: DeadLetter | None = None,
+) -> PipelineStats:
+    """Ingest ``path`` with worker-process encoding and ``senders`` HTTP streams.
+
+    Items rejected with 429 are re-sent (just those, re-encoded into a new
+    body) up to ``max_retries`` times with backoff; other item failures, and
+    rejections that outlast the retries, go to ``dead_letter``.
+    """
+    stats = PipelineStats()
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[BulkBody | None] = asyncio.Queue(maxsize=senders * 2)
+    own_http = http is None
+    http = http or httpx.AsyncClient(timeout=120.0, limits=httpx.Limits(max_connections=senders))
+    url = f"{es_url.rstrip('/')}/_bulk"
+    base_headers = {**(headers or {}), "Content-Type": "application/x-ndjson"}
+
+    aborted = threading.Event()
+
+    def produce() -> None:
+        try:
+            for body in encoded_bodies(path, encoder, workers, range_size):
+                if aborted.is_set():
+                    return
+                asyncio.run_coroutine_threadsafe(queue.put(body), loop).result()
+        finally:
+            if not aborted.is_set():
+                for _ in range(senders):
+                    asyncio.run_coroutine_threadsafe(queue.put(None), loop).result()
+
+    async def send() -> None:
+        while True:
+            waited = time.perf_counter()
+            item = await queue.get()
+            stats.sender_idle += time.perf_counter() - waited
+            if item is None:
+                return
+            stats.documents += item.documents
+            stats.raw_bytes += item.raw_bytes
+            await send_body(item)
+
+    async def send_body(body: BulkBody) -> None:
+        for attempt in range(max_retries + 1):
+            request_headers = dict(base_headers)
+            if body.gzipped:
+                request_headers["Content-Encoding"] = "gzip"
+            resp = await http.post(url, content=body.body, headers=request_headers)
+            stats.bodies += 1
+            stats.sent_bytes += len(body.body)
+            if resp.status_code == 429:
+                # The whole request was rejected: every item is retryable.
+                items = [{"index": {"status": 429, "error": {"type": REJECTED_TYPE}}}]
+                items *= body.documents
+            else:
+                resp.raise_for_status()
+                items = resp.json()["items"]
+            _, retry, failed = classify_items(items)
+            if attempt == max_retries:
+                failed += [(p, item_result(items[p])) for p in retry]
+                retry = []
+            if failed:
+                stats.errors += len(failed)
+                if dead_letter is not None:
+                    pairs = body.pairs()
+                    for position, result in failed:
+                        _dead_letter(dead_letter, *pairs[position], result)
+            if not retry:
+                return
+            pairs = body.pairs()
+            body = encoder.rebuild([pairs[p] for p in retry])
+            stats.retried += len(retry)
+            await asyncio.sleep(backoff(attempt, initial_backoff))
+
+    started = time.perf_counter()
+    producer = loop.run_in_executor(None, produce)
+    tasks = [asyncio.ensure_future(send()) for _ in range(senders)]
+    try:
+        await asyncio.gather(producer, *tasks)
+    except BaseException:
+        # Unblock the producer thread (it may be waiting on a full queue).
+        aborted.set()
+        for task in tasks:
+            task.cancel()
+        while not producer.done():
+            while not queue.empty():
+                queue.get_nowait()
+            await asyncio.sleep(0.01)
+        raise
+    finally:
+        stats.seconds = time.perf_counter() - started
+        if own_http:
+            await http.aclose()
+    return stats
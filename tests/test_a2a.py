@@ -0,0 +1,183 @@
+"""Tests for the A2A client task manager (mocked HTTP transport)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.agent_builder.a2a import (
+    A2AClient,
+    A2AMessage,
+    A2ATask,
+    A2ATaskError,
+    A2ATaskManager,
+    PollBackoff,
+)
+
+FAST = PollBackoff(initial=0.001, maximum=0.004)
+
+
+def _client(states: list[str], calls: list[str], batches: list[int] | None = None) -> A2AClient:
+    """Client whose server walks each task through ``states`` (last one repeats)."""
+    remaining: dict[str, list[str]] = {}
+
+    def answer(body: dict) -> dict:
+        calls.append(body["method"])
+        task_id = body["params"]["id"]
+        todo = remaining.setdefault(task_id, list(states))
+        if body["method"] == "tasks/cancel":
+            state = "canceled"
+        else:
+            state = todo.pop(0) if len(todo) > 1 else todo[0]
+        task = {"id": task_id, "status": {"state": state}}
+        return {"jsonrpc": "2.0", "id": body.get("id"), "result": task}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        if isinstance(body, list):
+            if batches is None:
+                return httpx.Response(400)
+            batches.append(len(body))
+            return httpx.Response(200, json=[answer(b) for b in reversed(body)])
+        return httpx.Response(200, json=answer(body))
+
+    client = A2AClient("https://a2a.example.com", "key")
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def _task(task_id: str = "INC-1-triage") -> A2ATask:
+    return A2ATask(task_id=task_id, message=A2AMessage.text("user", "classify"))
+
+
+def test_backoff_grows_and_resets():
+    backoff = PollBackoff(initial=0.25, maximum=1.0)
+    assert backoff.next(0.25, state_changed=False) == 0.5
+    assert backoff.next(0.75, state_changed=False) == 1.0
+    assert backoff.next(1.0, state_changed=True) == 0.25
+
+
+def test_submit_polls_until_completed():
+    calls: list[str] = []
+
+    async def main() -> dict:
+        manager = A2ATaskManager(
+            _client(["submitted", "working", "working", "completed"], calls), FAST
+        )
+        managed = manager.submit(_task())
+        assert not managed.done  # submit returns before the task finishes
+        response = await manager.wait(managed.task_id)
+        assert manager.get(managed.task_id) is None  # forgotten once collected
+        return response
+
+    response = asyncio.run(main())
+    assert response["result"]["status"]["state"] == "completed"
+    assert calls == ["tasks/send", "tasks/get", "tasks/get", "tasks/get"]
+
+
+def test_deadline_cancels_remote_task():
+    calls: list[str] = []
+
+    async def main() -> None:
+        # The deadline falls inside the batch window of a queued poll.
+        manager = A2ATaskManager(_client(["working"], calls), FAST, batch_window=0.05)
+        try:
+            await manager.run(_task(), timeout=0.02)
+        finally:
+            await asyncio.sleep(0.1)  # let that batch flush
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(main())
+    assert calls[-1] == "tasks/cancel"
+
+
+def test_failed_task_raises():
+    async def main() -> None:
+        manager = A2ATaskManager(_client(["working", "failed"], []), FAST)
+        await manager.run(_task())
+
+    with pytest.raises(A2ATaskError, match="failed"):
+        asyncio.run(main())
+
+
+def test_supersede_cancels_group():
+    calls: list[str] = []
+
+    async def main() -> int:
+        manager = A2ATaskManager(_client(["working"], calls), FAST)
+        first = manager.submit(_task("INC-1-diagnosis"), group="INC-1")
+        manager.submit(_task("INC-2-diagnosis"), group="INC-2")
+        await asyncio.sleep(0.01)
+        canceled = await manager.supersede("INC-1")
+        with pytest.raises(A2ATaskError, match="superseded"):
+            await manager.wait(first.task_id)
+        assert [t.task_id for t in manager.in_flight()] == ["INC-2-diagnosis"]
+        await manager.close()
+        return canceled
+
+    assert asyncio.run(main()) == 1
+    assert calls.count("tasks/cancel") == 2
+
+
+def test_push_updates_replace_polling():
+    calls: list[str] = []
+
+    async def main() -> dict:
+        manager = A2ATaskManager(
+            _client(["working"], calls),
+            PollBackoff(initial=5, maximum=5),
+            push_url="http://me/hook",
+        )
+        managed = manager.submit(_task())
+        await asyncio.sleep(0.01)
+        assert managed.task.metadata["pushNotification"] == {"url": "http://me/hook"}
+        assert manager.handle_push({"id": managed.task_id, "status": {"state": "completed"}})
+        return await manager.wait(managed.task_id)
+
+    response = asyncio.run(main())
+    assert response["result"]["status"]["state"] == "completed"
+    assert "tasks/get" not in calls
+
+
+def test_get_tasks_batches_and_matches_ids():
+    calls: list[str] = []
+    batches: list[int] = []
+
+    async def main() -> list[dict]:
+        client = _client(["working"], calls, batches)
+        return await client.get_tasks(["a", "b", "c"])
+
+    responses = asyncio.run(main())
+    assert [r["result"]["id"] for r in responses] == ["a", "b", "c"]
+    assert batches == [3]
+
+
+def test_get_tasks_falls_back_when_batch_rejected():
+    calls: list[str] = []
+
+    async def main() -> tuple[list[dict], bool | None]:
+        client = _client(["working"], calls)
+        responses = await client.get_tasks(["a", "b"])
+        return responses, client._batch_supported
+
+    responses, supported = asyncio.run(main())
+    assert [r["result"]["id"] for r in responses] == ["a", "b"]
+    assert supported is False
+    assert calls == ["tasks/get", "tasks/get"]
+
+
+def test_concurrent_polls_are_coalesced():
+    batches: list[int] = []
+
+    async def main() -> None:
+        client = _client(["working", "working", "completed"], [], batches)
+        manager = A2ATaskManager(client, FAST, batch_window=0.01)
+        first = manager.submit(_task("INC-1-triage"))
+        second = manager.submit(_task("INC-2-triage"))
+        await asyncio.gather(manager.wait(first.task_id), manager.wait(second.task_id))
+
+    asyncio.run(main())
+    assert batches and max(batches) == 2
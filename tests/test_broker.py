@@ -0,0 +1,247 @@
+"""Tests for the sharded alert broker, leases and the local cluster harness."""
+
+from __future__ import annotations
+
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
+import httpx
+
+from backend.broker import (
+    DedupCache,
+    ElasticsearchBroker,
+    LeaseLostError,
+    LocalBroker,
+    ShardWorker,
+    owned_shards,
+)
+from backend.server import IncidentDaemon
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _alert(service: str, n: int = 0) -> dict:
+    return {"title": f"{service} #{n}", "alert.name": "error_rate_spike", "service.name": service}
+
+
+def test_shards_are_partitioned_and_move_little_when_a_node_joins():
+    nodes = ["a", "b", "c"]
+    owned = {node: owned_shards(node, nodes, 64) for node in nodes}
+    assert sorted(s for shards in owned.values() for s in shards) == list(range(64))
+
+    grown = {node: owned_shards(node, nodes + ["d"], 64) for node in nodes}
+    # Existing nodes only hand shards to the new node; none move between them.
+    assert all(grown[node] <= owned[node] for node in nodes)
+
+
+def test_expired_lease_is_reclaimed_and_the_stale_owner_cannot_ack():
+    clock = Clock()
+    broker = LocalBroker(num_shards=4, clock=clock)
+
+    async def scenario() -> None:
+        [shard] = await broker.publish([_alert("payment-service")])
+        first = await broker.claim("node-a/0", [shard], lease_seconds=10)
+        assert await broker.claim("node-b/0", [shard]) is None
+
+        clock.now += 11  # node-a died without renewing
+        assert await broker.backlog() == {shard: 1}
+        second = await broker.claim("node-b/0", [shard], lease_seconds=10)
+        assert second.id == first.id and second.attempts == 2
+
+        for call in (broker.ack(first), broker.renew(first)):
+            try:
+                await call
+            except LeaseLostError:
+                pass
+            else:
+                raise AssertionError("stale lease accepted")
+        await broker.ack(second)
+        assert await broker.backlog() == {} and broker.leased == 0
+
+    asyncio.run(scenario())
+
+
+def test_idle_worker_steals_and_dedup_skips_repeats():
+    broker = LocalBroker(num_shards=8)
+    handled: list[str] = []
+
+    async def handle(alert: dict) -> None:
+        handled.append(alert["title"])
+
+    async def scenario() -> tuple[ShardWorker, ShardWorker]:
+        alerts = [_alert("payment-service", n) for n in range(3)] + [_alert("cart-service")]
+        shards = await broker.publish(alerts)
+        owner = ShardWorker(broker, handle, "a/0", [shards[0]], dedup=DedupCache(60))
+        # Owns no shard holding an alert: everything it does is stolen.
+        idle = ShardWorker(broker, handle, "b/0", [], dedup=DedupCache(60))
+        for _ in range(4):
+            for worker in (owner, idle):
+                lease = await worker.next_lease()
+                if lease is not None:
+                    await worker.process(lease)
+        return owner, idle
+
+    owner, idle = asyncio.run(scenario())
+    # The idle worker stole from the busiest shard first, then cart-service.
+    assert handled == ["payment-service #0", "payment-service #1", "cart-service #0"]
+    assert idle.stats["stolen"] == 2
+    # The last payment-service repeat hit its owner's dedup cache.
+    assert owner.stats["deduplicated"] == 1
+
+
+def test_failing_alert_is_released_then_dropped_after_max_attempts():
+    broker = LocalBroker(num_shards=2)
+
+    async def fail(alert: dict) -> None:
+        raise RuntimeError("agent error")
+
+    async def scenario() -> ShardWorker:
+        await broker.publish([_alert("payment-service")])
+        worker = ShardWorker(broker, fail, "a/0", range(2), max_attempts=2)
+        for _ in range(3):
+            lease = await worker.next_lease()
+            if lease is not None:
+                await worker.process(lease)
+        return worker
+
+    worker = asyncio.run(scenario())
+    assert (worker.stats["failed"], worker.stats["dropped"]) == (1, 1)
+    assert broker.leased == 0
+
+
+class FakeES:
+    """Documents with sequence numbers and conditional writes (409 on conflict)."""
+
+    def __init__(self) -> None:
+        self.docs: dict[str, tuple[int, dict]] = {}
+        self.seq = 0
+
+    def _conflict(self, doc_id: str, params: dict | None) -> None:
+        current = self.docs.get(doc_id)
+        if params and (current is None or current[0] != params["if_seq_no"]):
+            request = httpx.Request("PUT", f"http://es/{doc_id}")
+            response = httpx.Response(409, request=request)
+            raise httpx.HTTPStatusError("conflict", request=request, response=response)
+
+    async def es_post_body(self, path: str, lines: list[dict], content_type: str) -> dict:
+        for action, source in zip(lines[::2], lines[1::2]):
+            self.seq += 1
+            self.docs[action["create"]["_id"]] = (self.seq, source)
+        return {"errors": False}
+
+    async def es_request(self, method, path, json=None, params=None) -> dict:
+        await asyncio.sleep(0)  # let concurrent claims see the same candidates
+        doc_id = path.rsplit("/", 1)[1]
+        if method == "PUT":
+            self._conflict(doc_id, params)
+            self.seq += 1
+            self.docs[doc_id] = (self.seq, json)
+            return {"_seq_no": self.seq, "_primary_term": 1}
+        if method == "DELETE":
+            self._conflict(doc_id, params)
+            del self.docs[doc_id]
+            return {"result": "deleted"}
+        filters = json["query"]["bool"]["filter"]
+        cutoff = filters[0]["range"]["lease_expires"]["lt"]
+        shards = filters[1]["terms"]["shard"] if len(filters) > 1 else None
+        hits = [
+            {"_id": i, "_seq_no": seq, "_primary_term": 1, "_source": src}
+            for i, (seq, src) in sorted(self.docs.items())
+            if src["lease_expires"] < cutoff and (shards is None or src["shard"] in shards)
+        ]
+        if "aggs" in json:
+            counts: dict[int, int] = {}
+            for hit in hits:
+                counts[hit["_source"]["shard"]] = counts.get(hit["_source"]["shard"], 0) + 1
+            buckets = [{"key": k, "doc_count": v} for k, v in counts.items()]
+            return {"aggregations": {"shards": {"buckets": buckets}}}
+        return {"hits": {"hits": hits[: json["size"]]}}
+
+
+def test_elasticsearch_broker_claims_each_alert_once():
+    es = FakeES()
+    broker = ElasticsearchBroker(es, num_shards=4)
+
+    async def scenario() -> None:
+        shards = await broker.publish([_alert("payment-service", n) for n in range(3)])
+        assert len(set(shards)) == 1
+        # All three see the same candidates; conditional writes pick one each.
+        leases = await asyncio.gather(
+            broker.claim("a/0", shards), broker.claim("b/0", shards), broker.claim("c/0", shards)
+        )
+        assert len({lease.id for lease in leases}) == 3
+        assert await broker.backlog() == {}
+
+        await broker.renew(leases[0])
+        await broker.ack(leases[0])
+        await broker.release(leases[1])
+        assert await broker.backlog() == {shards[0]: 1}
+
+        stale = leases[2]
+        es.docs[stale.id] = (es.seq + 1, {**es.docs[stale.id][1], "owner": "z/0"})
+        try:
+            await broker.ack(stale)
+        except LeaseLostError:
+            pass
+        else:
+            raise AssertionError("ack with a stale seq_no succeeded")
+
+    asyncio.run(scenario())
+
+
+def test_daemon_publishes_to_the_broker_and_leases_from_its_shards():
+    handled: list[str] = []
+
+    async def handler(alert: dict) -> None:
+        handled.append(alert["title"])
+
+    async def run() -> tuple[dict, dict, str]:
+        broker = LocalBroker(num_shards=4)
+        daemon = IncidentDaemon(handler, workers=2, broker=broker, shards=[0, 1], node="n1")
+        await daemon.start("127.0.0.1", 0)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{daemon.port}") as http:
+            accepted = await http.post("/alerts", json=[_alert(f"svc-{n}") for n in range(6)])
+            for _ in range(100):
+                if len(handled) == 6:
+                    break
+                await asyncio.sleep(0.02)
+            health = (await http.get("/health")).json()
+            metrics = (await http.get("/metrics")).text
+        await daemon.stop(grace=0.05)
+        return accepted.json(), health, metrics
+
+    accepted, health, metrics = asyncio.run(run())
+    assert accepted["queued"] == 6 and len(accepted["shards"]) == 6
+    assert sorted(handled) == sorted(f"svc-{n} #0" for n in range(6))
+    assert (health["node"], health["shards"]) == ("n1", [0, 1])
+    assert "incident_broker_processed_total 6" in metrics
+
+
+def test_local_cluster_harness_survives_a_node_crash():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "scripts/run_local_cluster.py",
+            "--nodes",
+            "3",
+            "--alerts",
+            "300",
+            "--crash",
+        ],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "lost: 0, handled more than once: 0" in result.stdout
@@ -0,0 +1,152 @@
+"""Tests for per-item bulk retry and dead-lettering."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+
+from backend.config import config
+from backend.elastic_client import ElasticClient
+from src.bulk_retry import backoff, classify_items
+from src.data_loader import bulk_index
+
+REJECTED = {"status": 429, "error": {"type": "es_rejected_execution_exception"}}
+
+
+class _ApiError(Exception):
+    status_code = 429
+
+
+class FakeES:
+    """``es.bulk`` that rejects each listed id ``reject`` times, then accepts it."""
+
+    def __init__(self, reject: dict[str, int], bad: set[str] = frozenset(), throttle: int = 0):
+        self.reject = dict(reject)
+        self.bad = bad
+        self.throttle = throttle
+        self.calls: list[list[str]] = []
+
+    def bulk(self, operations):
+        ids = [op["index"]["_id"] for op in operations[::2]]
+        self.calls.append(ids)
+        if self.throttle:
+            self.throttle -= 1
+            raise _ApiError("429 Too Many Requests")
+        items = []
+        for doc_id in ids:
+            if self.reject.get(doc_id, 0) > 0:
+                self.reject[doc_id] -= 1
+                items.append({"index": REJECTED})
+            elif doc_id in self.bad:
+                error = {"type": "mapper_parsing_exception", "reason": "bad"}
+                items.append({"index": {"status": 400, "error": error}})
+            else:
+                items.append({"index": {"status": 201, "_id": doc_id}})
+        return {"errors": True, "items": items}
+
+
+def _docs(n: int) -> list[dict]:
+    return [{"id": f"d{i}", "n": i} for i in range(n)]
+
+
+def test_classify_items_separates_rejections_from_failures():
+    items = [
+        {"index": {"status": 201}},
+        {"index": REJECTED},
+        {"create": {"status": 400, "error": {"type": "mapper_parsing_exception"}}},
+        {"index": {"status": 503, "error": {"type": "es_rejected_execution_exception"}}},
+    ]
+    assert classify_items(items) == (1, [1, 3], [(2, items[2]["create"])])
+
+
+def test_backoff_grows_and_caps():
+    assert 0.25 <= backoff(0) <= 0.5
+    assert 2.0 <= backoff(3) <= 4.0
+    assert backoff(20, maximum=30.0) <= 30.0
+
+
+def test_bulk_index_retries_only_rejected_items(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.bulk_retry.time.sleep", lambda _s: None)
+    es = FakeES(reject={"d1": 2, "d3": 1}, bad={"d4"})
+    dead = tmp_path / "dead.jsonl"
+
+    result = bulk_index("logs", _docs(6), id_field="id", es=es, dead_letter=dead)
+
+    assert es.calls == [["d0", "d1", "d2", "d3", "d4", "d5"], ["d1", "d3"], ["d1"]]
+    assert result == {"indexed": 5, "errors": 1, "retried": 3, "dead_letter": str(dead)}
+    record = json.loads(dead.read_text())
+    assert record["id"] == "d4"
+    assert record["error"]["type"] == "mapper_parsing_exception"
+    assert record["document"] == {"id": "d4", "n": 4}
+
+
+def test_bulk_index_dead_letters_items_still_rejected_after_retries(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.bulk_retry.time.sleep", lambda _s: None)
+    es = FakeES(reject={"d0": 10}, throttle=1)
+    dead = tmp_path / "dead.jsonl"
+
+    result = bulk_index("logs", _docs(3), id_field="id", es=es, max_retries=2, dead_letter=dead)
+
+    # Whole-request 429 first, then d0 keeps being rejected.
+    assert es.calls == [["d0", "d1", "d2"], ["d0", "d1", "d2"], ["d0"]]
+    assert (result["indexed"], result["errors"]) == (2, 1)
+    assert json.loads(dead.read_text())["status"] == 429
+
+
+def test_bulk_index_without_failures_writes_no_dead_letter(tmp_path):
+    dead = tmp_path / "dead.jsonl"
+    result = bulk_index("logs", _docs(3), id_field="id", es=FakeES({}), dead_letter=dead)
+    assert result == {"indexed": 3, "errors": 0, "retried": 0, "dead_letter": None}
+    assert not dead.exists()
+
+
+def test_backend_bulk_index_merges_retried_items(monkeypatch):
+    monkeypatch.setattr(config.elastic, "bulk_retry_backoff", 0.0)
+    sent: list[list[int]] = []
+    rejected_once: set[int] = set()
+
+    async def es_post_body(path, lines, content_type):
+        docs = lines[1::2]
+        sent.append([doc["n"] for doc in docs])
+        items = []
+        for doc in docs:
+            if doc["n"] % 2 and doc["n"] not in rejected_once:
+                rejected_once.add(doc["n"])
+                items.append({"index": REJECTED})
+            else:
+                items.append({"index": {"status": 201, "n": doc["n"]}})
+        return {"errors": True, "items": items}
+
+    client = ElasticClient()
+    monkeypatch.setattr(client, "es_post_body", es_post_body)
+
+    response = asyncio.run(client.bulk_index("logs", _docs(4)))
+
+    assert sent == [[0, 1, 2, 3], [1, 3]]
+    assert response["errors"] is False
+    assert [item["index"]["n"] for item in response["items"]] == [0, 1, 2, 3]
+
+
+def test_backend_bulk_index_creates_into_data_streams(monkeypatch):
+    monkeypatch.setattr(config.elastic, "bulk_retry_backoff", 0.0)
+    actions: list[list[str]] = []
+
+    async def es_post_body(path, lines, content_type):
+        ops = [next(iter(action)) for action in lines[::2]]
+        actions.append(ops)
+        if len(actions) == 1:  # whole request throttled once
+            request = httpx.Request("POST", "https://es.example.com/_bulk")
+            response = httpx.Response(429, request=request)
+            raise httpx.HTTPStatusError("429", request=request, response=response)
+        return {"errors": False, "items": [{op: {"status": 201}} for op in ops]}
+
+    client = ElasticClient()
+    monkeypatch.setattr(client, "es_post_body", es_post_body)
+
+    response = asyncio.run(client.bulk_index("logs-app-default", _docs(2), op_type="create"))
+
+    assert actions == [["create", "create"], ["create", "create"]]
+    assert response["errors"] is False
+    assert [next(iter(item)) for item in response["items"]] == ["create", "create"]
@@ -0,0 +1,80 @@
+"""Tests for the tool catalog cache."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+
+from src.agent_builder.catalog import TOOLS_LIST_CHANGED, ToolCatalogCache, catalog_version
+from src.agent_builder.mcp import MCPClient
+
+TOOLS = [{"name": "error_rate_spike"}, {"name": "cpu_anomaly"}]
+
+
+def _fetcher(responses: list, seen: list):
+    async def fetch(version):
+        seen.append(version)
+        return responses.pop(0)
+
+    return fetch
+
+
+def test_memory_hit_skips_fetch(tmp_path):
+    cache = ToolCatalogCache(cache_dir=tmp_path)
+    seen: list = []
+    fetch = _fetcher([(TOOLS, None)], seen)
+    asyncio.run(cache.get_or_fetch("mcp:x", fetch))
+    entry = asyncio.run(cache.get_or_fetch("mcp:x", fetch))
+    assert seen == [None]
+    assert entry.version == catalog_version(TOOLS)
+    assert cache.lookup("mcp:x", "cpu_anomaly") == {"name": "cpu_anomaly"}
+
+
+def test_disk_copy_survives_new_process(tmp_path):
+    ToolCatalogCache(cache_dir=tmp_path).put("kibana:y", TOOLS, "etag-1")
+    entry = ToolCatalogCache(cache_dir=tmp_path).get("kibana:y")
+    assert entry is not None
+    assert entry.version == "etag-1"
+    assert [t["name"] for t in entry.tools] == ["error_rate_spike", "cpu_anomaly"]
+
+
+def test_stale_entry_revalidates_with_version(tmp_path):
+    cache = ToolCatalogCache(cache_dir=tmp_path, max_age=0)
+    cache.put("kibana:y", TOOLS, "etag-1")
+    seen: list = []
+    entry = asyncio.run(cache.get_or_fetch("kibana:y", _fetcher([(None, "etag-1")], seen)))
+    assert seen == ["etag-1"]  # sent as If-None-Match; 304 keeps the entry
+    assert entry.tools == TOOLS
+
+
+def test_list_changed_notification_invalidates(tmp_path):
+    cache = ToolCatalogCache(cache_dir=tmp_path)
+    cache.put("mcp:x", TOOLS)
+    assert not cache.handle_notification("mcp:x", {"method": "notifications/progress"})
+    assert cache.handle_notification("mcp:x", {"method": TOOLS_LIST_CHANGED})
+    assert cache.get("mcp:x") is None
+
+
+def test_mcp_client_serves_tools_from_cache(tmp_path):
+    posts: list = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        posts.append(body["method"])
+        return httpx.Response(
+            200, json={"jsonrpc": "2.0", "id": body["id"], "result": {"tools": TOOLS}}
+        )
+
+    async def main() -> dict | None:
+        client = MCPClient("https://mcp.example.com", "key", catalog=ToolCatalogCache(tmp_path))
+        client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        await client.list_tools()
+        tool = await client.get_tool("error_rate_spike")
+        client.handle_notification({"jsonrpc": "2.0", "method": TOOLS_LIST_CHANGED})
+        await client.list_tools()
+        return tool
+
+    assert asyncio.run(main()) == {"name": "error_rate_spike"}
+    assert posts == ["tools/list", "tools/list"]
@@ -1,5 +1,10 @@
 """Tests for CLI module."""
 
+import os
+import subprocess
+import sys
+from pathlib import Path
+
 from typer.testing import CliRunner
 
 from incident_commander.cli import app
@@ -35,3 +40,15 @@ def test_check_command_missing_config():
     # In CI, env vars are not set so check should exit with code 1
     assert result.exit_code == 1
     assert "Missing config" in result.stdout
+
+
+def test_startup_stays_within_import_budget():
+    """CLI import must not pull in rich/dotenv/httpx/elasticsearch (see bench_startup.py)."""
+    budget_ms = os.getenv("STARTUP_BUDGET_MS", "250")
+    result = subprocess.run(
+        [sys.executable, "scripts/bench_startup.py", "--repeat", "3", "--budget-ms", budget_ms],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).resolve().parent.parent,
+    )
+    assert result.returncode == 0, result.stdout
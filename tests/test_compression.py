@@ -0,0 +1,99 @@
+"""Tests for gzip request/response bodies (backend.ElasticClient and the bulk loader)."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import gzip
+import json
+
+import httpx
+import pytest
+
+from backend.config import config
+from backend.elastic_client import ElasticClient, encode_body
+from incident_commander.config import Settings
+from src.bulk_retry import BulkResult
+from src.data_loader import bulk_index
+
+
+class _Transport(httpx.AsyncBaseTransport):
+    """Like ``MockTransport`` but leaves the response body unread (raw)."""
+
+    def __init__(self, seen: list[httpx.Request], respond_gzip: bool) -> None:
+        self.seen = seen
+        self.respond_gzip = respond_gzip
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        self.seen.append(request)
+        body = json.dumps({"errors": False, "items": [], "took": 1}).encode()
+        headers = {}
+        if self.respond_gzip:
+            body, headers = gzip.compress(body), {"Content-Encoding": "gzip"}
+        return httpx.Response(200, stream=httpx.ByteStream(body), headers=headers)
+
+
+def _client(seen: list[httpx.Request], respond_gzip: bool = False) -> ElasticClient:
+    client = ElasticClient()
+    client.es_url = "https://es.example.com"
+    client._client = httpx.AsyncClient(transport=_Transport(seen, respond_gzip))
+    return client
+
+
+def test_small_bodies_are_not_compressed():
+    assert encode_body(b"{}", level=1, min_bytes=1024) == (b"{}", {})
+
+
+def test_bulk_body_is_gzipped_and_gzip_response_decoded(monkeypatch):
+    monkeypatch.setattr(config.elastic, "gzip_level", 1)
+    monkeypatch.setattr(config.elastic, "gzip_min_bytes", 0)
+    seen: list[httpx.Request] = []
+    docs = [{"message": f"log line {i}", "service": "api"} for i in range(200)]
+
+    result = asyncio.run(_client(seen, respond_gzip=True).bulk_index("logs", docs))
+
+    assert result["errors"] is False
+    request = seen[0]
+    assert request.headers["Content-Encoding"] == "gzip"
+    assert request.headers["Accept-Encoding"] == "gzip"
+    lines = gzip.decompress(request.content).decode().splitlines()
+    assert len(lines) == 400 and json.loads(lines[1]) == docs[0]
+    assert len(request.content) < len("\n".join(lines)) / 5
+
+
+def test_compression_disabled_by_default(monkeypatch):
+    monkeypatch.setattr(config.elastic, "gzip_level", 0)
+    seen: list[httpx.Request] = []
+
+    asyncio.run(_client(seen).run_esql("FROM logs | LIMIT 1"))
+
+    assert "Content-Encoding" not in seen[0].headers
+    assert json.loads(seen[0].content) == {"query": "FROM logs | LIMIT 1"}
+
+
+def test_bulk_index_default_client_honours_http_compress(monkeypatch):
+    cloud_id = "test:" + base64.b64encode(b"es.example.com$abc$kb").decode()
+    settings = Settings(elastic_cloud_id=cloud_id, elastic_api_key="key")
+    monkeypatch.setattr("incident_commander.elastic_client.get_settings", lambda: settings)
+    clients = []
+
+    def fake_bulk(es, actions, **kwargs):
+        clients.append(es)
+        return BulkResult(indexed=len(list(actions)))
+
+    monkeypatch.setattr("src.data_loader.bulk_with_retry", fake_bulk)
+    result = bulk_index("logs", [{"n": 1}, {"n": 2}], http_compress=True)
+
+    assert result["indexed"] == 2
+    (node,) = clients[0].transport.node_pool.all()
+    assert node.config.host == "abc.es.example.com" and node.config.http_compress
+
+
+def test_bulk_index_default_client_requires_credentials(monkeypatch):
+    monkeypatch.setattr(
+        "incident_commander.elastic_client.get_settings",
+        lambda: Settings(elastic_cloud_id="", elastic_api_key=""),
+    )
+    with pytest.raises(RuntimeError, match="ELASTIC_CLOUD_ID"):
+        bulk_index("logs", [{"n": 1}])
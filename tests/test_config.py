@@ -1,6 +1,8 @@
 """Tests for configuration module."""
 
-from incident_commander.config import Settings, settings
+import base64
+
+from incident_commander.config import Settings, get_settings, settings
 
 
 def test_settings_instance_exists():
@@ -26,6 +28,19 @@ def test_settings_kibana_headers():
     assert headers["Content-Type"] == "application/json"
 
 
+def test_settings_elasticsearch_url_from_cloud_id():
+    """The Elasticsearch endpoint is decoded from the cloud ID."""
+    encoded = base64.b64encode(b"us-east-1.aws.found.io$abc123$def456").decode()
+    cfg = Settings(elastic_cloud_id=f"prod:{encoded.rstrip('=')}", elastic_api_key="key")
+    assert cfg.elasticsearch_url == "https://abc123.us-east-1.aws.found.io:443"
+    assert cfg.elasticsearch_headers == {"Authorization": "ApiKey key"}
+    ported = base64.b64encode(b"example.com:9243$es$kb").decode()
+    assert Settings(elastic_cloud_id=f"x:{ported}").elasticsearch_url == (
+        "https://es.example.com:9243"
+    )
+    assert Settings(elastic_cloud_id="").elasticsearch_url == ""
+
+
 def test_settings_has_all_fields():
     """Ensure all expected fields are present."""
     cfg = Settings()
@@ -41,3 +56,8 @@ def test_settings_has_all_fields():
     ]
     for field_name in expected_fields:
         assert hasattr(cfg, field_name), f"Missing field: {field_name}"
+
+
+def test_settings_singleton_is_created_lazily():
+    """``settings`` and ``get_settings()`` return the same cached instance."""
+    assert get_settings() is settings
@@ -1,4 +1,4 @@
-"""Tests for data loading utilities — tested inline (no Elasticsearch connection needed)."""
+"""Tests for data loading utilities (no Elasticsearch connection needed)."""
 
 from __future__ import annotations
 
@@ -6,23 +6,22 @@ import json
 import tempfile
 from pathlib import Path
 
+from src.data_loader import (
+    LoadStats,
+    iter_json_array,
+    iter_jsonl,
+    load_json,
+    load_jsonl,
+    load_jsonl_parallel,
+    split_ranges,
+)
 
-def _load_jsonl(path: Path):
-    """Yield each non-empty line of a JSONL file as a parsed dict."""
-    with path.open() as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                yield json.loads(line)
 
-
-def _load_json(path: Path) -> list:
-    """Load a JSON array from a file."""
-    with path.open() as f:
-        data = json.load(f)
-    if isinstance(data, list):
-        return data
-    raise ValueError(f"Expected JSON array, got {type(data).__name__}")
+def _write_jsonl(docs: list[dict], **kwargs) -> Path:
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".jsonl", delete=False, **kwargs) as f:
+        for doc in docs:
+            f.write(json.dumps(doc) + "\n")
+    return Path(f.name)
 
 
 def test_load_jsonl():
@@ -33,7 +32,7 @@ def test_load_jsonl():
             f.write(json.dumps(doc) + "\n")
         path = Path(f.name)
 
-    results = list(_load_jsonl(path))
+    results = list(load_jsonl(path))
     assert len(results) == 2
     assert results[0]["id"] == 1
     assert results[1]["text"] == "world"
@@ -47,7 +46,7 @@ def test_load_json():
         json.dump(data, f)
         path = Path(f.name)
 
-    results = _load_json(path)
+    results = list(load_json(path))
     assert len(results) == 2
     path.unlink()
 
@@ -60,7 +59,7 @@ def test_load_jsonl_skips_empty_lines():
         f.write('{"x": 2}\n')
         path = Path(f.name)
 
-    results = list(_load_jsonl(path))
+    results = list(load_jsonl(path))
     assert len(results) == 2
     path.unlink()
 
@@ -74,5 +73,66 @@ def test_load_json_raises_on_non_array():
         path = Path(f.name)
 
     with pytest.raises(ValueError, match="Expected JSON array"):
-        _load_json(path)
+        load_json(path)
+    path.unlink()
+
+
+def test_load_jsonl_handles_crlf_and_missing_final_newline():
+    with tempfile.NamedTemporaryFile(mode="wb", suffix=".jsonl", delete=False) as f:
+        f.write(b'{"x": 1}\r\n  \r\n{"x": 2}')
+        path = Path(f.name)
+
+    assert [d["x"] for d in load_jsonl(path)] == [1, 2]
+    path.unlink()
+
+
+def test_split_ranges_align_to_lines():
+    docs = [{"i": i, "pad": "x" * (i % 7)} for i in range(200)]
+    path = _write_jsonl(docs)
+
+    ranges = split_ranges(path, parts=7)
+    assert ranges[0][0] == 0 and ranges[-1][1] == path.stat().st_size
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    parsed = [d for start, end in ranges for d in iter_jsonl(path, start, end)]
+    assert parsed == docs
+    path.unlink()
+
+
+def test_parallel_load_keeps_order_and_reports_throughput():
+    docs = [{"i": i} for i in range(500)]
+    path = _write_jsonl(docs)
+
+    stats = LoadStats()
+    parsed = list(load_jsonl_parallel(path, workers=2, range_size=512, stats=stats))
+    assert parsed == docs
+    assert stats.documents == 500
+    assert stats.bytes == path.stat().st_size
+    assert "MB/s" in str(stats)
+    path.unlink()
+
+
+def test_json_array_streams_across_chunk_boundaries():
+    """Elements split by tiny chunks (including bare numbers) parse intact."""
+    data = [{"i": i, "msg": "é" * i, "nested": {"v": [i, None, True]}} for i in range(30)]
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False, encoding="utf-8") as f:
+        f.write("\ufeff  [\n" + ",\n".join(json.dumps(d) for d in data) + ", 12345678 ]\n")
+        path = Path(f.name)
+
+    stats = LoadStats()
+    parsed = list(iter_json_array(path, chunk_size=5, stats=stats))
+    assert parsed == [*data, 12345678]
+    assert stats.documents == 31 and stats.bytes == path.stat().st_size
+    path.unlink()
+
+
+def test_json_array_rejects_truncated_input():
+    import pytest
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+        f.write('[{"a": 1}, {"b": ')
+        path = Path(f.name)
+
+    gen = load_json(path)
+    with pytest.raises(ValueError):
+        list(gen)
     path.unlink()
@@ -0,0 +1,268 @@
+"""Tests for the local workflow executor."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from src.agent_builder.executor import (
+    ElasticsearchStepHandler,
+    ItemError,
+    WorkflowExecutor,
+    evaluate_condition,
+    parse_duration,
+    resolve_path,
+    step_dependencies,
+)
+from src.agent_builder.workflows import (
+    StepType,
+    WorkflowDefinition,
+    WorkflowStep,
+    data_quality_check_workflow,
+    incident_triage_workflow,
+)
+
+
+class FakeES:
+    """Records requests and answers ES|QL with canned columns/values."""
+
+    def __init__(self, esql: dict) -> None:
+        self.esql = esql
+        self.requests: list[tuple] = []
+
+    async def run_esql(self, query, params=None):
+        self.requests.append(("esql", query))
+        return self.esql
+
+    async def es_request(self, method, path, json=None, params=None):
+        self.requests.append((method, path, json))
+        return {"result": "created"}
+
+    async def bulk_index(self, index, documents, op_type="index"):
+        self.requests.append(("_bulk", index, documents))
+        items = []
+        for doc in documents:
+            if doc.get("null_count") == "bad":
+                error = {"type": "mapper_parsing_exception", "reason": "failed to parse"}
+                items.append({"index": {"status": 400, "error": error}})
+            else:
+                items.append({"index": {"_index": index, "status": 201, "result": "created"}})
+        return {"errors": any("error" in i["index"] for i in items), "items": items}
+
+
+def _executor(es: FakeES) -> WorkflowExecutor:
+    return WorkflowExecutor({StepType.ELASTICSEARCH: ElasticsearchStepHandler(es)})
+
+
+def test_dependencies_from_templates_and_gates():
+    deps = step_dependencies(incident_triage_workflow())
+    assert deps == {
+        "query_errors": set(),
+        "check_threshold": {"query_errors"},
+        "create_summary": {"query_errors", "check_threshold"},
+    }
+
+
+def test_reference_to_later_step_is_rejected():
+    wf = WorkflowDefinition(
+        name="bad",
+        description="",
+        steps=[
+            WorkflowStep("a", StepType.EXTERNAL, {"x": "{{b.value}}"}),
+            WorkflowStep("b", StepType.EXTERNAL),
+        ],
+    )
+    with pytest.raises(ValueError, match="later step"):
+        step_dependencies(wf)
+
+
+def test_resolve_dotted_keys_and_lists():
+    scope = {"q": {"results": [{"service.name": "api"}, {"service.name": "db"}]}}
+    assert resolve_path(scope, "q.results.service.name") == ["api", "db"]
+    assert resolve_path(scope, "q.results.0.service.name") == "api"
+
+
+def test_condition_any_element():
+    scope = {"q": {"error_count": [12, 150]}}
+    assert evaluate_condition("{{q.error_count}} > 100", scope)
+    assert not evaluate_condition("{{q.error_count}} > 500", scope)
+
+
+def test_parse_duration():
+    assert parse_duration("250ms") == 0.25
+    assert parse_duration("2m") == 120
+    assert parse_duration(3) == 3.0
+
+
+def test_triage_workflow_runs_when_threshold_exceeded():
+    es = FakeES(
+        {
+            "columns": [{"name": "error_count"}, {"name": "service.name"}],
+            "values": [[150, "payment-service"]],
+        }
+    )
+    run = asyncio.run(_executor(es).run(incident_triage_workflow()))
+    assert run.ok
+    assert [r.status for r in run.results.values()] == ["completed"] * 3
+    method, path, doc = es.requests[-1]
+    assert (method, path) == ("POST", "/incidents/_doc")
+    assert doc["error_count"] == [150]
+    assert run.critical_path() == ["query_errors", "check_threshold", "create_summary"]
+
+
+def test_false_condition_skips_gated_steps():
+    es = FakeES({"columns": [{"name": "error_count"}], "values": [[3]]})
+    run = asyncio.run(_executor(es).run(incident_triage_workflow()))
+    assert run.results["check_threshold"].output == {"condition": False}
+    assert run.results["create_summary"].status == "skipped"
+    assert len(es.requests) == 1
+
+
+def test_foreach_renders_each_item():
+    es = FakeES(
+        {
+            "columns": [{"name": "null_count"}, {"name": "_index"}],
+            "values": [[4, "data-a"], [2, "data-b"]],
+        }
+    )
+    run = asyncio.run(_executor(es).run(data_quality_check_workflow()))
+    assert run.ok
+    bulks = [r for r in es.requests if r[0] == "_bulk"]
+    assert len(bulks) == 1  # both findings folded into one _bulk request
+    docs = bulks[0][2]
+    assert [d["index_name"] for d in docs] == ["data-a", "data-b"]
+    assert [d["null_count"] for d in docs] == [4, 2]
+    assert [o["result"] for o in run.results["log_findings"].output] == ["created", "created"]
+
+
+def _index_loop(**options) -> WorkflowDefinition:
+    return WorkflowDefinition(
+        name="loop",
+        description="",
+        steps=[
+            WorkflowStep(
+                "log",
+                StepType.FOREACH,
+                {
+                    "items": "{{rows}}",
+                    "step": {
+                        "action": "index",
+                        "index": "out",
+                        "document": {"null_count": "{{item}}"},
+                    },
+                    **options,
+                },
+            )
+        ],
+    )
+
+
+def test_foreach_bulk_chunks_and_maps_item_errors():
+    es = FakeES({})
+    executor = WorkflowExecutor(
+        {StepType.ELASTICSEARCH: ElasticsearchStepHandler(es, bulk_size=2)},
+        variables={"rows": [1, 2, "bad", 4, 5]},
+    )
+    run = asyncio.run(executor.run(_index_loop()))
+    result = run.results["log"]
+    assert result.status == "failed"
+    assert "1 of 5 items" in result.error and "[2]" in result.error
+    assert [len(r[2]) for r in es.requests] == [2, 2, 1]
+    assert isinstance(result.output[2], ItemError)
+    assert result.output[0]["result"] == "created"
+
+
+def test_folded_bulk_requests_respect_max_concurrency():
+    es = FakeES({})
+    active = peak = 0
+    bulk_index = es.bulk_index
+
+    async def slow_bulk(index, documents, op_type="index"):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return await bulk_index(index, documents)
+
+    es.bulk_index = slow_bulk
+    executor = WorkflowExecutor(
+        {StepType.ELASTICSEARCH: ElasticsearchStepHandler(es, bulk_size=1)},
+        variables={"rows": list(range(6))},
+        max_concurrency=2,
+    )
+    run = asyncio.run(executor.run(_index_loop()))
+    assert run.results["log"].status == "completed"
+    assert len(es.requests) == 6 and peak == 2
+
+
+def test_foreach_concurrency_limit_without_bulk():
+    active = peak = 0
+
+    async def handler(step, config):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return config["document"]["null_count"]
+
+    executor = WorkflowExecutor(
+        {StepType.ELASTICSEARCH: handler}, variables={"rows": list(range(8))}
+    )
+    run = asyncio.run(executor.run(_index_loop(concurrency=3)))
+    assert run.results["log"].output == list(range(8))
+    assert peak == 3
+
+
+def test_independent_steps_run_concurrently_and_wait_is_a_barrier():
+    order: list[str] = []
+
+    async def slow(step, config):
+        await asyncio.sleep(0.05)
+        order.append(step.name)
+        return {"ok": True}
+
+    wf = WorkflowDefinition(
+        name="fanout",
+        description="",
+        steps=[
+            WorkflowStep("a", StepType.EXTERNAL),
+            WorkflowStep("b", StepType.KIBANA),
+            WorkflowStep("pause", StepType.WAIT, {"duration": "10ms"}),
+            WorkflowStep("c", StepType.EXTERNAL),
+        ],
+    )
+    executor = WorkflowExecutor({StepType.EXTERNAL: slow, StepType.KIBANA: slow})
+    start = time.perf_counter()
+    run = asyncio.run(executor.run(wf))
+    elapsed = time.perf_counter() - start
+    assert run.ok
+    assert elapsed < 0.2  # a and b overlap: ~50 + 10 + 50 ms, not 160
+    assert order[-1] == "c"
+    assert step_dependencies(wf)["c"] == {"pause"}
+
+
+def test_failed_step_blocks_dependents_only():
+    async def boom(step, config):
+        raise RuntimeError("down")
+
+    async def fine(step, config):
+        return {"value": 1}
+
+    wf = WorkflowDefinition(
+        name="partial",
+        description="",
+        steps=[
+            WorkflowStep("broken", StepType.EXTERNAL),
+            WorkflowStep("after", StepType.KIBANA, {"v": "{{broken.value}}"}),
+            WorkflowStep("other", StepType.KIBANA),
+        ],
+    )
+    run = asyncio.run(WorkflowExecutor({StepType.EXTERNAL: boom, StepType.KIBANA: fine}).run(wf))
+    assert not run.ok
+    assert run.results["broken"].status == "failed"
+    assert run.results["after"].status == "skipped"
+    assert run.results["other"].status == "completed"
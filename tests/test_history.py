@@ -0,0 +1,151 @@
+"""Tests for the incident similarity index and its use during diagnosis."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+
+from src.incident_commander.history import FINGERPRINT_BOOST, IncidentHistory, embed
+from src.incident_commander.orchestrator import IncidentOrchestrator
+from tests.test_orchestrator import FakeA2AClient
+
+
+class FakeSearch:
+    """In-memory stand-in for the index: cosine kNN plus the fingerprint filter."""
+
+    def __init__(self) -> None:
+        self.docs: dict[str, dict] = {}
+        self.created: dict[str, dict] = {}
+
+    async def index_exists(self, index: str) -> bool:
+        return index in self.created
+
+    async def create_index(self, index: str, mappings: dict | None = None) -> dict:
+        self.created[index] = mappings
+        return {"acknowledged": True}
+
+    async def es_request(self, method, path, json=None, params=None) -> dict:
+        if method == "PUT":
+            self.docs[path.rsplit("/", 1)[1]] = json
+            return {"result": "created"}
+        vector = json["knn"]["query_vector"]
+        fingerprint = json["query"]["constant_score"]["filter"]["term"]["incident.fingerprint"]
+        scored = []
+        for doc_id, doc in self.docs.items():
+            cosine = sum(a * b for a, b in zip(vector, doc["incident.embedding"]))
+            score = (1 + cosine) / 2
+            if doc["incident.fingerprint"] == fingerprint:
+                score += FINGERPRINT_BOOST
+            source = {k: v for k, v in doc.items() if k != "incident.embedding"}
+            scored.append({"_id": doc_id, "_score": score, "_source": source})
+        scored.sort(key=lambda hit: -hit["_score"])
+        return {"hits": {"hits": scored[: json["size"]]}}
+
+
+ALERT = {
+    "title": "High error rate on payment-service",
+    "alert.name": "error_rate_spike",
+    "service.name": "payment-service",
+}
+
+
+def test_embed_is_unit_length_and_ranks_related_text_higher():
+    def cosine(a: str, b: str) -> float:
+        return sum(x * y for x, y in zip(embed(a), embed(b)))
+
+    assert math.isclose(sum(v * v for v in embed("disk full on node-3")), 1.0)
+    assert math.isclose(sum(v * v for v in embed("")), 1.0)
+    related = cosine("error rate spike payment-service", "payment-service error rate high")
+    unrelated = cosine("error rate spike payment-service", "disk full on node-3")
+    assert related > unrelated
+
+
+def test_recurring_incident_is_diagnosed_from_history():
+    es = FakeSearch()
+    history = IncidentHistory(es)
+    asyncio.run(history.ensure_index())
+    assert es.created["incidents-history"]["properties"]["incident.embedding"]["dims"] == 256
+
+    first = FakeA2AClient()
+    orchestrator = IncidentOrchestrator(client=first, agent_ids={}, history=history)
+    incident = asyncio.run(orchestrator.handle_alert(dict(ALERT)))
+    assert "diagnosis" in [role for _, role in first.log]
+    assert es.docs[incident.id]["incident.root_cause"] == "connection pool exhausted"
+
+    again = FakeA2AClient()
+    orchestrator.client = again
+    recurring = asyncio.run(orchestrator.handle_alert(dict(ALERT)))
+    assert "diagnosis" not in [role for _, role in again.log]
+    assert recurring.root_cause == "connection pool exhausted"
+    assert recurring.timeline[2].agent == "Incident History"
+
+
+def test_weak_matches_are_hints_and_lookup_failures_are_ignored():
+    es = FakeSearch()
+    history = IncidentHistory(es)
+    client = FakeA2AClient()
+    orchestrator = IncidentOrchestrator(client=client, agent_ids={}, history=history)
+    asyncio.run(orchestrator.handle_alert(dict(ALERT)))
+
+    other = {"title": "Disk full on prod-node-03", "service.name": "inventory-service"}
+    matches = asyncio.run(history.similar(other, "unrelated"))
+    assert matches and not matches[0].exact
+    assert history.trusted(matches) is None
+
+    async def broken(*args, **kwargs):
+        raise ConnectionError("elasticsearch down")
+
+    es.es_request = broken
+    client.log.clear()
+    incident = asyncio.run(orchestrator.handle_alert(other))
+    assert "diagnosis" in [role for _, role in client.log]
+    assert incident.phase.value == "resolved"
+
+
+def test_history_diagnoses_are_not_re_recorded_and_stale_fingerprints_expire():
+    es = FakeSearch()
+    history = IncidentHistory(es)
+    orchestrator = IncidentOrchestrator(client=FakeA2AClient(), agent_ids={}, history=history)
+    first = asyncio.run(orchestrator.handle_alert(dict(ALERT)))
+    recurring = asyncio.run(orchestrator.handle_alert(dict(ALERT)))
+    assert recurring.timeline[2].agent == "Incident History"
+    assert list(es.docs) == [first.id]
+
+    # Same fingerprint, but the alert text has drifted: diagnose afresh.
+    fingerprint = orchestrator._fingerprint(ALERT)
+    drifted = {**ALERT, "message": "TLS handshake timeouts to the card processor"}
+    matches = asyncio.run(history.similar(drifted, fingerprint))
+    assert matches[0].exact and matches[0].similarity < history.min_similarity
+    assert history.trusted(matches) is None
+
+
+def test_failed_triage_cancels_the_pending_history_lookup():
+    es = FakeSearch()
+    lookups: list[asyncio.Future] = []
+
+    async def hang(*args, **kwargs):
+        lookups.append(asyncio.get_running_loop().create_future())
+        return await lookups[-1]
+
+    es.es_request = hang
+
+    class BrokenTriage(FakeA2AClient):
+        async def send_a2a_task(self, task: dict) -> dict:
+            await asyncio.sleep(0)
+            raise ConnectionError("kibana unreachable")
+
+    orchestrator = IncidentOrchestrator(
+        client=BrokenTriage(), agent_ids={}, history=IncidentHistory(es)
+    )
+
+    async def run() -> None:
+        try:
+            await orchestrator.handle_alert(dict(ALERT))
+        except ConnectionError:
+            pass
+        else:
+            raise AssertionError("triage did not fail")
+        await asyncio.sleep(0)
+        assert lookups and lookups[0].cancelled()
+
+    asyncio.run(run())
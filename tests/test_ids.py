@@ -0,0 +1,65 @@
+"""Tests for collision-free incident IDs."""
+
+from __future__ import annotations
+
+import asyncio
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from src.incident_commander.ids import IdGenerator, decode, encode
+from src.incident_commander.orchestrator import IncidentOrchestrator
+from tests.test_orchestrator import FakeA2AClient
+
+
+def test_ids_increase_within_a_millisecond_and_when_the_clock_goes_back():
+    now = [1_700_000_000_000]
+    ids = IdGenerator("INC-", clock=lambda: now[0])
+    same_ms = [ids.new() for _ in range(1000)]
+    now[0] -= 5_000  # NTP step back
+    after = [ids.new() for _ in range(10)]
+
+    sequence = same_ms + after
+    assert sequence == sorted(sequence) and len(set(sequence)) == len(sequence)
+    assert all(len(id_) == 4 + 26 and id_.startswith("INC-") for id_ in sequence)
+    assert ids.timestamp_ms(same_ms[0]) == 1_700_000_000_000
+    assert decode(encode(2**128 - 1)) == 2**128 - 1
+
+
+def test_ids_are_unique_across_threads():
+    ids = IdGenerator()
+    out: list[list[str]] = [[] for _ in range(4)]
+
+    def work(bucket: list[str]) -> None:
+        bucket.extend(ids.new() for _ in range(10_000))
+
+    threads = [threading.Thread(target=work, args=(bucket,)) for bucket in out]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id_ for bucket in out for id_ in bucket}) == 40_000
+
+
+def test_ids_are_unique_across_forked_processes():
+    """Small run of scripts/stress_ids.py (use it for millions of IDs)."""
+    result = subprocess.run(
+        [sys.executable, "scripts/stress_ids.py", "--processes", "4", "--count", "20000"],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).resolve().parent.parent,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "80,000 IDs" in result.stdout and "0 collisions" in result.stdout
+
+
+def test_concurrent_incidents_get_distinct_ids():
+    orchestrator = IncidentOrchestrator(client=FakeA2AClient(delay=0), agent_ids={})
+
+    async def run() -> list[str]:
+        alerts = [{"title": f"alert {n}"} for n in range(5)]
+        incidents = await asyncio.gather(*(orchestrator.handle_alert(a) for a in alerts))
+        return [incident.id for incident in incidents]
+
+    assert len(set(asyncio.run(run()))) == 5
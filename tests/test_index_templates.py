@@ -0,0 +1,132 @@
+"""Tests for data stream templates and the ingest-time settings switch."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from backend.definitions.index_templates import (
+    DATA_STREAMS,
+    INDEX_TEMPLATES,
+    logs_template,
+    metrics_template,
+    template_for,
+)
+from backend.elastic_client import ElasticClient
+from src.data_loader import ingest_settings
+
+
+def test_metrics_template_is_tsdb_with_scaled_float_gauges():
+    template = metrics_template("metrics-app-prod")
+    settings = template["template"]["settings"]
+    props = template["template"]["mappings"]["properties"]
+
+    assert settings["index.mode"] == "time_series"
+    assert settings["index.routing_path"] == ["service.name", "host.name"]
+    assert props["host.name"] == {"type": "keyword", "time_series_dimension": True}
+    assert props["system.cpu.total.pct"]["type"] == "scaled_float"
+    assert props["system.cpu.total.pct"]["time_series_metric"] == "gauge"
+    assert props["data_stream.dataset"] == {"type": "constant_keyword", "value": "app"}
+    assert props["data_stream.namespace"] == {"type": "constant_keyword", "value": "prod"}
+
+
+def test_templates_cover_each_data_stream():
+    for stream in (*DATA_STREAMS, "logs-incident-prod"):
+        template = INDEX_TEMPLATES[template_for(stream)]
+        assert template["data_stream"] == {}
+        assert template["priority"] > 100  # wins over the built-in logs/metrics templates
+    # Left to the built-in templates, so callers refuse them.
+    assert template_for("logs-app-default") is None
+    props = logs_template()["template"]["mappings"]["properties"]
+    assert props["data_stream.dataset"] == {"type": "constant_keyword", "value": "incident"}
+    assert props["data_stream.namespace"] == {"type": "constant_keyword"}
+
+
+class FakeIndices:
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+
+    def get_settings(self, index, name, flat_settings):
+        return {
+            ".ds-logs-a-000001": {"settings": {"index.refresh_interval": "5s"}},
+            ".ds-logs-a-000002": {"settings": {}},
+        }
+
+    def put_settings(self, index, settings):
+        self.calls.append(("put", index, settings))
+
+    def refresh(self, index):
+        self.calls.append(("refresh", index))
+
+
+class FakeES:
+    def __init__(self) -> None:
+        self.indices = FakeIndices()
+
+
+def test_ingest_settings_restores_previous_values_on_error():
+    es = FakeES()
+    with pytest.raises(RuntimeError), ingest_settings(es, "logs-a"):
+        assert es.indices.calls == [
+            ("put", "logs-a", {"index": {"refresh_interval": "-1", "number_of_replicas": 0}})
+        ]
+        raise RuntimeError("bulk failed")
+
+    assert es.indices.calls[1:] == [
+        (
+            "put",
+            ".ds-logs-a-000001",
+            {"index.refresh_interval": "5s", "index.number_of_replicas": None},
+        ),
+        (
+            "put",
+            ".ds-logs-a-000002",
+            {"index.refresh_interval": None, "index.number_of_replicas": None},
+        ),
+        ("refresh", "logs-a"),
+    ]
+
+
+def test_backend_data_stream_setup_and_ingest_mode():
+    seen: list[tuple[str, str, bytes]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.method, request.url.path, request.content))
+        if request.url.path == "/_data_stream/metrics-incident-demo":
+            error = {"error": {"type": "resource_already_exists_exception"}}
+            return httpx.Response(400, json=error)
+        if request.method == "GET":
+            return httpx.Response(
+                200, json={".ds-x-1": {"settings": {"index.number_of_replicas": "1"}}}
+            )
+        return httpx.Response(200, json={"acknowledged": True})
+
+    client = ElasticClient()
+    client.es_url = "https://es.example.com"
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def run() -> list[str]:
+        for name, template in INDEX_TEMPLATES.items():
+            await client.put_index_template(name, template)
+        created = [name for name in DATA_STREAMS if await client.create_data_stream(name)]
+        async with client.ingest_mode("logs-incident-demo"):
+            seen.append(("BULK", "", b""))
+        return created
+
+    assert asyncio.run(run()) == ["logs-incident-demo"]
+    paths = [(method, path) for method, path, _ in seen]
+    assert paths[:2] == [("PUT", f"/_index_template/{name}") for name in INDEX_TEMPLATES]
+    assert paths[4:] == [
+        ("GET", "/logs-incident-demo/_settings/index.refresh_interval,index.number_of_replicas"),
+        ("PUT", "/logs-incident-demo/_settings"),
+        ("BULK", ""),
+        ("PUT", "/.ds-x-1/_settings"),
+        ("POST", "/logs-incident-demo/_refresh"),
+    ]
+    assert json.loads(seen[-2][2]) == {
+        "index.refresh_interval": None,
+        "index.number_of_replicas": "1",
+    }
@@ -0,0 +1,167 @@
+"""Tests for scripts/ingest_data.py against a fake cluster."""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from incident_commander.config import Settings
+from tests.test_ingest_pipeline import _mock_es
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _script():
+    spec = importlib.util.spec_from_file_location("ingest_data", ROOT / "scripts/ingest_data.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class FakeIndices:
+    def __init__(self, calls: list) -> None:
+        self.calls = calls
+
+    def exists(self, index):
+        return False
+
+    def __getattr__(self, name):
+        def call(**kwargs):
+            self.calls.append((name, kwargs.get("index") or kwargs.get("name")))
+            return {} if name == "get_settings" else {"acknowledged": True}
+
+        return call
+
+
+class FakeES:
+    """Sync client: records index calls and ``_bulk`` operations; rejects ``reject`` once."""
+
+    def __init__(self, reject: set[int] = frozenset()) -> None:
+        self.calls: list = []
+        self.indices = FakeIndices(self.calls)
+        self.operations: list[tuple[dict, dict]] = []
+        self.reject = set(reject)
+
+    def bulk(self, operations):
+        items = []
+        for action, doc in zip(operations[::2], operations[1::2]):
+            self.operations.append((action, doc))
+            op = next(iter(action))
+            if doc["id"] in self.reject:
+                self.reject.discard(doc["id"])
+                items.append(
+                    {op: {"status": 429, "error": {"type": "es_rejected_execution_exception"}}}
+                )
+            else:
+                items.append({op: {"status": 201}})
+        return {"errors": False, "items": items}
+
+
+def _run(monkeypatch, es: FakeES, *argv: str) -> list[bool]:
+    """Run the script's ``main`` on ``es``; returns the ``http_compress`` it asked for."""
+    script = _script()
+    compress: list[bool] = []
+
+    def get_es_client(http_compress=False):
+        compress.append(http_compress)
+        return es
+
+    monkeypatch.setattr(script, "get_es_client", get_es_client)
+    monkeypatch.setattr(sys, "argv", ["ingest_data.py", *argv])
+    monkeypatch.setattr("src.bulk_retry.time.sleep", lambda _s: None)
+    script.main()
+    return compress
+
+
+def _write(tmp_path: Path, count: int) -> Path:
+    path = tmp_path / "logs.jsonl.gz"
+    lines = "".join(json.dumps({"id": i, "message": f"line {i}"}) + "\n" for i in range(count))
+    path.write_bytes(gzip.compress(lines.encode()))
+    return path
+
+
+def test_help_runs(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["ingest_data.py", "--help"])
+    with pytest.raises(SystemExit) as exit_:
+        _script().main()
+    assert exit_.value.code == 0
+
+
+def test_data_stream_ingest_with_retries_and_ingest_mode(monkeypatch, tmp_path):
+    es = FakeES(reject={3})
+    path = _write(tmp_path, 10)
+    compress = _run(
+        monkeypatch,
+        es,
+        *("--index", "logs-incident-default", "--file", str(path), "--id-field", "id"),
+        *("--data-stream", "--ingest-mode", "--max-retries", "2", "--decompress-threads", "2"),
+        "--gzip-level",
+        "1",
+    )
+
+    assert compress == [True]
+    names = [name for name, _ in es.calls]
+    assert "put_index_template" in names
+    assert ("create_data_stream", "logs-incident-default") in es.calls
+    assert names[-1] == "refresh"  # ingest mode restored the settings
+    assert {next(iter(action)) for action, _ in es.operations} == {"create"}
+    assert sorted(doc["id"] for _, doc in es.operations) == sorted([*range(10), 3])
+
+
+def test_data_stream_without_a_matching_template_is_refused(monkeypatch, tmp_path):
+    es = FakeES()
+    path = _write(tmp_path, 1)
+    with pytest.raises(SystemExit):
+        _run(monkeypatch, es, "--index", "logs-app-default", "--file", str(path), "--data-stream")
+    assert es.calls == []
+
+
+def test_failed_documents_go_to_the_dead_letter_file(monkeypatch, tmp_path):
+    es = FakeES(reject={4})
+    path = _write(tmp_path, 5)
+    dead = tmp_path / "dead.jsonl"
+    _run(
+        monkeypatch,
+        es,
+        *("--index", "logs", "--file", str(path), "--id-field", "id"),
+        *("--max-retries", "0", "--dead-letter", str(dead)),
+    )
+
+    assert ("create", "logs") in es.calls
+    assert [json.loads(line)["id"] for line in dead.read_text().splitlines()] == [4]
+
+
+def test_pipeline_mode_sends_bulk_bodies(monkeypatch, tmp_path):
+    received: list = []
+    script = _script()
+    run_pipeline = script.run_pipeline
+
+    targets: list = []
+
+    async def mocked(path, encoder, es_url, **kwargs):
+        targets.append((es_url, kwargs["headers"]))
+        return await run_pipeline(path, encoder, es_url, http=_mock_es(received), **kwargs)
+
+    cloud_id = "prod:" + base64.b64encode(b"example.com$es1$kb1").decode()
+    cfg = Settings(elastic_cloud_id=cloud_id, elastic_api_key="key")
+    monkeypatch.setattr(script, "run_pipeline", mocked)
+    monkeypatch.setattr(script, "get_settings", lambda: cfg)
+    monkeypatch.setattr(script, "get_es_client", lambda http_compress=False: FakeES())
+    path = tmp_path / "logs.jsonl"
+    path.write_text("".join(json.dumps({"id": i}) + "\n" for i in range(50)))
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["ingest_data.py", "--index", "logs", "--file", str(path), "--pipeline", "--workers", "1"],
+    )
+    script.main()
+
+    assert sorted(doc["id"] for _, doc in received) == list(range(50))
+    # The cluster the index was set up on, not backend.config's ES_URL.
+    assert targets == [("https://es1.example.com:443", {"Authorization": "ApiKey key"})]
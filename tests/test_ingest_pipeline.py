@@ -0,0 +1,146 @@
+"""Tests for the multi-process ingest pipeline (mocked Elasticsearch)."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+from pathlib import Path
+
+import httpx
+
+from src.bulk_retry import DeadLetter
+from src.ingest_pipeline import BulkEncoder, encoded_bodies, run_pipeline
+
+
+def _drop_debug(doc: dict) -> dict | None:
+    return None if doc["level"] == "debug" else {**doc, "env": "prod"}
+
+
+def _write(tmp_path: Path, count: int) -> Path:
+    path = tmp_path / "logs.jsonl"
+    levels = ("info", "debug", "error")
+    path.write_text(
+        "".join(json.dumps({"id": i, "level": levels[i % 3]}) + "\n" for i in range(count))
+    )
+    return path
+
+
+def _bulk_docs(body: bytes) -> list[tuple[dict, dict]]:
+    lines = [json.loads(line) for line in body.splitlines()]
+    return list(zip(lines[::2], lines[1::2]))
+
+
+def _mock_es(received: list[tuple[dict, dict]], fail_ids: set[int] = frozenset()):
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/_bulk"
+        body = request.content
+        if request.headers.get("content-encoding") == "gzip":
+            body = gzip.decompress(body)
+        pairs = _bulk_docs(body)
+        received.extend(pairs)
+        items = [
+            {"index": {"status": 400, "error": {"type": "mapper_parsing_exception"}}}
+            if doc["id"] in fail_ids
+            else {"index": {"status": 201}}
+            for _, doc in pairs
+        ]
+        return httpx.Response(200, json={"errors": bool(fail_ids), "items": items})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_worker_encoded_bodies_cover_every_document(tmp_path):
+    path = _write(tmp_path, 900)
+    encoder = BulkEncoder("logs", id_field="id", max_docs=100)
+
+    bodies = list(encoded_bodies(path, encoder, workers=2, range_size=4096))
+
+    assert all(body.documents <= 100 for body in bodies)
+    docs = [pair for body in bodies for pair in _bulk_docs(body.body)]
+    assert sorted(doc["id"] for _, doc in docs) == list(range(900))
+    assert all(action == {"index": {"_index": "logs", "_id": doc["id"]}} for action, doc in docs)
+
+
+def test_pipeline_sends_gzipped_enriched_bodies(tmp_path):
+    path = _write(tmp_path, 300)
+    received: list[tuple[dict, dict]] = []
+    encoder = BulkEncoder("logs", max_docs=50, gzip_level=1, enrich=_drop_debug)
+
+    stats = asyncio.run(
+        run_pipeline(
+            path,
+            encoder,
+            "https://es.example.com",
+            workers=2,
+            range_size=2048,
+            http=_mock_es(received),
+        )
+    )
+
+    assert stats.documents == len(received) == 200
+    assert all(doc["level"] != "debug" and doc["env"] == "prod" for _, doc in received)
+    assert stats.sent_bytes < stats.raw_bytes
+    assert stats.errors == 0
+
+
+def test_pipeline_counts_item_errors(tmp_path):
+    path = _write(tmp_path, 30)
+    received: list[tuple[dict, dict]] = []
+
+    stats = asyncio.run(
+        run_pipeline(
+            path,
+            BulkEncoder("logs", max_docs=10),
+            "https://es.example.com",
+            workers=1,
+            senders=2,
+            http=_mock_es(received, fail_ids={3, 17}),
+        )
+    )
+
+    assert stats.documents == 30
+    assert stats.bodies == 3
+    assert stats.errors == 2
+
+
+def test_pipeline_retries_rejected_items_only(tmp_path):
+    path = _write(tmp_path, 20)
+    received: list[tuple[dict, dict]] = []
+    rejected_once: set[int] = set()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        pairs = _bulk_docs(gzip.decompress(request.content))
+        received.extend(pairs)
+        items = []
+        for _, doc in pairs:
+            if doc["id"] % 5 == 0 and doc["id"] not in rejected_once:
+                rejected_once.add(doc["id"])
+                error = {"type": "es_rejected_execution_exception"}
+                items.append({"index": {"status": 429, "error": error}})
+            elif doc["id"] == 7:
+                items.append({"index": {"status": 400, "error": {"type": "mapper_exception"}}})
+            else:
+                items.append({"index": {"status": 201}})
+        return httpx.Response(200, json={"errors": True, "items": items})
+
+    with DeadLetter(tmp_path / "dead.jsonl") as dead_letter:
+        stats = asyncio.run(
+            run_pipeline(
+                path,
+                BulkEncoder("logs", id_field="id", gzip_level=1),
+                "https://es.example.com",
+                workers=1,
+                http=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+                initial_backoff=0.001,
+                dead_letter=dead_letter,
+            )
+        )
+
+    assert stats.documents == 20
+    assert stats.retried == 4  # ids 0, 5, 10, 15 sent a second time, nothing else
+    assert [doc["id"] for _, doc in received[20:]] == [0, 5, 10, 15]
+    assert stats.errors == 1
+    (line,) = (tmp_path / "dead.jsonl").read_text().splitlines()
+    record = json.loads(line)
+    assert (record["id"], record["status"], record["document"]["id"]) == (7, 400, 7)
@@ -0,0 +1,192 @@
+"""Tests for the MCP client (mocked HTTP transport)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+
+from src.agent_builder.mcp import MCPClient, MCPSession
+
+
+def _client(posts: list, accept_batches: bool = True) -> MCPClient:
+    def answer(body: dict) -> dict:
+        name = body["params"]["name"]
+        return {"jsonrpc": "2.0", "id": body["id"], "result": {"content": [{"text": name}]}}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        posts.append(body)
+        if isinstance(body, list):
+            if not accept_batches:
+                return httpx.Response(
+                    200, json={"jsonrpc": "2.0", "id": None, "error": {"code": -32600}}
+                )
+            return httpx.Response(200, json=[answer(b) for b in reversed(body)])
+        return httpx.Response(200, json=answer(body))
+
+    client = MCPClient("https://mcp.example.com", "key")
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def _names(responses: list[dict]) -> list[str]:
+    return [r["result"]["content"][0]["text"] for r in responses]
+
+
+def test_call_tools_single_post():
+    posts: list = []
+    calls = [("error_rate_spike", None), ("cpu_anomaly", {"window": "1h"}), ("log_correlation", {})]
+    responses = asyncio.run(_client(posts).call_tools(calls))
+    assert _names(responses) == ["error_rate_spike", "cpu_anomaly", "log_correlation"]
+    assert len(posts) == 1
+
+
+def test_call_tools_fallback_is_remembered():
+    posts: list = []
+
+    async def main() -> list[dict]:
+        client = _client(posts, accept_batches=False)
+        await client.call_tools([("a", None), ("b", None)])
+        return await client.call_tools([("c", None), ("d", None)])
+
+    assert _names(asyncio.run(main())) == ["c", "d"]
+    # One rejected batch probe, then one POST per call.
+    assert sum(isinstance(p, list) for p in posts) == 1
+    assert len(posts) == 5
+
+
+def _sse(*messages: dict) -> bytes:
+    return b"".join(f"id: {i}\ndata: {json.dumps(m)}\n\n".encode() for i, m in enumerate(messages))
+
+
+def _session(log: list, expire_first_call: bool = False, state: dict | None = None) -> MCPSession:
+    """Session against a fake server; ``state["list_changed"]`` enables the GET stream."""
+    state = state if state is not None else {}
+    state.update(sessions=0, expired=not expire_first_call)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sid = request.headers.get("mcp-session-id")
+        if request.method == "DELETE":
+            log.append(("DELETE", sid))
+            return httpx.Response(204)
+        if request.method == "GET":
+            log.append(("GET", sid, request.headers.get("last-event-id")))
+            if "resumed" in state and request.headers.get("last-event-id"):
+                state["resumed"].set()
+            note = {"jsonrpc": "2.0", "method": "notifications/message", "params": {}}
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/event-stream"},
+                content=f"id: g-{sid}\ndata: {json.dumps(note)}\n\n".encode(),
+            )
+        body = json.loads(request.content)
+        log.append((body["method"], sid))
+        if body["method"] == "initialize":
+            state["sessions"] += 1
+            tools = {"listChanged": True} if state.get("list_changed") else {}
+            result = {"protocolVersion": "2025-03-26", "capabilities": {"tools": tools}}
+            return httpx.Response(
+                200,
+                headers={"Mcp-Session-Id": f"s{state['sessions']}"},
+                json={"jsonrpc": "2.0", "id": body["id"], "result": result},
+            )
+        if "id" not in body:
+            return httpx.Response(202)
+        if not state["expired"]:
+            state["expired"] = True
+            return httpx.Response(404)
+        params = body["params"]
+        token = params.get("_meta", {}).get("progressToken")
+        progress = [
+            {
+                "jsonrpc": "2.0",
+                "method": "notifications/progress",
+                "params": {"progressToken": token, "progress": p},
+            }
+            for p in (1, 2)
+        ]
+        final = {
+            "jsonrpc": "2.0",
+            "id": body["id"],
+            "result": {"content": [{"text": params["name"]}]},
+        }
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/event-stream"},
+            content=_sse(*(progress if token is not None else []), final),
+        )
+
+    session = MCPSession("https://mcp.example.com", "key")
+    session._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return session
+
+
+def test_session_initializes_once_and_reuses_id():
+    log: list = []
+
+    async def main() -> list[dict]:
+        session = _session(log)
+        results = await asyncio.gather(
+            session.call_tool("cpu_anomaly"), session.call_tool("log_correlation")
+        )
+        await session.close()
+        return list(results)
+
+    assert _names(asyncio.run(main())) == ["cpu_anomaly", "log_correlation"]
+    assert [m for m, _ in log].count("initialize") == 1
+    assert log[0] == ("initialize", None)
+    assert all(sid == "s1" for _, sid in log[1:])
+    assert log[-1] == ("DELETE", "s1")
+
+
+def test_stream_tool_yields_progress_then_result():
+    async def main() -> list[dict]:
+        session = _session([])
+        messages = [m async for m in session.stream_tool("throughput_drop")]
+        await session.close()
+        return messages
+
+    messages = asyncio.run(main())
+    assert [m.get("params", {}).get("progress") for m in messages[:2]] == [1, 2]
+    assert messages[-1]["result"]["content"][0]["text"] == "throughput_drop"
+
+
+def test_expired_session_is_reinitialized():
+    log: list = []
+
+    async def main() -> dict:
+        session = _session(log, expire_first_call=True)
+        return await session.call_tool("cpu_anomaly")
+
+    assert _names([asyncio.run(main())]) == ["cpu_anomaly"]
+    assert [m for m, _ in log].count("initialize") == 2
+    assert log[-1] == ("tools/call", "s2")
+
+
+def test_expired_session_replaces_its_listener_and_resumes_from_get_ids_only():
+    log: list = []
+    state = {"list_changed": True}
+
+    async def main() -> tuple[asyncio.Task, asyncio.Task]:
+        state["resumed"] = asyncio.Event()
+        session = _session(log, state=state)
+        session.reconnect_delay = 0
+        await session.call_tool("cpu_anomaly")
+        first = session._listener
+        await state["resumed"].wait()  # the GET stream ended once and reconnected
+        state["expired"] = False
+        await session.call_tool("log_correlation")
+        second = session._listener
+        await session.close()
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first is not second and first.cancelled()
+    gets = [entry for entry in log if entry[0] == "GET"]
+    # Resumes with the GET stream's own event ID, never one from a POST
+    # response stream; the new session's stream starts fresh.
+    assert gets[:2] == [("GET", "s1", None), ("GET", "s1", "g-s1")]
+    assert ("GET", "s2", None) in gets
+    assert all(last in (None, "g-s1", "g-s2") for _, _, last in gets)
@@ -0,0 +1,257 @@
+"""Tests for the orchestrator's sequential and pipelined phase order."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+
+from src.agent_builder.a2a import A2AClient, A2ATaskManager, PollBackoff
+from src.incident_commander.orchestrator import IncidentOrchestrator, IncidentPhase, Severity
+from src.incident_commander.routing import RoutingPolicy, fingerprint
+
+ARTIFACTS = {
+    "triage": {"severity": "P2-High", "affected_services": ["payment-service"]},
+    "diagnosis": {"root_cause": "connection pool exhausted"},
+    "remediation": {"action": "scale payment-service to 4 replicas"},
+    "communication-draft": {"status_update": "Investigating", "postmortem": "Draft postmortem"},
+    "communication": {"status_update": "Mitigated", "postmortem": "Final postmortem"},
+}
+
+
+class FakeA2AClient:
+    """Answers each task with its role's artifact after ``delay`` seconds."""
+
+    def __init__(self, delay: float = 0.05, **artifacts: dict) -> None:
+        self.delay = delay
+        self.artifacts = {**ARTIFACTS, **artifacts}
+        self.log: list[tuple[str, str]] = []
+
+    async def send_a2a_task(self, task: dict) -> dict:
+        role = task["params"]["id"].split("-", 2)[2]
+        self.log.append(("start", role))
+        await asyncio.sleep(self.delay)
+        self.log.append(("end", role))
+        text = json.dumps(self.artifacts[role])
+        return {"result": {"artifacts": [{"parts": [{"type": "text", "text": text}]}]}}
+
+
+def _run(
+    pipeline: bool = False,
+    policy: RoutingPolicy | None = None,
+    client: FakeA2AClient | None = None,
+    alert: dict | None = None,
+) -> tuple[FakeA2AClient, object]:
+    client = client or FakeA2AClient()
+    orchestrator = IncidentOrchestrator(
+        client=client, agent_ids={}, pipeline=pipeline, policy=policy
+    )
+    incident = asyncio.run(orchestrator.handle_alert(alert or {"title": "Error spike"}))
+    return client, incident
+
+
+def _roles(client: FakeA2AClient) -> list[str]:
+    return [role for event, role in client.log if event == "start"]
+
+
+def test_sequential_runs_one_phase_at_a_time():
+    client, incident = _run(pipeline=False)
+
+    roles = [role for _, role in client.log]
+    phases = ("triage", "diagnosis", "remediation", "communication")
+    assert roles == [role for role in phases for _ in ("start", "end")]
+    assert incident.postmortem == "Final postmortem"
+    assert incident.phase is IncidentPhase.RESOLVED
+
+
+def test_pipeline_drafts_communication_during_remediation():
+    client, incident = _run(pipeline=True)
+
+    assert client.log.index(("start", "communication-draft")) < client.log.index(
+        ("end", "remediation")
+    )
+    assert client.log[-2:] == [("start", "communication"), ("end", "communication")]
+    assert incident.postmortem == "Final postmortem"
+    assert incident.remediation_action == "scale payment-service to 4 replicas"
+    # The timeline keeps its phase order even though the draft ran early.
+    phases = [e.phase for e in incident.timeline]
+    assert phases == sorted(phases, key=list(IncidentPhase).index)
+    assert [e.summary for e in incident.timeline[-2:]] == [
+        "Initial status update drafted",
+        "Incident report generated",
+    ]
+
+
+def test_pipeline_cancels_draft_when_remediation_fails():
+    client = FakeA2AClient()
+    send = client.send_a2a_task
+
+    async def failing(task: dict) -> dict:
+        if task["params"]["id"].endswith("-remediation"):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("remediation agent unavailable")
+        return await send(task)
+
+    client.send_a2a_task = failing
+    orchestrator = IncidentOrchestrator(client=client, agent_ids={}, pipeline=True)
+
+    async def scenario() -> None:
+        try:
+            await orchestrator.handle_alert({"title": "Error spike"})
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("remediation failure was swallowed")
+        await asyncio.sleep(0.1)
+
+    asyncio.run(scenario())
+    assert ("start", "communication-draft") in client.log
+    assert ("end", "communication-draft") not in client.log
+
+
+def test_policy_skips_diagnosis_and_remediation_for_p4():
+    policy = RoutingPolicy()
+    client = FakeA2AClient(triage={"severity": "P4-Low", "affected_services": []})
+    client, incident = _run(pipeline=True, policy=policy, client=client)
+
+    assert _roles(client) == ["triage", "communication"]
+    assert incident.severity is Severity.P4_LOW
+    assert "skipping diagnosis, remediation" in incident.timeline[-2].summary
+    assert policy.stats.as_dict() == {
+        "routed": 1,
+        "fast_path": 0,
+        "saved_calls": 2,
+        "saved_diagnosis": 1,
+        "saved_remediation": 1,
+    }
+
+
+def test_known_fingerprint_goes_straight_to_remediation():
+    alert = {"title": "Pool exhausted", "alert.name": "db_pool", "service.name": "payment-service"}
+    policy = RoutingPolicy.from_dict(
+        {
+            "runbooks": {
+                fingerprint(alert): {
+                    "severity": "P2-High",
+                    "root_cause": "connection pool exhausted",
+                    "action": "restart_service",
+                }
+            }
+        }
+    )
+    client, incident = _run(policy=policy, alert=alert)
+
+    assert _roles(client) == ["remediation", "communication"]
+    assert incident.severity is Severity.P2_HIGH
+    assert incident.root_cause == "connection pool exhausted"
+    assert policy.stats.fast_path == 1
+    assert policy.stats.saved_calls == 2
+    # A P2 alert with an unknown fingerprint still runs every phase.
+    client, _ = _run(policy=policy, alert={**alert, "service.name": "cart-service"})
+    assert _roles(client) == ["triage", "diagnosis", "remediation", "communication"]
+    assert policy.stats.routed == 2
+
+
+class FakeA2AServer:
+    """A2A server answering ``tasks/send`` with "working" and completing on the next poll.
+
+    Roles in ``stuck`` never complete.  Records every JSON-RPC method and task id.
+    """
+
+    def __init__(self, stuck: tuple[str, ...] = ()) -> None:
+        self.stuck = stuck
+        self.calls: list[tuple[str, str]] = []
+
+    def handle(self, body: dict) -> dict:
+        method, task_id = body["method"], body["params"]["id"]
+        self.calls.append((method, task_id))
+        role = task_id.split("-", 2)[2]
+        task: dict = {"id": task_id, "status": {"state": "working"}}
+        if method == "tasks/cancel":
+            task["status"]["state"] = "canceled"
+        elif method == "tasks/get" and role not in self.stuck:
+            task["status"]["state"] = "completed"
+            text = json.dumps(ARTIFACTS[role])
+            task["artifacts"] = [{"parts": [{"type": "text", "text": text}]}]
+        return {"jsonrpc": "2.0", "id": body.get("id"), "result": task}
+
+    def manager(self) -> A2ATaskManager:
+        def respond(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            if isinstance(body, list):
+                return httpx.Response(200, json=[self.handle(b) for b in body])
+            return httpx.Response(200, json=self.handle(body))
+
+        client = A2AClient("https://a2a.example.com", "key")
+        client._http = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+        return A2ATaskManager(client, backoff=PollBackoff(initial=0.001, maximum=0.004))
+
+    def methods(self, role: str) -> list[str]:
+        return [method for method, task_id in self.calls if task_id.endswith(f"-{role}")]
+
+
+def test_task_manager_submits_and_polls_each_phase():
+    server = FakeA2AServer()
+    orchestrator = IncidentOrchestrator(
+        client=FakeA2AClient(), agent_ids={}, task_manager=server.manager()
+    )
+    incident = asyncio.run(orchestrator.handle_alert({"title": "Error spike"}))
+
+    assert incident.root_cause == "connection pool exhausted"
+    assert incident.postmortem == "Final postmortem"
+    for role in ("triage", "diagnosis", "remediation", "communication"):
+        assert server.methods(role) == ["tasks/send", "tasks/get"]
+
+
+def test_phase_deadline_cancels_the_task_and_the_incident_fails():
+    server = FakeA2AServer(stuck=("diagnosis",))
+    orchestrator = IncidentOrchestrator(
+        client=FakeA2AClient(),
+        agent_ids={},
+        task_manager=server.manager(),
+        phase_timeouts={"diagnosis": 0.05},
+    )
+
+    async def scenario() -> None:
+        try:
+            await orchestrator.handle_alert({"title": "Error spike"})
+        except TimeoutError:
+            pass
+        else:
+            raise AssertionError("diagnosis deadline was not enforced")
+
+    asyncio.run(scenario())
+    assert server.methods("diagnosis")[-1] == "tasks/cancel"
+    assert server.methods("remediation") == []
+
+
+def test_failed_incident_supersedes_its_in_flight_tasks():
+    server = FakeA2AServer(stuck=("communication-draft",))
+    manager = server.manager()
+    send = manager.client.send_task
+
+    async def failing(task):
+        if task.task_id.endswith("-remediation"):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("remediation agent unavailable")
+        return await send(task)
+
+    manager.client.send_task = failing
+    orchestrator = IncidentOrchestrator(
+        client=FakeA2AClient(), agent_ids={}, pipeline=True, task_manager=manager
+    )
+
+    async def scenario() -> None:
+        try:
+            await orchestrator.handle_alert({"title": "Error spike"})
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("remediation failure was swallowed")
+        assert manager.in_flight() == []
+
+    asyncio.run(scenario())
+    # The draft was still polling when remediation failed: cancelled on the server.
+    assert server.methods("communication-draft")[0] == "tasks/send"
+    assert server.methods("communication-draft")[-1] == "tasks/cancel"
@@ -0,0 +1,159 @@
+"""Tests for the remediation decision cache and its use by the orchestrator."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from backend.server import IncidentDaemon, Request
+from src.incident_commander import orchestrator as orchestrator_module
+from src.incident_commander.orchestrator import IncidentOrchestrator
+from src.incident_commander.remediation_cache import (
+    RemediationCache,
+    action_tool,
+    root_cause_class,
+)
+from src.incident_commander.routing import RoutingPolicy
+from tests.test_orchestrator import FakeA2AClient
+
+ALERT = {"title": "DB errors", "alert.name": "error_rate_spike", "service.name": "payment-service"}
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_key_groups_reworded_root_causes():
+    cache = RemediationCache()
+    first = cache.key(ALERT, "DatabaseConnectionError: connection pool exhausted")
+    second = cache.key(ALERT, "Connection pool exhausted (DatabaseConnectionError)")
+    assert first == second == ("payment-service", "DatabaseConnectionError", "connection_pool")
+    assert root_cause_class("Weird flux capacitor drift") == "weird_flux_capacitor_drift"
+    assert action_tool("Restart service") == "incident_cmd.restart_service"
+    assert action_tool("scale payment-service to 4 replicas") is None
+    # A rollback needs a target version only the agent can choose.
+    assert action_tool("rollback_deployment") is None
+
+
+def test_confidence_expiry_and_deployment_invalidation():
+    clock = Clock()
+    cache = RemediationCache(ttl=60, clock=clock)
+    key = cache.key(ALERT, "connection pool exhausted")
+
+    entry = cache.record(key, "restart_service", "success")
+    assert entry.confidence == 0.7 and not cache.trusted(entry)
+    entry = cache.record(key, "restart_service", "success")
+    assert entry.confidence == 0.85 and cache.trusted(entry)
+    # A different action resets the entry; a failed one drops it.
+    assert cache.record(key, "rollback_deployment", "").confidence == 0.5
+    assert cache.record(key, "rollback_deployment", "failed") is None
+    assert cache.lookup(key) is None
+
+    cache.record(key, "restart_service", "success")
+    clock.now += 61
+    assert cache.lookup(key) is None
+    assert cache.stats["expired"] == 1
+
+    cache.record(key, "restart_service", "success")
+    other = cache.key({**ALERT, "service.name": "cart-service"}, "connection pool exhausted")
+    cache.record(other, "restart_service", "success")
+    assert cache.invalidate("payment-service") == 1
+    assert cache.lookup(key) is None and cache.lookup(other) is not None
+
+    # Without the direct path (several nodes), entries are only proposals.
+    shared = RemediationCache(direct=False)
+    for _ in range(3):
+        entry = shared.record(key, "restart_service", "success")
+    assert entry.confidence > shared.min_confidence and not shared.trusted(entry)
+
+
+class ToolClient(FakeA2AClient):
+    def __init__(self, fail_tools: bool = False) -> None:
+        super().__init__(
+            delay=0,
+            remediation={"action": "restart_service", "status": "success"},
+        )
+        self.fail_tools = fail_tools
+        self.tools: list[tuple[str, dict]] = []
+
+    async def execute_tool(self, tool_id: str, params: dict | None = None) -> dict:
+        if self.fail_tools:
+            raise ConnectionError("kibana unreachable")
+        self.tools.append((tool_id, params))
+        return {"status": "ok"}
+
+
+def _roles(client: FakeA2AClient) -> list[str]:
+    return [role for event, role in client.log if event == "start"]
+
+
+def test_trusted_known_good_action_runs_without_remediation_agent():
+    cache = RemediationCache()
+    policy = RoutingPolicy()
+    clients = [ToolClient() for _ in range(3)]
+    for client in clients:
+        orchestrator = IncidentOrchestrator(
+            client=client, agent_ids={}, policy=policy, remediation_cache=cache
+        )
+        incident = asyncio.run(orchestrator.handle_alert(dict(ALERT)))
+
+    # Two agent runs build up the confidence, the third uses the cache.
+    assert "remediation" in _roles(clients[1])
+    assert "remediation" not in _roles(clients[2])
+    assert clients[2].tools == [
+        (
+            "incident_cmd.restart_service",
+            {"service_name": "payment-service", "reason": f"{incident.id}: {incident.root_cause}"},
+        )
+    ]
+    assert incident.remediation_action == "restart_service"
+    assert incident.timeline[-2].agent == "Remediation Cache"
+    assert policy.stats.saved_calls == 1
+
+    # A failing tool drops the entry and falls back to the agent.
+    failing = ToolClient(fail_tools=True)
+    orchestrator.client = failing
+    asyncio.run(orchestrator.handle_alert(dict(ALERT)))
+    assert "remediation" in _roles(failing)
+    assert cache.stats["discarded"] == 1
+
+
+def test_remediation_response_is_parsed_once(monkeypatch):
+    parsed: list[str] = []
+    parse = orchestrator_module.parse_response
+
+    def counting(kind, result):
+        parsed.append(kind)
+        return parse(kind, result)
+
+    monkeypatch.setattr(orchestrator_module, "parse_response", counting)
+    cache = RemediationCache()
+    orchestrator = IncidentOrchestrator(client=ToolClient(), agent_ids={}, remediation_cache=cache)
+    asyncio.run(orchestrator.handle_alert(dict(ALERT)))
+    assert parsed.count("remediation") == 1
+    assert [entry.action for entry in cache.entries.values()] == ["restart_service"]
+
+
+def test_deployment_route_invalidates_the_service():
+    cache = RemediationCache()
+    cache.record(cache.key(ALERT, "connection pool exhausted"), "restart_service", "success")
+
+    async def handler(alert: dict) -> None:
+        pass
+
+    daemon = IncidentDaemon(handler, workers=1, on_deployment=cache.invalidate)
+
+    async def post(body: dict) -> tuple[int, dict]:
+        request = Request("POST", "/deployments", {}, json.dumps(body).encode())
+        return await daemon.route(request)
+
+    assert asyncio.run(post({"service.name": "payment-service"})) == (
+        200,
+        {"service": "payment-service", "invalidated": 1},
+    )
+    assert asyncio.run(post({"version": "2.1"}))[0] == 400
+    assert not cache.entries
@@ -0,0 +1,120 @@
+"""Tests for structured agent response parsing."""
+
+import json
+
+from src.incident_commander.responses import (
+    RESPONSE_SCHEMAS,
+    DiagnosisResult,
+    normalize_severity,
+    parse_response,
+    schema_instructions,
+)
+
+
+def _task(*parts: dict, artifacts: list | None = None) -> dict:
+    """Wrap parts in an A2A JSON-RPC task response."""
+    task: dict = {
+        "id": "t-1",
+        "status": {"state": "completed", "message": {"role": "agent", "parts": list(parts)}},
+    }
+    if artifacts is not None:
+        task["artifacts"] = artifacts
+    return {"jsonrpc": "2.0", "id": 1, "result": task}
+
+
+def test_schema_for_every_role():
+    assert set(RESPONSE_SCHEMAS) == {"triage", "diagnosis", "remediation", "communication"}
+    assert '"severity"' in schema_instructions("triage")
+
+
+def test_normalize_severity():
+    assert normalize_severity("P1") == "P1-Critical"
+    assert normalize_severity("p2-high") == "P2-High"
+    assert normalize_severity("critical") == "P1-Critical"
+    assert normalize_severity("unknown") == "P3-Medium"
+
+
+def test_parse_data_artifact():
+    result = _task(
+        artifacts=[
+            {
+                "parts": [
+                    {
+                        "type": "data",
+                        "data": {"severity": "P1", "affected_services": ["payment-service"]},
+                    }
+                ]
+            }
+        ]
+    )
+    triage = parse_response("triage", result)
+    assert triage.structured
+    assert triage.severity == "P1-Critical"
+    assert triage.affected_services == ["payment-service"]
+
+
+def test_parse_fenced_json_text():
+    body = {"root_cause": "DB connection pool exhausted", "confidence": 0.9}
+    result = _task({"type": "text", "text": f"Findings:\n```json\n{json.dumps(body)}\n```"})
+    diagnosis = parse_response("diagnosis", result)
+    assert diagnosis == DiagnosisResult(
+        root_cause="DB connection pool exhausted", confidence=0.9, structured=True
+    )
+
+
+def test_parse_direct_fields():
+    remediation = parse_response("remediation", {"action": "rollback_deployment"})
+    assert remediation.action == "rollback_deployment"
+
+
+def test_task_status_is_not_mistaken_for_remediation_status():
+    result = _task({"type": "text", "text": "Action: restart_service\nStatus: verified"})
+    remediation = parse_response("remediation", result)
+    assert not remediation.structured
+    assert remediation.action == "restart_service"
+    assert remediation.status == "verified"
+
+
+def test_fallback_extracts_from_prose():
+    text = (
+        "I looked at the logs.\n"
+        "**Root cause:** Connection pool exhausted on payment-service\n"
+        "Confidence: 85%\n"
+    )
+    diagnosis = parse_response("diagnosis", _task({"type": "text", "text": text}))
+    assert diagnosis.root_cause == "Connection pool exhausted on payment-service"
+    assert diagnosis.confidence == 0.85
+
+
+def test_fallback_severity_anywhere_in_text():
+    triage = parse_response("triage", _task({"type": "text", "text": "This is a P2 incident."}))
+    assert triage.severity == "P2-High"
+    for text, severity in (
+        ("Low latency so far, but a high error rate on checkout.", "P3-Medium"),
+        ("Checkout is down, severity is critical.", "P1-Critical"),
+        ("A high-severity incident on checkout.", "P2-High"),
+    ):
+        triage = parse_response("triage", _task({"type": "text", "text": text}))
+        assert triage.severity == severity, text
+
+
+def test_defaults_when_nothing_matches():
+    assert parse_response("diagnosis", {}).root_cause == "Under investigation"
+    assert parse_response("remediation", None).action == "Manual review required"
+
+
+def test_communication_falls_back_to_full_text():
+    comm = parse_response("communication", _task({"type": "text", "text": "# Report\nAll good."}))
+    assert comm.postmortem == "# Report\nAll good."
+
+
+def test_malformed_list_fields_are_wrapped_or_defaulted():
+    def services(value: object) -> list[str]:
+        triage = parse_response("triage", {"severity": "P3", "affected_services": value})
+        return triage.affected_services
+
+    assert services("payment-service") == ["payment-service"]
+    assert services(42) == ["42"]
+    assert services(None) == []
+    diagnosis = parse_response("diagnosis", {"root_cause": "disk full", "evidence": {"a": 1}})
+    assert diagnosis.evidence == ["{'a': 1}"]
@@ -0,0 +1,203 @@
+"""Tests for severity-aware scheduling of agent calls."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from src.incident_commander.orchestrator import IncidentOrchestrator
+from src.incident_commander.scheduler import SeverityScheduler, parse_reservations
+from tests.test_orchestrator import FakeA2AClient
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _hold(scheduler: SeverityScheduler, severity: str, order: list, release: asyncio.Event):
+    async with scheduler.slot(severity):
+        order.append(severity)
+        await release.wait()
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_p1_overtakes_queued_p4_calls_and_uses_its_reservation():
+    async def scenario() -> tuple[list, SeverityScheduler]:
+        scheduler = SeverityScheduler(capacity=3, reservations={"P1-Critical": 1})
+        order: list[str] = []
+        release = asyncio.Event()
+        tasks = [asyncio.create_task(_hold(scheduler, "P4-Low", order, release)) for _ in range(4)]
+        await _settle()
+        # Two P4 calls run; the third slot is held for P1.
+        assert order == ["P4-Low", "P4-Low"] and scheduler.queued["P4-Low"] == 2
+        tasks.append(asyncio.create_task(_hold(scheduler, "P1-Critical", order, release)))
+        await _settle()
+        assert order[-1] == "P1-Critical"
+        release.set()
+        await asyncio.gather(*tasks)
+        return order, scheduler
+
+    order, scheduler = asyncio.run(scenario())
+    assert order == ["P4-Low", "P4-Low", "P1-Critical", "P4-Low", "P4-Low"]
+    assert scheduler.preempted["P4-Low"] == 2
+    assert scheduler.calls["P4-Low"] == 4 and scheduler.running.total() == 0
+
+
+def test_waiting_calls_age_past_newer_higher_severity_calls():
+    clock = Clock()
+
+    async def scenario() -> list[str]:
+        scheduler = SeverityScheduler(capacity=1, reservations={}, aging_seconds=10, clock=clock)
+        order: list[str] = []
+        gates = [asyncio.Event() for _ in range(4)]
+        first = asyncio.create_task(_hold(scheduler, "P2-High", order, gates[0]))
+        await _settle()
+        starved = asyncio.create_task(_hold(scheduler, "P4-Low", order, gates[1]))
+        await _settle()
+        clock.now = 25.0  # the P4 call has aged two levels, to P2
+        newer = [
+            asyncio.create_task(_hold(scheduler, "P2-High", order, gate)) for gate in gates[2:]
+        ]
+        await _settle()
+        for gate in gates:
+            gate.set()
+        await asyncio.gather(first, starved, *newer)
+        assert scheduler.max_wait_seconds["P4-Low"] == 25.0
+        return order
+
+    # Tied at P2, the older P4 call goes first.
+    assert asyncio.run(scenario()) == ["P2-High", "P4-Low", "P2-High", "P2-High"]
+
+
+def test_cancelled_waiter_frees_its_place():
+    async def scenario() -> SeverityScheduler:
+        scheduler = SeverityScheduler(capacity=2, reservations={})
+        order: list[str] = []
+        release = asyncio.Event()
+        running = [
+            asyncio.create_task(_hold(scheduler, "P3-Medium", order, release)) for _ in range(3)
+        ]
+        await _settle()
+        running[2].cancel()
+        release.set()
+        await asyncio.gather(*running, return_exceptions=True)
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    assert scheduler.queued.total() == 0 and scheduler.running.total() == 0
+    assert scheduler.calls["P3-Medium"] == 2
+
+
+def test_reservations_parse_and_metrics_are_labelled_by_severity():
+    assert parse_reservations("P1=2, p2 = 1") == {"P1-Critical": 2, "P2-High": 1}
+    for bad in ("P9=1", "P1=x"):
+        try:
+            parse_reservations(bad)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"accepted {bad!r}")
+    try:
+        SeverityScheduler(capacity=2, reservations={"P1-Critical": 2})
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("reservations filled every slot")
+
+    text = SeverityScheduler().prometheus()
+    assert "# TYPE incident_scheduler_wait_seconds_total counter" in text
+    assert 'incident_scheduler_wait_seconds_total{severity="P4-Low"} 0' in text
+
+
+class SeverityClient(FakeA2AClient):
+    """Triages each alert as the severity it declares."""
+
+    async def send_a2a_task(self, task: dict) -> dict:
+        result = await super().send_a2a_task(task)
+        if task["params"]["id"].endswith("-triage"):
+            text = task["params"]["message"]["parts"][0]["text"]
+            severity = "P1-Critical" if '"critical"' in text else "P4-Low"
+            artifact = json.dumps({**self.artifacts["triage"], "severity": severity})
+            result["result"]["artifacts"][0]["parts"][0]["text"] = artifact
+        return result
+
+
+def test_p1_incident_is_not_delayed_by_a_p4_flood():
+    scheduler = SeverityScheduler(capacity=2, reservations={"P1-Critical": 1})
+    orchestrator = IncidentOrchestrator(
+        client=SeverityClient(delay=0.01), agent_ids={}, scheduler=scheduler
+    )
+    finished: list[str] = []
+
+    async def handle(alert: dict) -> None:
+        incident = await orchestrator.handle_alert(alert)
+        finished.append(incident.severity.value)
+
+    async def run() -> None:
+        flood = [
+            asyncio.create_task(handle({"title": f"noise {n}", "alert.severity": "low"}))
+            for n in range(8)
+        ]
+        await asyncio.sleep(0.015)
+        page = asyncio.create_task(handle({"title": "outage", "alert.severity": "critical"}))
+        await asyncio.gather(*flood, page)
+
+    asyncio.run(run())
+    # 8 P4 incidents share one slot; the P1 gets the reserved one.
+    assert finished.index("P1-Critical") == 0
+    assert scheduler.calls == {"P1-Critical": 4, "P4-Low": 32}
+    assert scheduler.max_wait_seconds["P1-Critical"] < scheduler.max_wait_seconds["P4-Low"]
+
+
+def test_cancelling_a_running_and_a_queued_call_together_frees_both():
+    async def scenario() -> SeverityScheduler:
+        scheduler = SeverityScheduler(capacity=2, reservations={"P1-Critical": 1})
+        order: list[str] = []
+        release = asyncio.Event()
+        running = asyncio.create_task(_hold(scheduler, "P3-Medium", order, release))
+        await _settle()
+        queued = asyncio.create_task(_hold(scheduler, "P3-Medium", order, release))
+        await _settle()
+        assert scheduler.queued["P3-Medium"] == 1
+        # As on shutdown: both go in the same loop iteration.
+        running.cancel()
+        queued.cancel()
+        results = await asyncio.gather(running, queued, return_exceptions=True)
+        assert all(isinstance(r, asyncio.CancelledError) for r in results)
+        release.set()
+        await _hold(scheduler, "P3-Medium", order, release)
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    assert scheduler.running.total() == 0 and scheduler.queued.total() == 0
+    assert scheduler.calls["P3-Medium"] == 2
+
+
+def test_surplus_calls_do_not_use_up_a_more_severe_reservation():
+    async def scenario() -> list[str]:
+        scheduler = SeverityScheduler(capacity=4, reservations={"P1-Critical": 1, "P2-High": 1})
+        order: list[str] = []
+        release = asyncio.Event()
+        tasks = [
+            asyncio.create_task(_hold(scheduler, severity, order, release))
+            for severity in ("P2-High", "P2-High", "P3-Medium", "P3-Medium")
+        ]
+        await _settle()
+        # The two P2 calls cover P2's reservation but not P1's: one P3 waits.
+        assert order == ["P2-High", "P2-High", "P3-Medium"]
+        tasks.append(asyncio.create_task(_hold(scheduler, "P1-Critical", order, release)))
+        await _settle()
+        assert order[-1] == "P1-Critical"
+        release.set()
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(scenario())[-1] == "P3-Medium"
@@ -0,0 +1,120 @@
+"""Tests for the incident daemon and its spill-to-disk alert queue."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+
+from backend.alert_queue import QueueFullError, SpilloverQueue
+from backend.server import IncidentDaemon, Request
+from src.agent_builder.a2a import A2ATaskManager, PollBackoff
+from tests.test_a2a import _client, _task
+
+
+def test_queue_spills_in_order_and_recovers_after_restart(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+
+    async def run() -> list[int]:
+        queue = SpilloverQueue(maxsize=4, spill_path=spill)
+        assert [queue.put_nowait({"n": n}) for n in range(10)] == [False] * 4 + [True] * 6
+        assert (queue.in_memory, queue.spilled) == (4, 6)
+        got = [(await queue.get())["n"] for _ in range(5)]
+        queue.drain_to_disk(front=[{"n": 99}])
+        return got
+
+    assert asyncio.run(run()) == [0, 1, 2, 3, 4]
+
+    async def restart() -> list[int]:
+        queue = SpilloverQueue(maxsize=4, spill_path=spill)
+        return [(await queue.get())["n"] for _ in range(queue.qsize())]
+
+    assert asyncio.run(restart()) == [99, 5, 6, 7, 8, 9]
+    assert not spill.exists()
+
+
+def test_queue_without_spill_file_rejects_when_full():
+    queue = SpilloverQueue(maxsize=2)
+    queue.put_nowait({})
+    queue.put_nowait({})
+    try:
+        queue.put_nowait({})
+    except QueueFullError:
+        pass
+    else:
+        raise AssertionError("expected QueueFullError")
+
+
+def test_daemon_processes_alerts_and_reports_health_and_metrics(tmp_path):
+    handled: list[str] = []
+    release = asyncio.Event()
+
+    async def handler(alert: dict) -> None:
+        if alert["title"] == "slow":
+            await release.wait()
+        handled.append(alert["title"])
+
+    async def warmup() -> None:
+        raise ConnectionError("kibana not reachable")  # logged, not fatal
+
+    async def run() -> tuple[dict, dict, str]:
+        queue = SpilloverQueue(maxsize=2, spill_path=tmp_path / "spill.jsonl")
+        daemon = IncidentDaemon(handler, queue=queue, workers=1, warmups=[warmup])
+        await daemon.start("127.0.0.1", 0)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{daemon.port}") as http:
+            first = await http.post("/alerts", json={"title": "a"})
+            batch = await http.post("/alerts", json=[{"title": t} for t in ("slow", "b", "c", "d")])
+            bad = await http.post("/alerts", content=b"not json")
+            await asyncio.sleep(0.05)
+            health = (await http.get("/health")).json()
+            metrics = (await http.get("/metrics")).text
+            missing = await http.get("/nope")
+        assert (first.status_code, bad.status_code, missing.status_code) == (202, 400, 404)
+        assert batch.json()["queued"] == 4
+        await daemon.stop(grace=0.05)
+        return batch.json(), health, metrics
+
+    batch, health, metrics = asyncio.run(run())
+
+    assert batch["spilled"] >= 1
+    assert handled == ["a"]
+    assert health["busy"] == 1
+    assert health["queue"]["memory"] + health["queue"]["disk"] == 3
+    assert "incident_alerts_received_total 5" in metrics
+    assert "incident_alerts_processed_total 1" in metrics
+    # The interrupted alert and the queued ones were persisted, oldest first.
+    persisted = [json.loads(line)["title"] for line in (tmp_path / "spill.jsonl").open()]
+    assert persisted == ["slow", "b", "c", "d"]
+
+
+def test_push_route_completes_a2a_tasks():
+    calls: list[str] = []
+
+    async def handler(alert: dict) -> None:
+        pass
+
+    async def run() -> tuple[dict, list]:
+        manager = A2ATaskManager(
+            _client(["working"], calls),
+            PollBackoff(initial=5, maximum=5),
+            push_url="http://daemon/a2a/push",
+        )
+        daemon = IncidentDaemon(handler, workers=1, on_push=manager.handle_push)
+
+        async def push(body: bytes) -> tuple[int, dict]:
+            return await daemon.route(Request("POST", "/a2a/push", {}, body))
+
+        managed = manager.submit(_task())
+        await asyncio.sleep(0.01)
+        update = {"id": managed.task_id, "status": {"state": "completed"}}
+        statuses = [await push(b"not json"), await push(json.dumps(update).encode())]
+        response = await manager.wait(managed.task_id)
+        statuses.append(await push(json.dumps(update).encode()))  # already finished
+        return response, statuses
+
+    response, statuses = asyncio.run(run())
+    assert response["result"]["status"]["state"] == "completed"
+    assert [s for s, _ in statuses] == [400, 200, 200]
+    assert [body.get("accepted") for _, body in statuses[1:]] == [True, False]
+    assert calls == ["tasks/send"]
@@ -0,0 +1,102 @@
+"""Tests for compiled {{...}} templates."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from backend.definitions.tools import CUSTOM_TOOLS
+from incident_commander.tools import CUSTOM_RESTART_SERVICE
+from src.agent_builder.executor import WorkflowExecutor, compile_workflow
+from src.agent_builder.templates import TemplateError, compile_template, render
+from src.agent_builder.workflows import (
+    StepType,
+    WorkflowDefinition,
+    WorkflowStep,
+    data_quality_check_workflow,
+)
+
+
+def test_whole_placeholder_keeps_type_and_interpolation_formats():
+    t = compile_template({"n": "{{ a.b }}", "s": "x={{a.b}}/{{c}}", "k": 3})
+    scope = {"a": {"b": [1, 2]}, "c": "z"}
+    assert t.render(scope) == {"n": [1, 2], "s": "x=[1, 2]/z", "k": 3}
+    assert t.refs == {"a", "c"}
+
+
+def test_constant_subtrees_are_shared():
+    body = {"static": {"x": [1, 2]}, "dyn": "{{v}}"}
+    out = compile_template(body).render({"v": 1})
+    assert out["static"] is body["static"]
+
+
+def test_matches_one_off_render_for_dotted_keys_and_lists():
+    scope = {"q": {"service.name": ["api", "db"], "results": [{"n": 1}, {"n": 2}]}}
+    value = ["{{q.service.name}}", "{{q.results.n}}", "{{q.results.1.n}}"]
+    assert (
+        compile_template(value).render(scope)
+        == render(value, scope)
+        == [
+            ["api", "db"],
+            [1, 2],
+            2,
+        ]
+    )
+
+
+def test_unknown_reference_rejected_at_compile_time():
+    with pytest.raises(TemplateError, match="KIBANA_URL"):
+        compile_template(CUSTOM_RESTART_SERVICE["configuration"], known={"now"})
+    t = compile_template(CUSTOM_RESTART_SERVICE["configuration"], known={"KIBANA_URL"})
+    assert t.render({"KIBANA_URL": "https://kb"})["url"] == "https://kb/api/fleet/agents/actions"
+
+
+def test_tool_body_params_compile():
+    for tool in CUSTOM_TOOLS:
+        t = compile_template(tool["configuration"]["body"])
+        assert "service_name" in t.refs or "node_name" in t.refs
+
+
+def test_workflow_compile_checks_step_scope():
+    compiled = compile_workflow(data_quality_check_workflow())
+    assert set(compiled.plans) == {s.name for s in data_quality_check_workflow().steps}
+
+    bad = WorkflowDefinition(
+        name="bad",
+        description="",
+        steps=[
+            WorkflowStep(
+                "log",
+                StepType.ELASTICSEARCH,
+                {"action": "index", "index": "x", "document": {"id": "{{item.id}}"}},
+            )
+        ],
+    )
+    with pytest.raises(TemplateError, match="'log'.*item"):
+        compile_workflow(bad)
+
+
+def test_compiled_workflow_is_reusable():
+    calls: list[dict] = []
+
+    async def handler(step, config):
+        calls.append(config)
+        return {"ok": True}
+
+    wf = WorkflowDefinition(
+        name="wf",
+        description="",
+        steps=[
+            WorkflowStep(
+                "loop",
+                StepType.FOREACH,
+                {"items": "{{ids}}", "step": {"action": "index", "id": "{{item}}"}},
+            )
+        ],
+    )
+    executor = WorkflowExecutor({StepType.ELASTICSEARCH: handler}, variables={"ids": [1, 2]})
+    compiled = executor.compile(wf)
+    for _ in range(2):
+        assert asyncio.run(executor.run(compiled)).ok
+    assert [c["id"] for c in calls] == [1, 2, 1, 2]
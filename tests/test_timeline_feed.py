@@ -0,0 +1,96 @@
+"""Tests for incremental incident timeline deltas and the SSE feed."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+
+from backend.server import IncidentDaemon
+from backend.timeline_feed import TimelineFeed
+from src.incident_commander.orchestrator import Incident, IncidentPhase, Severity
+
+
+def _events(frames: list[bytes]) -> list[tuple[str, dict]]:
+    out = []
+    for frame in b"".join(frames).decode().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.splitlines() if ": " in line)
+        if "event" in fields:
+            out.append((fields["event"], json.loads(fields["data"])))
+    return out
+
+
+def _run_incident(feed: TimelineFeed, incident_id: str = "INC-1") -> Incident:
+    incident = Incident(id=incident_id, title="CPU spike", alert_payload={}, listener=feed.publish)
+    incident.opened()
+    incident.add_event(IncidentPhase.ALERT_RECEIVED, "system", "Alert received")
+    incident.severity = Severity.P1_CRITICAL
+    incident.add_event(IncidentPhase.TRIAGE, "Triage Agent", "Classified as P1")
+    incident.resolve()
+    return incident
+
+
+def test_incident_publishes_events_and_phase_changes():
+    feed = TimelineFeed()
+    incident = _run_incident(feed)
+
+    events = _events(feed.frames_since(0))
+    assert [kind for kind, _ in events] == ["incident", "event", "event", "phase", "phase"]
+    assert events[2][1]["summary"] == "Classified as P1"
+    assert events[3][1]["severity"] == "P1-Critical"
+    assert events[4][1]["phase"] == "resolved"
+
+    snapshot = feed.snapshot("INC-1")
+    assert snapshot["timeline"] == incident.to_dict()["timeline"]
+    assert snapshot["phase"] == "resolved"
+
+
+def test_resume_from_cursor_and_reset_when_cursor_expired():
+    feed = TimelineFeed(max_deltas=3)
+    _run_incident(feed)  # 5 deltas, only the last 3 retained
+
+    assert len(feed.frames_since(3)) == 2
+    assert feed.frames_since(feed.last_seq) == []
+
+    async def first(cursor: int) -> bytes:
+        stream = feed.stream(cursor)
+        try:
+            return await anext(stream)
+        finally:
+            await stream.aclose()
+
+    assert asyncio.run(first(1)).startswith(b"event: reset")
+    assert asyncio.run(first(3)).startswith(b"id: 4\n")
+
+
+def test_daemon_streams_deltas_to_dashboard():
+    async def run() -> tuple[list[tuple[str, dict]], dict]:
+        daemon = IncidentDaemon(lambda alert: asyncio.sleep(0), workers=1)
+        await daemon.start("127.0.0.1", 0)
+        _run_incident(daemon.feed, "INC-A")
+        received: list[tuple[str, dict]] = []
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{daemon.port}") as http:
+            async with http.stream("GET", "/timeline/stream", headers={"Last-Event-ID": "3"}) as r:
+                assert r.headers["content-type"] == "text/event-stream"
+                lines = r.aiter_lines()
+                _run_incident(daemon.feed, "INC-B")
+                buffer: list[str] = []
+                while len(received) < 7:
+                    line = await anext(lines)
+                    if line:
+                        buffer.append(line)
+                        continue
+                    fields = dict(item.split(": ", 1) for item in buffer)
+                    received.append((fields["event"], json.loads(fields["data"])))
+                    buffer = []
+                snapshot = (await http.get("/incidents/INC-B")).json()
+                await daemon.stop(grace=0)
+        return received, snapshot
+
+    received, snapshot = asyncio.run(run())
+
+    # Two remaining INC-A deltas after cursor 3, then all of INC-B.
+    assert [d["incident"] for _, d in received] == ["INC-A"] * 2 + ["INC-B"] * 5
+    assert received[2][0] == "incident"
+    assert snapshot["phase"] == "resolved" and len(snapshot["timeline"]) == 2